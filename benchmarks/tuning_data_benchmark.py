@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks `model_types.encode_tuning_data` on a generated CSV file.
+
+    python benchmarks/tuning_data_benchmark.py --num_rows=1000000
+
+Each encoder runs in a process of its own, so their peak memory can be compared. The
+"list" encoder is the previous implementation: it collects `glm.TuningExample`s in a list,
+then copies them into a `glm.Dataset`.
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import random
+import resource
+import string
+import tempfile
+import time
+
+import google.ai.generativelanguage as glm
+
+from google.generativeai.types import model_types
+
+
+def write_csv(path, num_rows, duplicate_fraction):
+    rng = random.Random(0)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["text_input", "output"])
+        rows = []
+        for _ in range(num_rows):
+            if rows and rng.random() < duplicate_fraction:
+                writer.writerow(rng.choice(rows))
+                continue
+            row = (
+                "".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(20, 200))),
+                "".join(rng.choices(string.ascii_lowercase + " ", k=rng.randint(5, 50))),
+            )
+            if len(rows) < 1000:
+                rows.append(row)
+            writer.writerow(row)
+
+
+def encode_list(path):
+    with open(path) as f:
+        examples = [
+            glm.TuningExample(text_input=row["text_input"], output=row["output"])
+            for row in csv.DictReader(f)
+        ]
+    return glm.Dataset(examples=glm.TuningExamples(examples=examples))
+
+
+def encode_streaming(path, deduplicate):
+    encoder = model_types.TuningDataEncoder(deduplicate=deduplicate)
+    encoder.add_data(path)
+    return encoder.dataset()
+
+
+def run(name, path, queue):
+    start = time.perf_counter()
+    if name == "list":
+        dataset = encode_list(path)
+    else:
+        dataset = encode_streaming(path, deduplicate=name == "streaming+dedupe")
+    elapsed = time.perf_counter() - start
+    # `ru_maxrss` is in KiB on Linux.
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put((elapsed, peak_mib, len(dataset.examples.examples)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num_rows", type=int, default=1_000_000)
+    parser.add_argument("--duplicate_fraction", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        write_csv(path, args.num_rows, args.duplicate_fraction)
+        size_mib = os.path.getsize(path) / 2**20
+        print(f"{args.num_rows} rows, {size_mib:.0f} MiB of CSV")
+
+        context = multiprocessing.get_context("spawn")
+        for name in ["list", "streaming", "streaming+dedupe"]:
+            queue = context.Queue()
+            process = context.Process(target=run, args=(name, path, queue))
+            process.start()
+            elapsed, peak_mib, count = queue.get()
+            process.join()
+            print(f"{name:>18}: {elapsed:6.2f}s, peak {peak_mib:6.0f} MiB, {count} examples")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks `vector_index.VectorIndex` on random clustered vectors.
+
+    python benchmarks/vector_index_benchmark.py --num_vectors=1000000 --dimensions=768
+
+The vectors need `num_vectors * dimensions * 4` bytes of memory and disk, about 3GB with the
+defaults.
+"""
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from google.generativeai import vector_index
+
+
+def clustered_vectors(rng, n, centers):
+    labels = rng.integers(len(centers), size=n)
+    vectors = centers[labels]
+    vectors += 0.5 * rng.standard_normal(vectors.shape, dtype=np.float32)
+    return vectors
+
+
+def timed(label, fn, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<40} {elapsed * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num_vectors", type=int, default=1_000_000)
+    parser.add_argument("--dimensions", type=int, default=768)
+    parser.add_argument("--num_queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--n_lists", type=int, default=None)
+    parser.add_argument("--n_probe", type=int, nargs="+", default=[8, 32])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((1000, args.dimensions), dtype=np.float32)
+    queries = clustered_vectors(rng, args.num_queries, centers)
+
+    index = vector_index.VectorIndex(metric="cosine")
+    index.reserve(args.num_vectors, args.dimensions)
+    chunk = 100_000
+    timed(
+        f"add {args.num_vectors} x {args.dimensions}",
+        lambda: [
+            index.add(clustered_vectors(rng, min(chunk, args.num_vectors - start), centers))
+            for start in range(0, args.num_vectors, chunk)
+        ],
+    )
+
+    _, exact_ids = timed("exact search, 1 query", lambda: index.search(queries[:1], k=args.k), 5)
+    _, exact_ids = timed(
+        f"exact search, {args.num_queries} queries", lambda: index.search(queries, k=args.k)
+    )
+
+    timed("build_ivf", lambda: index.build_ivf(args.n_lists))
+    for n_probe in args.n_probe:
+        index.search(queries[:1], k=args.k, n_probe=n_probe)  # Builds the inverted lists.
+        _, ids = timed(
+            f"ivf search, n_probe={n_probe}, {args.num_queries} queries",
+            lambda: index.search(queries, k=args.k, n_probe=n_probe),
+        )
+        recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(ids, exact_ids)])
+        print(f"{'':<40} recall@{args.k}: {recall:.3f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timed("save", lambda: index.save(tmp))
+        loaded = timed("load (memory-mapped)", lambda: vector_index.VectorIndex.load(tmp))
+        timed(
+            f"exact search after load, {args.num_queries} queries",
+            lambda: loaded.search(queries, k=args.k),
+        )
+        del loaded
+
+
+if __name__ == "__main__":
+    main()
@@ -52,11 +52,21 @@ from google.generativeai.discuss import count_message_tokens
 
 from google.generativeai.embedding import embed_content
 from google.generativeai.embedding import embed_content_async
+from google.generativeai.embedding import embed_content_iter
+from google.generativeai.embedding import embed_content_aiter
+from google.generativeai.embedding_cache import EmbeddingCache
 
 from google.generativeai.files import upload_file
+from google.generativeai.files import upload_file_async
+from google.generativeai.files import upload_files
 from google.generativeai.files import get_file
+from google.generativeai.files import get_file_async
 from google.generativeai.files import list_files
+from google.generativeai.files import list_files_async
 from google.generativeai.files import delete_file
+from google.generativeai.files import delete_file_async
+from google.generativeai.files import wait_for_files
+from google.generativeai.files import wait_for_files_async
 
 from google.generativeai.generative_models import GenerativeModel
 from google.generativeai.generative_models import ChatSession
@@ -76,8 +86,13 @@ from google.generativeai.models import create_tuned_model
 from google.generativeai.models import update_tuned_model
 from google.generativeai.models import delete_tuned_model
 
+from google.generativeai.model_cache import ModelCache
+from google.generativeai.model_cache import get_default_model_cache
+from google.generativeai.model_cache import set_default_model_cache
+
 from google.generativeai.operations import list_operations
 from google.generativeai.operations import get_operation
+from google.generativeai.operations import wait_for_operations_async
 
 
 from google.generativeai.client import configure
@@ -86,10 +101,12 @@ __version__ = version.__version__
 
 del discuss
 del embedding
+del embedding_cache
 del files
 del generative_models
 del text
 del models
+del model_cache
 del client
 del operations
 del version
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 import os
+import asyncio
+import collections
 import contextlib
 import dataclasses
+import functools
+import itertools
+import logging
 import pathlib
-import types
-from typing import Any, cast
+import tempfile
+import threading
+import time
+from typing import Any, Callable, cast
 from collections.abc import Sequence
+import grpc
+from grpc import aio
 import httplib2
 
 import google.ai.generativelanguage as glm
@@ -18,6 +27,7 @@ from google.api_core import client_options as client_options_lib
 from google.api_core import gapic_v1
 from google.api_core import operations_v1
 
+import googleapiclient.errors
 import googleapiclient.http
 import googleapiclient.discovery
 
@@ -30,6 +40,26 @@ except ImportError:
 
 USER_AGENT = "genai-py"
 GENAI_API_DISCOVERY_URL = "https://generativelanguage.googleapis.com/$discovery/rest"
+GENAI_API_VERSION = "v1beta"
+
+DEFAULT_DISCOVERY_CACHE_DIR = (
+    pathlib.Path(os.environ.get("XDG_CACHE_HOME", "~/.cache")).expanduser() / "google-generativeai"
+)
+# The part of the discovery document that `FileServiceClient.create_file` uses.
+BUNDLED_DISCOVERY_DOCUMENT = pathlib.Path(__file__).parent / f"discovery_{GENAI_API_VERSION}.json"
+
+# Resumable upload chunks must be a multiple of this size, except for the last one.
+UPLOAD_CHUNK_GRANULARITY = 256 * 1024
+DEFAULT_UPLOAD_CHUNK_SIZE = googleapiclient.http.DEFAULT_CHUNK_SIZE
+DEFAULT_UPLOAD_RETRIES = 5
+_UPLOAD_RETRY_DELAY = 1.0
+_UPLOAD_MAX_RETRY_DELAY = 30.0
+# Seconds allowed for each socket operation of an upload.
+DEFAULT_UPLOAD_TIMEOUT = 60.0
+
+# Discovery documents already loaded by this process, by cache file name.
+_discovery_documents: dict[str, str] = {}
+_discovery_lock = threading.Lock()
 
 
 @contextlib.contextmanager
@@ -44,10 +74,118 @@ def patch_colab_gce_credentials():
         auth._default._get_gce_credentials = get_gce
 
 
-class FileServiceClient(glm.FileServiceClient):
-    def __init__(self, *args, **kwargs):
+def _fetch_discovery_document(api_key: str, http: httplib2.Http) -> str:
+    request = googleapiclient.http.HttpRequest(
+        http=http,
+        postproc=lambda resp, content: (resp, content),
+        uri=f"{GENAI_API_DISCOVERY_URL}?version={GENAI_API_VERSION}&key={api_key}",
+    )
+    response, content = request.execute()
+    if response.status >= 400:
+        raise httplib2.HttpLib2Error(
+            f"Fetching the discovery document failed with status {response.status}."
+        )
+    return content.decode("utf-8")
+
+
+def _is_retryable_upload_error(
+    error: googleapiclient.errors.HttpError | httplib2.HttpLib2Error | OSError,
+) -> bool:
+    if isinstance(error, googleapiclient.errors.HttpError):
+        return error.status_code == 429 or error.status_code >= 500
+    # Connection errors, timeouts and other transport failures.
+    return True
+
+
+def _check_chunk_size(chunk_size: int):
+    if chunk_size < 1 or chunk_size % UPLOAD_CHUNK_GRANULARITY:
+        raise ValueError(
+            f"Invalid value: `chunk_size` must be a positive multiple of {UPLOAD_CHUNK_GRANULARITY} bytes. Received: {chunk_size}."
+        )
+
+
+def _upload_retry_delay(failures: int) -> float:
+    return min(_UPLOAD_RETRY_DELAY * 2 ** (failures - 1), _UPLOAD_MAX_RETRY_DELAY)
+
+
+def _write_discovery_cache(path: pathlib.Path, document: str):
+    # Written to a temporary file first, so other processes never read a partial document.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=path.parent, delete=False, encoding="utf-8") as f:
+            f.write(document)
+        os.replace(f.name, path)
+    except OSError as e:
+        logging.debug("Couldn't cache the discovery document in %s: %s", path, e)
+
+
+def _load_discovery_document(
+    api_key: str, *, http: httplib2.Http, cache_dir: str | os.PathLike | None
+) -> str:
+    """Returns the discovery document from the process cache, the disk cache, or the API.
+
+    The disk cache is keyed by the API and library versions, so an upgrade fetches a new copy.
+    If the document can't be fetched, the bundled copy is used.
+    """
+    cache_name = f"discovery-{GENAI_API_VERSION}-{__version__}.json"
+    with _discovery_lock:
+        document = _discovery_documents.get(cache_name)
+        if document is not None:
+            return document
+
+        cache_path = None if cache_dir is None else pathlib.Path(cache_dir) / cache_name
+        if cache_path is not None and cache_path.exists():
+            document = cache_path.read_text(encoding="utf-8")
+        else:
+            try:
+                document = _fetch_discovery_document(api_key, http)
+            except (httplib2.HttpLib2Error, OSError) as e:
+                logging.warning(
+                    "Couldn't fetch the discovery document (%s), using the bundled copy.", e
+                )
+                return BUNDLED_DISCOVERY_DOCUMENT.read_text(encoding="utf-8")
+            if cache_path is not None:
+                _write_discovery_cache(cache_path, document)
+
+        _discovery_documents[cache_name] = document
+        return document
+
+
+class _FileUploader:
+    """Uploads files to the File API, for `FileServiceClient` and `FileServiceAsyncClient`.
+
+    Uploads go through the REST API, built from its discovery document. The document is
+    fetched once and cached in `discovery_cache_dir`. Set `use_bundled_discovery=True` to
+    skip the fetch and use the copy bundled with the library. Each thread reuses one HTTP
+    connection pool for all of its uploads. Proxies are taken from the environment, by
+    `httplib2`.
+    """
+
+    def __init__(
+        self,
+        client_options: client_options_lib.ClientOptions,
+        *,
+        discovery_cache_dir: str | os.PathLike | None,
+        use_bundled_discovery: bool,
+        default_metadata: Sequence[tuple[str, str]],
+        timeout: float | None,
+    ):
+        self._client_options = client_options
         self._discovery_api = None
-        super().__init__(*args, **kwargs)
+        self._discovery_cache_dir = discovery_cache_dir
+        self._use_bundled_discovery = use_bundled_discovery
+        self._default_metadata = dict(default_metadata)
+        self._timeout = timeout
+        self._discovery_lock = threading.Lock()
+        # `httplib2.Http` isn't thread-safe, so each thread gets its own.
+        self._local = threading.local()
+
+    def _http(self) -> httplib2.Http:
+        """Returns this thread's `httplib2.Http`, which keeps its connections open."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=self._timeout)
+        return http
 
     def _setup_discovery_api(self):
         api_key = self._client_options.api_key
@@ -56,27 +194,32 @@ class FileServiceClient(glm.FileServiceClient):
                 "Invalid operation: Uploading to the File API requires an API key. Please provide a valid API key."
             )
 
-        request = googleapiclient.http.HttpRequest(
-            http=httplib2.Http(),
-            postproc=lambda resp, content: (resp, content),
-            uri=f"{GENAI_API_DISCOVERY_URL}?version=v1beta&key={api_key}",
-        )
-        response, content = request.execute()
-
-        discovery_doc = content.decode("utf-8")
-        self._discovery_api = googleapiclient.discovery.build_from_document(
-            discovery_doc, developerKey=api_key
-        )
+        with self._discovery_lock:
+            if self._discovery_api is not None:
+                return
+            if self._use_bundled_discovery:
+                discovery_doc = BUNDLED_DISCOVERY_DOCUMENT.read_text(encoding="utf-8")
+            else:
+                discovery_doc = _load_discovery_document(
+                    api_key, http=self._http(), cache_dir=self._discovery_cache_dir
+                )
+            self._discovery_api = googleapiclient.discovery.build_from_document(
+                discovery_doc, developerKey=api_key, http=self._http()
+            )
 
-    def create_file(
+    def upload(
         self,
         path: str | pathlib.Path | os.PathLike,
         *,
-        mime_type: str | None = None,
-        name: str | None = None,
-        display_name: str | None = None,
-        resumable: bool = True,
-    ) -> glm.File:
+        mime_type: str | None,
+        name: str | None,
+        display_name: str | None,
+        resumable: bool,
+        chunk_size: int,
+        progress: Callable[[int, int], None] | None,
+        max_retries: int,
+    ) -> str:
+        """Uploads the file at `path`, and returns the name of the new file."""
         if self._discovery_api is None:
             self._setup_discovery_api()
 
@@ -87,30 +230,337 @@ class FileServiceClient(glm.FileServiceClient):
             file["displayName"] = display_name
 
         media = googleapiclient.http.MediaFileUpload(
-            filename=path, mimetype=mime_type, resumable=resumable
+            filename=path, mimetype=mime_type, chunksize=chunk_size, resumable=resumable
         )
         request = self._discovery_api.media().upload(body={"file": file}, media_body=media)
-        result = request.execute()
+        request.headers.update(self._default_metadata)
+        if resumable:
+            result = self._upload_resumable(request, progress=progress, max_retries=max_retries)
+        else:
+            result = request.execute(http=self._http(), num_retries=max_retries)
+        if progress is not None:
+            progress(media.size(), media.size())
+        return result["file"]["name"]
+
+    def _upload_resumable(
+        self,
+        request: googleapiclient.http.HttpRequest,
+        *,
+        progress: Callable[[int, int], None] | None,
+        max_retries: int,
+    ):
+        result = None
+        failures = 0
+        while result is None:
+            try:
+                status, result = request.next_chunk(http=self._http())
+            except (googleapiclient.errors.HttpError, httplib2.HttpLib2Error, OSError) as e:
+                if failures >= max_retries or not _is_retryable_upload_error(e):
+                    raise
+                failures += 1
+                time.sleep(_upload_retry_delay(failures))
+                # After a failure `next_chunk` first asks the server how many bytes it received,
+                # and continues from there. A failure of the request starting the upload is
+                # retried the same way.
+                continue
+
+            failures = 0
+            if status is not None and progress is not None:
+                progress(status.resumable_progress, status.total_size)
+        return result
+
+
+class FileServiceClient(glm.FileServiceClient):
+    """A `glm.FileServiceClient` that can upload files, with `create_file`.
+
+    Uploads go through the REST API, built from its discovery document. The document is
+    fetched once and cached in `discovery_cache_dir`. Set `use_bundled_discovery=True` to
+    skip the fetch and use the copy bundled with the library. Each thread reuses one HTTP
+    connection pool for all of its uploads.
+
+    Args:
+        default_metadata: (key, value) headers sent with every upload request.
+        upload_timeout: The seconds allowed for each socket operation of an upload. `None`
+            waits forever.
+    """
+
+    def __init__(
+        self,
+        *args,
+        discovery_cache_dir: str | os.PathLike | None = DEFAULT_DISCOVERY_CACHE_DIR,
+        use_bundled_discovery: bool = False,
+        default_metadata: Sequence[tuple[str, str]] = (),
+        upload_timeout: float | None = DEFAULT_UPLOAD_TIMEOUT,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._uploader = _FileUploader(
+            self._client_options,
+            discovery_cache_dir=discovery_cache_dir,
+            use_bundled_discovery=use_bundled_discovery,
+            default_metadata=default_metadata,
+            timeout=upload_timeout,
+        )
+
+    def create_file(
+        self,
+        path: str | pathlib.Path | os.PathLike,
+        *,
+        mime_type: str | None = None,
+        name: str | None = None,
+        display_name: str | None = None,
+        resumable: bool = True,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+        max_retries: int = DEFAULT_UPLOAD_RETRIES,
+    ) -> glm.File:
+        """Uploads the file at `path`.
 
-        return self.get_file({"name": result["file"]["name"]})
+        Args:
+            chunk_size: The number of bytes sent per request of a resumable upload. Must be a
+                multiple of 256 KiB.
+            progress: Called with `(bytes_uploaded, total_bytes)` after each chunk.
+            max_retries: How many times in a row a failed chunk is retried. Resumable uploads
+                continue from the last offset the server acknowledged.
+        """
+        _check_chunk_size(chunk_size)
+        file_name = self._uploader.upload(
+            path,
+            mime_type=mime_type,
+            name=name,
+            display_name=display_name,
+            resumable=resumable,
+            chunk_size=chunk_size,
+            progress=progress,
+            max_retries=max_retries,
+        )
+        return self.get_file({"name": file_name})
 
 
 class FileServiceAsyncClient(glm.FileServiceAsyncClient):
-    async def create_file(self, *args, **kwargs):
-        raise NotImplementedError(
-            "The `create_file` method is currently not supported for the asynchronous client."
+    """A `glm.FileServiceAsyncClient` that can upload files, with `create_file`.
+
+    Uploads run the same resumable upload as `FileServiceClient.create_file`, in a worker
+    thread, so the event loop isn't blocked. The arguments are the same as
+    `FileServiceClient`'s.
+    """
+
+    def __init__(
+        self,
+        *args,
+        discovery_cache_dir: str | os.PathLike | None = DEFAULT_DISCOVERY_CACHE_DIR,
+        use_bundled_discovery: bool = False,
+        default_metadata: Sequence[tuple[str, str]] = (),
+        upload_timeout: float | None = DEFAULT_UPLOAD_TIMEOUT,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._uploader = _FileUploader(
+            self._client._client_options,
+            discovery_cache_dir=discovery_cache_dir,
+            use_bundled_discovery=use_bundled_discovery,
+            default_metadata=default_metadata,
+            timeout=upload_timeout,
+        )
+
+    async def create_file(
+        self,
+        path: str | pathlib.Path | os.PathLike,
+        *,
+        mime_type: str | None = None,
+        name: str | None = None,
+        display_name: str | None = None,
+        resumable: bool = True,
+        chunk_size: int = DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+        max_retries: int = DEFAULT_UPLOAD_RETRIES,
+    ) -> glm.File:
+        """The async version of `FileServiceClient.create_file`.
+
+        `progress` is called from the worker thread. Cancelling the call doesn't stop an upload
+        that has started, its thread finishes the upload.
+        """
+        _check_chunk_size(chunk_size)
+        file_name = await asyncio.to_thread(
+            self._uploader.upload,
+            path,
+            mime_type=mime_type,
+            name=name,
+            display_name=display_name,
+            resumable=resumable,
+            chunk_size=chunk_size,
+            progress=progress,
+            max_retries=max_retries,
+        )
+        return await self.get_file({"name": file_name})
+
+
+class _ClientPool:
+    """A fixed set of clients for one service, handed out in round-robin order."""
+
+    def __init__(self, clients: Sequence[Any]):
+        self.clients = list(clients)
+        # `next` on an `itertools.count` is atomic, so no lock is needed here.
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def next_client(self):
+        return self.clients[next(self._counter) % len(self.clients)]
+
+
+class _ClientCallDetails(
+    collections.namedtuple(
+        "_ClientCallDetails",
+        ("method", "timeout", "metadata", "credentials", "wait_for_ready", "compression"),
+    ),
+    grpc.ClientCallDetails,
+):
+    pass
+
+
+class _DefaultMetadataInterceptor(
+    grpc.UnaryUnaryClientInterceptor,
+    grpc.UnaryStreamClientInterceptor,
+    grpc.StreamUnaryClientInterceptor,
+    grpc.StreamStreamClientInterceptor,
+):
+    """Appends the default metadata to every call made on a `grpc` channel."""
+
+    def __init__(self, metadata: Sequence[tuple[str, str]]):
+        self._metadata = tuple(metadata)
+
+    def _add_metadata(self, details):
+        metadata = self._metadata
+        if details.metadata:
+            metadata = tuple(details.metadata) + metadata
+        return _ClientCallDetails(
+            details.method,
+            details.timeout,
+            metadata,
+            details.credentials,
+            details.wait_for_ready,
+            details.compression,
+        )
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        return continuation(self._add_metadata(client_call_details), request)
+
+    def intercept_unary_stream(self, continuation, client_call_details, request):
+        return continuation(self._add_metadata(client_call_details), request)
+
+    def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return continuation(self._add_metadata(client_call_details), request_iterator)
+
+    def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return continuation(self._add_metadata(client_call_details), request_iterator)
+
+
+class _DefaultMetadataAsyncInterceptor(
+    aio.UnaryUnaryClientInterceptor,
+    aio.UnaryStreamClientInterceptor,
+    aio.StreamUnaryClientInterceptor,
+    aio.StreamStreamClientInterceptor,
+):
+    """Appends the default metadata to every call made on a `grpc_asyncio` channel."""
+
+    def __init__(self, metadata: Sequence[tuple[str, str]]):
+        self._metadata = tuple(metadata)
+
+    def _add_metadata(self, details):
+        metadata = aio.Metadata(*(details.metadata or ()), *self._metadata)
+        return aio.ClientCallDetails(
+            details.method,
+            details.timeout,
+            metadata,
+            details.credentials,
+            details.wait_for_ready,
         )
 
+    async def intercept_unary_unary(self, continuation, client_call_details, request):
+        return await continuation(self._add_metadata(client_call_details), request)
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await continuation(self._add_metadata(client_call_details), request)
+
+    async def intercept_stream_unary(self, continuation, client_call_details, request_iterator):
+        return await continuation(self._add_metadata(client_call_details), request_iterator)
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return await continuation(self._add_metadata(client_call_details), request_iterator)
+
+
+def _add_session_headers(transport, default_metadata: Sequence[tuple[str, str]]):
+    """Sends the default metadata as headers on every request of a `rest` transport."""
+    transport._session.headers.update(dict(default_metadata))
+
+
+def _transport_factory(
+    transport_cls,
+    transport: str,
+    *,
+    default_metadata: Sequence[tuple[str, str]],
+    separate_channel: bool,
+):
+    """Returns a callable that creates a `transport_cls` with the default metadata built in.
+
+    The metadata is added by a channel interceptor for `grpc` and `grpc_asyncio`, or as session
+    headers for `rest`, so it's handled once per transport instead of on every method call.
+
+    With `separate_channel`, the gRPC channel gets a local subchannel pool: channels with the
+    same target and arguments otherwise share their connections through a global pool, and
+    pooled clients need their own HTTP/2 connection each.
+    """
+    if transport == "rest":
+
+        def make_rest_transport(**kwargs):
+            rest_transport = transport_cls(**kwargs)
+            if default_metadata:
+                _add_session_headers(rest_transport, default_metadata)
+            return rest_transport
+
+        return make_rest_transport
+
+    def create_channel(*args, options=(), **kwargs):
+        if separate_channel:
+            options = [*options, ("grpc.use_local_subchannel_pool", 1)]
+        if transport == "grpc_asyncio":
+            if default_metadata:
+                kwargs["interceptors"] = [_DefaultMetadataAsyncInterceptor(default_metadata)]
+            return transport_cls.create_channel(*args, options=options, **kwargs)
+
+        channel = transport_cls.create_channel(*args, options=options, **kwargs)
+        if default_metadata:
+            channel = grpc.intercept_channel(channel, _DefaultMetadataInterceptor(default_metadata))
+        return channel
+
+    return functools.partial(transport_cls, channel=create_channel)
+
 
 @dataclasses.dataclass
 class _ClientManager:
     client_config: dict[str, Any] = dataclasses.field(default_factory=dict)
     default_metadata: Sequence[tuple[str, str]] = ()
+    channel_pool_size: int = 1
+    # Bumped by every `configure`, so caches of API results can tell the project may have changed.
+    config_version: int = 0
 
     discuss_client: glm.DiscussServiceClient | None = None
     discuss_async_client: glm.DiscussServiceAsyncClient | None = None
     clients: dict[str, Any] = dataclasses.field(default_factory=dict)
 
+    # `grpc_asyncio` channels are bound to the event loop that created them, so async clients
+    # are cached per running loop, and under `None` when there's no running loop. The clients
+    # reference their loop, so closed loops are pruned explicitly rather than through weak
+    # references.
+    loop_clients: dict[asyncio.AbstractEventLoop | None, dict[str, Any]] = dataclasses.field(
+        default_factory=dict, repr=False
+    )
+    _lock: threading.RLock = dataclasses.field(
+        default_factory=threading.RLock, repr=False, compare=False
+    )
+
     def configure(
         self,
         *,
@@ -126,6 +576,7 @@ class _ClientManager:
         client_options: client_options_lib.ClientOptions | dict[str, Any] | None = None,
         client_info: gapic_v1.client_info.ClientInfo | None = None,
         default_metadata: Sequence[tuple[str, str]] = (),
+        channel_pool_size: int = 1,
     ) -> None:
         """Initializes default client configurations using specified parameters or environment variables.
 
@@ -143,7 +594,14 @@ class _ClientManager:
                 used.
             default_metadata: Default (key, value) metadata pairs to send with every request.
                 when using `transport="rest"` these are sent as HTTP headers.
+            channel_pool_size: The number of clients created for each service. Each one has
+                its own channel, and the default clients are handed out in turn, so concurrent
+                requests are spread over several HTTP/2 connections.
         """
+        if channel_pool_size < 1:
+            raise ValueError(
+                f"Invalid value: `channel_pool_size` must be a positive integer. Received: {channel_pool_size}."
+            )
         if isinstance(client_options, dict):
             client_options = client_options_lib.from_dict(client_options)
         if client_options is None:
@@ -183,12 +641,17 @@ class _ClientManager:
 
         client_config = {key: value for key, value in client_config.items() if value is not None}
 
-        self.client_config = client_config
-        self.default_metadata = default_metadata
+        with self._lock:
+            self.client_config = client_config
+            self.default_metadata = default_metadata
+            self.channel_pool_size = channel_pool_size
 
-        self.clients = {}
+            self.clients = {}
+            self.loop_clients = {}
+            self.config_version += 1
 
-    def make_client(self, name):
+    def make_client(self, name, *, separate_channel: bool = False):
+        is_async = name.endswith("_async")
         if name == "file":
             cls = FileServiceClient
         elif name == "file_async":
@@ -203,9 +666,27 @@ class _ClientManager:
         if not self.client_config:
             configure()
 
+        client_config = self.client_config
+        transport = client_config.get("transport")
+        if transport is None:
+            transport = "grpc_asyncio" if is_async else "grpc"
+        if cls in (FileServiceClient, FileServiceAsyncClient) and self.default_metadata:
+            # Uploads don't go through the transport, so they add the headers themselves.
+            client_config = {**client_config, "default_metadata": self.default_metadata}
+        if (self.default_metadata or separate_channel) and isinstance(transport, str):
+            client_config = {
+                **client_config,
+                "transport": _transport_factory(
+                    cls.get_transport_class(transport),
+                    transport,
+                    default_metadata=self.default_metadata,
+                    separate_channel=separate_channel,
+                ),
+            }
+
         try:
             with patch_colab_gce_credentials():
-                client = cls(**self.client_config)
+                client = cls(**client_config)
         except ga_exceptions.DefaultCredentialsError as e:
             e.args = (
                 "\n  No API_KEY or ADC found. Please either:\n"
@@ -215,56 +696,66 @@ class _ClientManager:
             )
             raise e
 
-        if not self.default_metadata:
-            return client
-
-        def keep(name, f):
-            if name.startswith("_"):
-                return False
-            elif name == "create_file":
-                return False
-            elif not isinstance(f, types.FunctionType):
-                return False
-            elif isinstance(f, classmethod):
-                return False
-            elif isinstance(f, staticmethod):
-                return False
-            else:
-                return True
-
-        def add_default_metadata_wrapper(f):
-            def call(*args, metadata=(), **kwargs):
-                metadata = list(metadata) + list(self.default_metadata)
-                return f(*args, **kwargs, metadata=metadata)
-
-            return call
+        return client
 
-        for name, value in cls.__dict__.items():
-            if not keep(name, value):
-                continue
-            f = getattr(client, name)
-            f = add_default_metadata_wrapper(f)
-            setattr(client, name, f)
+    def make_pool(self, name) -> _ClientPool:
+        return _ClientPool(
+            [self.make_client(name, separate_channel=True) for _ in range(self.channel_pool_size)]
+        )
 
-        return client
+    def _client_cache(self, name) -> dict[str, Any]:
+        """Returns the dict that caches the client for `name`."""
+        if not name.endswith("_async"):
+            return self.clients
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Async clients created outside of a running loop are shared by all such calls.
+            loop = None
+        if loop not in self.loop_clients:
+            closed = [
+                other for other in self.loop_clients if other is not None and other.is_closed()
+            ]
+            for other in closed:
+                del self.loop_clients[other]
+            self.loop_clients[loop] = {}
+        return self.loop_clients[loop]
 
     def get_default_client(self, name):
         name = name.lower()
         if name == "operations":
             return self.get_default_operations_client()
 
+        # Clients set directly in `self.clients` are used on every event loop.
         client = self.clients.get(name)
         if client is None:
-            client = self.make_client(name)
-            self.clients[name] = client
+            with self._lock:
+                client = self._client_cache(name).get(name)
+                if client is None:
+                    if self.channel_pool_size > 1:
+                        client = self.make_pool(name)
+                    else:
+                        client = self.make_client(name)
+                    # `make_client` may have called `configure`, which replaces the caches.
+                    self._client_cache(name)[name] = client
+
+        if isinstance(client, _ClientPool):
+            return client.next_client()
         return client
 
     def get_default_operations_client(self) -> operations_v1.OperationsClient:
         client = self.clients.get("operations", None)
         if client is None:
-            model_client = self.get_default_client("Model")
-            client = model_client._transport.operations_client
-            self.clients["operations"] = client
+            with self._lock:
+                client = self.clients.get("operations", None)
+                if client is None:
+                    model_client = self.get_default_client("Model")
+                    client = model_client._transport.operations_client
+                    # Over gRPC the operations client shares the model client's intercepted
+                    # channel, but over REST it has a session of its own.
+                    if self.default_metadata and hasattr(client._transport, "_session"):
+                        _add_session_headers(client._transport, self.default_metadata)
+                    self.clients["operations"] = client
         return client
 
 
@@ -282,6 +773,7 @@ def configure(
     client_options: client_options_lib.ClientOptions | dict | None = None,
     client_info: gapic_v1.client_info.ClientInfo | None = None,
     default_metadata: Sequence[tuple[str, str]] = (),
+    channel_pool_size: int = 1,
 ):
     """Captures default client configuration.
 
@@ -299,6 +791,9 @@ def configure(
             used.
         default_metadata: Default (key, value) metadata pairs to send with every request.
             when using `transport="rest"` these are sent as HTTP headers.
+        channel_pool_size: The number of clients created for each service. Each one has
+            its own channel, and the default clients are handed out in turn, so concurrent
+            requests are spread over several HTTP/2 connections.
     """
     return _client_manager.configure(
         api_key=api_key,
@@ -307,6 +802,7 @@ def configure(
         client_options=client_options,
         client_info=client_info,
         default_metadata=default_metadata,
+        channel_pool_size=channel_pool_size,
     )
 
 
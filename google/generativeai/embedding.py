@@ -14,11 +14,18 @@
 # limitations under the License.
 from __future__ import annotations
 
-import itertools
-from typing import Any, Iterable, overload, TypeVar, Union, Mapping
+import asyncio
+import collections
+import concurrent.futures
+import dataclasses
+import threading
+import typing
+from typing import Any, AsyncIterator, Iterable, Iterator, overload, Sequence, Union, Mapping
 
 import google.ai.generativelanguage as glm
+import google.api_core.exceptions
 
+from google.generativeai import embedding_cache
 from google.generativeai.client import get_default_generative_client
 from google.generativeai.client import get_default_generative_async_client
 
@@ -27,8 +34,18 @@ from google.generativeai.types import text_types
 from google.generativeai.types import model_types
 from google.generativeai.types import content_types
 
+if typing.TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
 DEFAULT_EMB_MODEL = "models/embedding-001"
 EMBEDDING_MAX_BATCH_SIZE = 100
+# A conservative bound on the serialized size of a `BatchEmbedContentsRequest`.
+EMBEDDING_MAX_BATCH_BYTES = 4 * 1024 * 1024
 
 EmbeddingTaskType = glm.TaskType
 
@@ -74,27 +91,507 @@ def to_task_type(x: EmbeddingTaskTypeOptions) -> EmbeddingTaskType:
     return _EMBEDDING_TASK_TYPE[x]
 
 
-try:
-    # python 3.12+
-    _batched = itertools.batched  # type: ignore
-except AttributeError:
-    T = TypeVar("T")
+class BatchEmbeddingError(Exception):
+    """Raised by `embed_content` when some of its concurrent batch requests failed.
+
+    Attributes:
+        failed_indices: The indices of the inputs whose batch failed.
+        errors: The exception raised by each failed batch, in input order.
+        embedding: The embeddings of all the inputs, `None` (or rows of `nan` with
+            `output="numpy"`) for the failed ones.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        failed_indices: list[int],
+        errors: list[Exception],
+        embedding: list[list[float] | None] | np.ndarray,
+    ):
+        super().__init__(message)
+        self.failed_indices = failed_indices
+        self.errors = errors
+        self.embedding = embedding
+
+
+class EmbeddingBatcher:
+    """Packs embedding requests into `batch_embed_contents` batches.
+
+    A batch is closed when it holds `max_batch_size` requests, or when the next request would
+    take its serialized size over `max_batch_bytes`. So long documents are sent in small batches
+    and short strings in full ones.
 
-    def _batched(iterable: Iterable[T], n: int) -> Iterable[list[T]]:
-        if n < 1:
+    If the API still rejects a batch as too large, with a "Request payload size exceeds the
+    limit" `InvalidArgument` error, the batch is split in half and both halves are retried.
+
+    Pass the same batcher to several calls to inspect the batches they sent:
+
+    >>> batcher = genai.embedding.EmbeddingBatcher()
+    >>> result = genai.embed_content(model, documents, batcher=batcher)
+    >>> batcher.shapes[:2]
+    [(100, 10543), (37, 1048321)]
+
+    Attributes:
+        shapes: The `(number of requests, size in bytes)` of each batch sent successfully.
+        splits: The number of batches that were split after being rejected as too large.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = EMBEDDING_MAX_BATCH_SIZE,
+        max_batch_bytes: int = EMBEDDING_MAX_BATCH_BYTES,
+    ):
+        if max_batch_size < 1:
             raise ValueError(
-                f"Invalid input: The batch size 'n' must be a positive integer. You entered: {n}. Please enter a number greater than 0."
+                f"Invalid value: `max_batch_size` must be a positive integer. Received: {max_batch_size}."
             )
+        if max_batch_bytes < 1:
+            raise ValueError(
+                f"Invalid value: `max_batch_bytes` must be a positive integer. Received: {max_batch_bytes}."
+            )
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.shapes: list[tuple[int, int]] = []
+        self.splits = 0
+        self._lock = threading.Lock()
+
+    def batches(
+        self, requests: Iterable[glm.EmbedContentRequest]
+    ) -> Iterator[list[glm.EmbedContentRequest]]:
+        """Lazily groups the `requests` into batches."""
         batch = []
-        for item in iterable:
-            batch.append(item)
-            if len(batch) == n:
+        batch_bytes = 0
+        for request in requests:
+            request_bytes = glm.EmbedContentRequest.pb(request).ByteSize()
+            if batch and (
+                len(batch) == self.max_batch_size
+                or batch_bytes + request_bytes > self.max_batch_bytes
+            ):
                 yield batch
                 batch = []
+                batch_bytes = 0
+            batch.append(request)
+            batch_bytes += request_bytes
 
         if batch:
             yield batch
 
+    def _record_batch(self, request: glm.BatchEmbedContentsRequest):
+        shape = (len(request.requests), glm.BatchEmbedContentsRequest.pb(request).ByteSize())
+        with self._lock:
+            self.shapes.append(shape)
+
+    def _record_split(self):
+        with self._lock:
+            self.splits += 1
+
+
+# The start of the `InvalidArgument` message for a request that's too large to send.
+_TOO_LARGE_MESSAGE = "Request payload size exceeds the limit"
+
+
+def _is_too_large(error: google.api_core.exceptions.InvalidArgument) -> bool:
+    return str(error.message).startswith(_TOO_LARGE_MESSAGE)
+
+
+def _check_output(output: str, out: np.ndarray | None):
+    if output not in ("list", "numpy"):
+        raise ValueError(
+            f"Invalid value: `output` must be either 'list' or 'numpy'. Received: {output!r}."
+        )
+    if output == "numpy" and np is None:
+        raise ImportError(
+            "The NumPy library is required for `output='numpy'`. Install it with `pip install google-generativeai[numpy]`."
+        )
+    if out is not None and output != "numpy":
+        raise ValueError("Invalid input: `out` can only be used with `output='numpy'`.")
+
+
+def _embeddings_to_array(
+    embeddings: list[Sequence[float] | None], out: np.ndarray | None = None
+) -> np.ndarray:
+    """Writes the embeddings' values into a `float32` matrix, one row per embedding.
+
+    The values are copied straight from the response protos, without building Python lists.
+    Rows of `None` embeddings are filled with `nan`. If `out` is given, it's used instead of a
+    new array, so it can be a preallocated buffer or an `np.memmap`.
+    """
+    dimensions = next((len(e) for e in embeddings if e is not None), 0)
+    shape = (len(embeddings), dimensions)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise ValueError(
+            f"Invalid input: `out` must have the shape {shape} to hold the embeddings. Received: {out.shape}."
+        )
+
+    for row, values in zip(out, embeddings):
+        if values is None:
+            row[:] = np.nan
+        else:
+            row[:] = values
+    return out
+
+
+def _to_embedding_dict(
+    embedding_response: glm.EmbedContentResponse, output: str, out: np.ndarray | None
+) -> text_types.EmbeddingDict:
+    if output == "numpy":
+        values = glm.EmbedContentResponse.pb(embedding_response).embedding.values
+        if out is not None:
+            out = out.reshape(1, -1)
+        return {"embedding": _embeddings_to_array([values], out)[0]}
+
+    embedding_dict = type(embedding_response).to_dict(embedding_response)
+    embedding_dict["embedding"] = embedding_dict["embedding"]["values"]
+    return embedding_dict
+
+
+def _embed_batch(
+    client: glm.GenerativeServiceClient,
+    model: str,
+    batch: list[glm.EmbedContentRequest],
+    request_options: helper_types.RequestOptionsType,
+    batcher: EmbeddingBatcher,
+) -> glm.BatchEmbedContentsResponse:
+    embedding_request = glm.BatchEmbedContentsRequest(model=model, requests=batch)
+    try:
+        response = client.batch_embed_contents(
+            embedding_request,
+            **request_options,
+        )
+    except google.api_core.exceptions.InvalidArgument as e:
+        if len(batch) < 2 or not _is_too_large(e):
+            raise
+        batcher._record_split()
+        half = len(batch) // 2
+        first = _embed_batch(client, model, batch[:half], request_options, batcher)
+        second = _embed_batch(client, model, batch[half:], request_options, batcher)
+        return glm.BatchEmbedContentsResponse(embeddings=[*first.embeddings, *second.embeddings])
+
+    batcher._record_batch(embedding_request)
+    return response
+
+
+async def _embed_batch_async(
+    client: glm.GenerativeServiceAsyncClient,
+    model: str,
+    batch: list[glm.EmbedContentRequest],
+    request_options: helper_types.RequestOptionsType,
+    batcher: EmbeddingBatcher,
+) -> glm.BatchEmbedContentsResponse:
+    embedding_request = glm.BatchEmbedContentsRequest(model=model, requests=batch)
+    try:
+        response = await client.batch_embed_contents(
+            embedding_request,
+            **request_options,
+        )
+    except google.api_core.exceptions.InvalidArgument as e:
+        if len(batch) < 2 or not _is_too_large(e):
+            raise
+        batcher._record_split()
+        half = len(batch) // 2
+        first = await _embed_batch_async(client, model, batch[:half], request_options, batcher)
+        second = await _embed_batch_async(client, model, batch[half:], request_options, batcher)
+        return glm.BatchEmbedContentsResponse(embeddings=[*first.embeddings, *second.embeddings])
+
+    batcher._record_batch(embedding_request)
+    return response
+
+
+def _with_placeholders(
+    embedding: list[list[float]], failed_indices: list[int], size: int
+) -> list[list[float] | None]:
+    """Returns the `embedding` of the inputs that didn't fail, with `None` at `failed_indices`."""
+    failed = set(failed_indices)
+    vectors = iter(embedding)
+    return [None if i in failed else next(vectors) for i in range(size)]
+
+
+def _join_batch_results(
+    batch_sizes: list[int],
+    results: list[glm.BatchEmbedContentsResponse | BaseException],
+    output: str,
+    out: np.ndarray | None,
+) -> list[list[float]] | np.ndarray:
+    """Concatenates the batch results in order, raising a `BatchEmbeddingError` if any failed."""
+    # Only the successful batches, the failed ones are filled in for `BatchEmbeddingError`.
+    embedding: list[list[float]] = []
+    failed_indices = []
+    failed_ranges = []
+    errors = []
+    start = 0
+    for size, result in zip(batch_sizes, results):
+        stop = start + size
+        if isinstance(result, BaseException):
+            failed_indices.extend(range(start, stop))
+            failed_ranges.append(f"{start}-{stop - 1}")
+            errors.append(result)
+        elif output == "numpy":
+            pb = glm.BatchEmbedContentsResponse.pb(result)
+            embedding.extend(e.values for e in pb.embeddings)
+        else:
+            embedding_dict = type(result).to_dict(result)
+            embedding.extend(e["values"] for e in embedding_dict["embeddings"])
+        start = stop
+
+    if errors:
+        partial = _with_placeholders(embedding, failed_indices, start)
+        raise BatchEmbeddingError(
+            f"{len(errors)} of {len(batch_sizes)} embedding batches failed, for the inputs: "
+            f"{', '.join(failed_ranges)}. The first error was: {errors[0]!r}",
+            failed_indices=failed_indices,
+            errors=errors,
+            embedding=_embeddings_to_array(partial, out) if output == "numpy" else partial,
+        ) from errors[0]
+    if output == "numpy":
+        return _embeddings_to_array(embedding, out)
+    return embedding
+
+
+def _embed_batches(
+    client: glm.GenerativeServiceClient,
+    model: str,
+    requests: Iterable[glm.EmbedContentRequest],
+    max_concurrency: int,
+    request_options: helper_types.RequestOptionsType,
+    batcher: EmbeddingBatcher,
+    output: str = "list",
+    out: np.ndarray | None = None,
+) -> list[list[float]] | np.ndarray:
+    if max_concurrency == 1:
+        batch_sizes = []
+        results = []
+        for batch in batcher.batches(requests):
+            results.append(_embed_batch(client, model, batch, request_options, batcher))
+            batch_sizes.append(len(batch))
+        return _join_batch_results(batch_sizes, results, output, out)
+
+    batches = list(batcher.batches(requests))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [
+            executor.submit(_embed_batch, client, model, batch, request_options, batcher)
+            for batch in batches
+        ]
+    results = [future.exception() or future.result() for future in futures]
+    return _join_batch_results([len(batch) for batch in batches], results, output, out)
+
+
+async def _embed_batches_async(
+    client: glm.GenerativeServiceAsyncClient,
+    model: str,
+    requests: Iterable[glm.EmbedContentRequest],
+    max_concurrency: int,
+    request_options: helper_types.RequestOptionsType,
+    batcher: EmbeddingBatcher,
+    output: str = "list",
+    out: np.ndarray | None = None,
+) -> list[list[float]] | np.ndarray:
+    if max_concurrency == 1:
+        batch_sizes = []
+        results = []
+        for batch in batcher.batches(requests):
+            results.append(await _embed_batch_async(client, model, batch, request_options, batcher))
+            batch_sizes.append(len(batch))
+        return _join_batch_results(batch_sizes, results, output, out)
+
+    batches = list(batcher.batches(requests))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _run_one(batch):
+        async with semaphore:
+            return await _embed_batch_async(client, model, batch, request_options, batcher)
+
+    results = await asyncio.gather(*[_run_one(batch) for batch in batches], return_exceptions=True)
+    return _join_batch_results([len(batch) for batch in batches], results, output, out)
+
+
+@dataclasses.dataclass
+class DeduplicationStats:
+    """Counts the inputs of the calls made with `deduplicate=True`.
+
+    Attributes:
+        inputs: The number of inputs.
+        duplicates: The number of inputs that weren't sent because an identical one was.
+    """
+
+    inputs: int = 0
+    duplicates: int = 0
+
+    def reset(self):
+        self.inputs = 0
+        self.duplicates = 0
+
+
+# Totals for this process, shared by `embed_content` and `text.generate_embeddings`.
+deduplication_stats = DeduplicationStats()
+_deduplication_stats_lock = threading.Lock()
+
+
+def _record_duplicates(inputs: int, duplicates: int):
+    with _deduplication_stats_lock:
+        deduplication_stats.inputs += inputs
+        deduplication_stats.duplicates += duplicates
+
+
+def _plan_requests(
+    requests: list[glm.EmbedContentRequest],
+    cache: embedding_cache.EmbeddingCache | None,
+    deduplicate: bool,
+) -> tuple[list[list[float] | int], list[glm.EmbedContentRequest], list[str | None]]:
+    """Decides which requests need to be sent.
+
+    Returns:
+        A plan with, for each request, either its cached vector or the index of the request to
+        send for it; the requests to send; and their cache keys.
+    """
+    if cache is not None:
+        keys = [cache.key(request) for request in requests]
+        cached = cache.get_many(keys)
+    else:
+        keys = [None] * len(requests)
+        cached = [None] * len(requests)
+
+    plan = []
+    to_send = []
+    send_keys = []
+    sent_index = {}
+    for i, (request, key, vector) in enumerate(zip(requests, keys, cached)):
+        if vector is not None:
+            plan.append(vector)
+            continue
+
+        if not deduplicate:
+            dedup_key = i
+        elif key is not None:
+            dedup_key = key
+        else:
+            dedup_key = glm.EmbedContentRequest.pb(request).SerializeToString(deterministic=True)
+
+        j = sent_index.get(dedup_key)
+        if j is None:
+            j = sent_index[dedup_key] = len(to_send)
+            to_send.append(request)
+            send_keys.append(key)
+        plan.append(j)
+
+    if deduplicate:
+        misses = sum(isinstance(p, int) for p in plan)
+        _record_duplicates(len(requests), misses - len(to_send))
+    return plan, to_send, send_keys
+
+
+def _assemble_results(
+    plan: list[list[float] | int],
+    fetched: list[list[float] | None] | np.ndarray,
+    send_keys: list[str | None],
+    cache: embedding_cache.EmbeddingCache | None,
+    error: BatchEmbeddingError | None,
+    output: str,
+    out: np.ndarray | None,
+) -> list[list[float]] | np.ndarray:
+    """Puts the `fetched` embeddings back in the order of the `plan`, and caches them."""
+    failed = set(error.failed_indices) if error is not None else set()
+
+    if cache is not None:
+        cache.put_many(
+            (key, vector)
+            for j, (key, vector) in enumerate(zip(send_keys, fetched))
+            if j not in failed
+        )
+
+    # Only the inputs that didn't fail, the failed ones are filled in for `BatchEmbeddingError`.
+    embedding: list[list[float]] = []
+    failed_indices = []
+    used = set()
+    for i, p in enumerate(plan):
+        if not isinstance(p, int):
+            embedding.append(p)
+            continue
+        vector = fetched[p]
+        if p in failed or vector is None:
+            failed_indices.append(i)
+        elif output == "list" and p in used:
+            # Each duplicate gets its own list.
+            embedding.append(list(vector))
+        else:
+            used.add(p)
+            embedding.append(vector)
+
+    if error is not None:
+        partial = _with_placeholders(embedding, failed_indices, len(plan))
+        raise BatchEmbeddingError(
+            f"{len(error.errors)} embedding batches failed, for {len(failed_indices)} of the "
+            f"{len(plan)} inputs. The first error was: {error.errors[0]!r}",
+            failed_indices=failed_indices,
+            errors=error.errors,
+            embedding=_embeddings_to_array(partial, out) if output == "numpy" else partial,
+        ) from error.errors[0]
+    if output == "numpy":
+        return _embeddings_to_array(embedding, out)
+    return embedding
+
+
+def _embed_many(
+    client: glm.GenerativeServiceClient,
+    model: str,
+    requests: Iterable[glm.EmbedContentRequest],
+    *,
+    max_concurrency: int,
+    request_options: helper_types.RequestOptionsType,
+    output: str,
+    out: np.ndarray | None,
+    cache: embedding_cache.EmbeddingCache | None,
+    deduplicate: bool,
+    batcher: EmbeddingBatcher,
+) -> list[list[float]] | np.ndarray:
+    if cache is None and not deduplicate:
+        return _embed_batches(
+            client, model, requests, max_concurrency, request_options, batcher, output, out
+        )
+
+    plan, to_send, send_keys = _plan_requests(list(requests), cache, deduplicate)
+    try:
+        fetched = _embed_batches(
+            client, model, to_send, max_concurrency, request_options, batcher, output
+        )
+        error = None
+    except BatchEmbeddingError as e:
+        fetched = e.embedding
+        error = e
+    return _assemble_results(plan, fetched, send_keys, cache, error, output, out)
+
+
+async def _embed_many_async(
+    client: glm.GenerativeServiceAsyncClient,
+    model: str,
+    requests: Iterable[glm.EmbedContentRequest],
+    *,
+    max_concurrency: int,
+    request_options: helper_types.RequestOptionsType,
+    output: str,
+    out: np.ndarray | None,
+    cache: embedding_cache.EmbeddingCache | None,
+    deduplicate: bool,
+    batcher: EmbeddingBatcher,
+) -> list[list[float]] | np.ndarray:
+    if cache is None and not deduplicate:
+        return await _embed_batches_async(
+            client, model, requests, max_concurrency, request_options, batcher, output, out
+        )
+
+    plan, to_send, send_keys = _plan_requests(list(requests), cache, deduplicate)
+    try:
+        fetched = await _embed_batches_async(
+            client, model, to_send, max_concurrency, request_options, batcher, output
+        )
+        error = None
+    except BatchEmbeddingError as e:
+        fetched = e.embedding
+        error = e
+    return _assemble_results(plan, fetched, send_keys, cache, error, output, out)
+
 
 @overload
 def embed_content(
@@ -105,6 +602,8 @@ def embed_content(
     output_dimensionality: int | None = None,
     client: glm.GenerativeServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
 ) -> text_types.EmbeddingDict: ...
 
 
@@ -115,8 +614,14 @@ def embed_content(
     task_type: EmbeddingTaskTypeOptions | None = None,
     title: str | None = None,
     output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
     client: glm.GenerativeServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    cache: embedding_cache.EmbeddingCache | None = None,
+    deduplicate: bool = False,
+    batcher: EmbeddingBatcher | None = None,
 ) -> text_types.BatchEmbeddingDict: ...
 
 
@@ -126,8 +631,14 @@ def embed_content(
     task_type: EmbeddingTaskTypeOptions | None = None,
     title: str | None = None,
     output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
     client: glm.GenerativeServiceClient = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    cache: embedding_cache.EmbeddingCache | None = None,
+    deduplicate: bool = False,
+    batcher: EmbeddingBatcher | None = None,
 ) -> text_types.EmbeddingDict | text_types.BatchEmbeddingDict:
     """Calls the API to create embeddings for content passed in.
 
@@ -152,9 +663,44 @@ def embed_content(
             excessive values from the output embeddings will be truncated from
             the end.
 
+        max_concurrency:
+            When embedding an iterable of contents, the maximum number of
+            `batch_embed_contents` requests in flight at once. By default the
+            batches are sent one after another. With more than one, every batch
+            is sent even if some fail, and a `BatchEmbeddingError` reports the
+            failed inputs.
+
         request_options:
             Options for the request.
 
+        output:
+            `"list"` (default) to return the embeddings as lists of floats, or
+            `"numpy"` to return them as a `float32` NumPy array: a vector for a
+            single content, or a matrix with one row per content. The values are
+            copied straight from the response, which is much faster and more
+            compact than building lists of Python floats.
+
+        out:
+            With `output="numpy"`, an optional array of the right shape to write
+            the embeddings into, for example a preallocated buffer or an
+            `np.memmap`.
+
+        cache:
+            An optional `genai.EmbeddingCache`. When embedding an iterable of
+            contents, only the contents missing from the cache are sent to the
+            API, and their embeddings are added to it.
+
+        deduplicate:
+            If True, identical contents in an iterable are only sent once, and
+            their embedding is copied to every position they appear at. The
+            totals are counted in `embedding.deduplication_stats`.
+
+        batcher:
+            An `EmbeddingBatcher` that decides how an iterable of contents is
+            split into `batch_embed_contents` requests, and records the batches
+            it sent. By default batches hold up to `EMBEDDING_MAX_BATCH_SIZE`
+            requests and `EMBEDDING_MAX_BATCH_BYTES` bytes.
+
     Return:
         Dictionary containing the embedding (list of float values) for the
         input content.
@@ -177,6 +723,16 @@ def embed_content(
             f"Invalid value: `output_dimensionality` must be a non-negative integer. Received: {output_dimensionality}."
         )
 
+    _check_output(output, out)
+
+    if batcher is None:
+        batcher = EmbeddingBatcher()
+
+    if max_concurrency < 1:
+        raise ValueError(
+            f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+        )
+
     if task_type:
         task_type = to_task_type(task_type)
 
@@ -192,14 +748,18 @@ def embed_content(
             )
             for c in content
         )
-        for batch in _batched(requests, EMBEDDING_MAX_BATCH_SIZE):
-            embedding_request = glm.BatchEmbedContentsRequest(model=model, requests=batch)
-            embedding_response = client.batch_embed_contents(
-                embedding_request,
-                **request_options,
-            )
-            embedding_dict = type(embedding_response).to_dict(embedding_response)
-            result["embedding"].extend(e["values"] for e in embedding_dict["embeddings"])
+        result["embedding"] = _embed_many(
+            client,
+            model,
+            requests,
+            max_concurrency=max_concurrency,
+            request_options=request_options,
+            output=output,
+            out=out,
+            cache=cache,
+            deduplicate=deduplicate,
+            batcher=batcher,
+        )
         return result
     else:
         embedding_request = glm.EmbedContentRequest(
@@ -213,9 +773,7 @@ def embed_content(
             embedding_request,
             **request_options,
         )
-        embedding_dict = type(embedding_response).to_dict(embedding_response)
-        embedding_dict["embedding"] = embedding_dict["embedding"]["values"]
-        return embedding_dict
+        return _to_embedding_dict(embedding_response, output, out)
 
 
 @overload
@@ -227,6 +785,8 @@ async def embed_content_async(
     output_dimensionality: int | None = None,
     client: glm.GenerativeServiceAsyncClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
 ) -> text_types.EmbeddingDict: ...
 
 
@@ -237,8 +797,14 @@ async def embed_content_async(
     task_type: EmbeddingTaskTypeOptions | None = None,
     title: str | None = None,
     output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
     client: glm.GenerativeServiceAsyncClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    cache: embedding_cache.EmbeddingCache | None = None,
+    deduplicate: bool = False,
+    batcher: EmbeddingBatcher | None = None,
 ) -> text_types.BatchEmbeddingDict: ...
 
 
@@ -248,8 +814,14 @@ async def embed_content_async(
     task_type: EmbeddingTaskTypeOptions | None = None,
     title: str | None = None,
     output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
     client: glm.GenerativeServiceAsyncClient = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    cache: embedding_cache.EmbeddingCache | None = None,
+    deduplicate: bool = False,
+    batcher: EmbeddingBatcher | None = None,
 ) -> text_types.EmbeddingDict | text_types.BatchEmbeddingDict:
     """Calls the API to create async embeddings for content passed in."""
 
@@ -270,6 +842,16 @@ async def embed_content_async(
             f"Invalid value: `output_dimensionality` must be a non-negative integer. Received: {output_dimensionality}."
         )
 
+    _check_output(output, out)
+
+    if batcher is None:
+        batcher = EmbeddingBatcher()
+
+    if max_concurrency < 1:
+        raise ValueError(
+            f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+        )
+
     if task_type:
         task_type = to_task_type(task_type)
 
@@ -285,14 +867,18 @@ async def embed_content_async(
             )
             for c in content
         )
-        for batch in _batched(requests, EMBEDDING_MAX_BATCH_SIZE):
-            embedding_request = glm.BatchEmbedContentsRequest(model=model, requests=batch)
-            embedding_response = await client.batch_embed_contents(
-                embedding_request,
-                **request_options,
-            )
-            embedding_dict = type(embedding_response).to_dict(embedding_response)
-            result["embedding"].extend(e["values"] for e in embedding_dict["embeddings"])
+        result["embedding"] = await _embed_many_async(
+            client,
+            model,
+            requests,
+            max_concurrency=max_concurrency,
+            request_options=request_options,
+            output=output,
+            out=out,
+            cache=cache,
+            deduplicate=deduplicate,
+            batcher=batcher,
+        )
         return result
     else:
         embedding_request = glm.EmbedContentRequest(
@@ -306,6 +892,218 @@ async def embed_content_async(
             embedding_request,
             **request_options,
         )
-        embedding_dict = type(embedding_response).to_dict(embedding_response)
-        embedding_dict["embedding"] = embedding_dict["embedding"]["values"]
-        return embedding_dict
+        return _to_embedding_dict(embedding_response, output, out)
+
+
+def _iter_requests(
+    model: str,
+    content: Iterable[content_types.ContentType],
+    task_type: EmbeddingTaskTypeOptions | None,
+    title: str | None,
+    output_dimensionality: int | None,
+    max_concurrency: int,
+    output: str,
+) -> Iterator[glm.EmbedContentRequest]:
+    """Checks the arguments of `embed_content_iter`, and lazily builds its requests."""
+    if title and to_task_type(task_type) is not EmbeddingTaskType.RETRIEVAL_DOCUMENT:
+        raise ValueError(
+            f"Invalid task type: When a title is specified, the task must be of a 'retrieval document' type. Received task type: {task_type} and title: {title}."
+        )
+
+    if output_dimensionality and output_dimensionality < 0:
+        raise ValueError(
+            f"Invalid value: `output_dimensionality` must be a non-negative integer. Received: {output_dimensionality}."
+        )
+
+    _check_output(output, None)
+
+    if max_concurrency < 1:
+        raise ValueError(
+            f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+        )
+
+    if task_type:
+        task_type = to_task_type(task_type)
+
+    return (
+        glm.EmbedContentRequest(
+            model=model,
+            content=content_types.to_content(c),
+            task_type=task_type,
+            title=title,
+            output_dimensionality=output_dimensionality,
+        )
+        for c in content
+    )
+
+
+def _batch_result(
+    start: int,
+    size: int,
+    result: glm.BatchEmbedContentsResponse | BaseException,
+    output: str,
+) -> tuple[int, list[list[float]] | np.ndarray]:
+    if isinstance(result, BaseException):
+        raise BatchEmbeddingError(
+            f"The embedding batch for the inputs {start}-{start + size - 1} failed: {result!r}",
+            failed_indices=list(range(start, start + size)),
+            errors=[result],
+            embedding=[None] * size,
+        ) from result
+    return start, _join_batch_results([size], [result], output, None)
+
+
+def embed_content_iter(
+    model: model_types.BaseModelNameOptions,
+    content: Iterable[content_types.ContentType],
+    task_type: EmbeddingTaskTypeOptions | None = None,
+    title: str | None = None,
+    output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
+    client: glm.GenerativeServiceClient | None = None,
+    request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    batcher: EmbeddingBatcher | None = None,
+) -> Iterator[tuple[int, list[list[float]] | np.ndarray]]:
+    """Lazily embeds an iterable of contents, yielding the embeddings one batch at a time.
+
+    Unlike `embed_content`, which returns once every embedding is ready, this consumes `content`
+    as it goes and yields `(index, embeddings)` pairs, where `index` is the position of the
+    batch's first content. So results can be written out incrementally with bounded memory:
+
+    >>> for index, embeddings in genai.embed_content_iter(model, read_documents()):
+    ...     store(index, embeddings)
+
+    Batches are yielded in input order. With `max_concurrency` greater than one, that many
+    requests are kept in flight. If a batch fails, a `BatchEmbeddingError` with its indices is
+    raised.
+
+    The arguments are the same as for `embed_content`.
+    """
+    model = model_types.make_model_name(model)
+
+    if request_options is None:
+        request_options = {}
+
+    if client is None:
+        client = get_default_generative_client()
+
+    if batcher is None:
+        batcher = EmbeddingBatcher()
+
+    requests = _iter_requests(
+        model, content, task_type, title, output_dimensionality, max_concurrency, output
+    )
+    return _embed_iter(client, model, requests, max_concurrency, request_options, batcher, output)
+
+
+def _embed_iter(
+    client: glm.GenerativeServiceClient,
+    model: str,
+    requests: Iterable[glm.EmbedContentRequest],
+    max_concurrency: int,
+    request_options: helper_types.RequestOptionsType,
+    batcher: EmbeddingBatcher,
+    output: str,
+) -> Iterator[tuple[int, list[list[float]] | np.ndarray]]:
+    start = 0
+    if max_concurrency == 1:
+        for batch in batcher.batches(requests):
+            try:
+                result = _embed_batch(client, model, batch, request_options, batcher)
+            except Exception as e:
+                result = e
+            yield _batch_result(start, len(batch), result, output)
+            start += len(batch)
+        return
+
+    pending = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        try:
+            for batch in batcher.batches(requests):
+                future = executor.submit(
+                    _embed_batch, client, model, batch, request_options, batcher
+                )
+                pending.append((start, len(batch), future))
+                start += len(batch)
+                if len(pending) == max_concurrency:
+                    batch_start, size, future = pending.popleft()
+                    yield _batch_result(
+                        batch_start, size, future.exception() or future.result(), output
+                    )
+
+            while pending:
+                batch_start, size, future = pending.popleft()
+                yield _batch_result(
+                    batch_start, size, future.exception() or future.result(), output
+                )
+        finally:
+            # Don't send the queued batches if the caller stopped early.
+            for _, _, future in pending:
+                future.cancel()
+
+
+async def embed_content_aiter(
+    model: model_types.BaseModelNameOptions,
+    content: Iterable[content_types.ContentType],
+    task_type: EmbeddingTaskTypeOptions | None = None,
+    title: str | None = None,
+    output_dimensionality: int | None = None,
+    max_concurrency: int = 1,
+    client: glm.GenerativeServiceAsyncClient | None = None,
+    request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    batcher: EmbeddingBatcher | None = None,
+) -> AsyncIterator[tuple[int, list[list[float]] | np.ndarray]]:
+    """The async version of `embed_content_iter`.
+
+    >>> async for index, embeddings in genai.embed_content_aiter(model, documents):
+    ...     store(index, embeddings)
+    """
+    model = model_types.make_model_name(model)
+
+    if request_options is None:
+        request_options = {}
+
+    if client is None:
+        client = get_default_generative_async_client()
+
+    if batcher is None:
+        batcher = EmbeddingBatcher()
+
+    requests = _iter_requests(
+        model, content, task_type, title, output_dimensionality, max_concurrency, output
+    )
+
+    start = 0
+    if max_concurrency == 1:
+        for batch in batcher.batches(requests):
+            try:
+                result = await _embed_batch_async(client, model, batch, request_options, batcher)
+            except Exception as e:
+                result = e
+            yield _batch_result(start, len(batch), result, output)
+            start += len(batch)
+        return
+
+    async def _run_one(batch):
+        try:
+            return await _embed_batch_async(client, model, batch, request_options, batcher)
+        except Exception as e:
+            return e
+
+    pending = collections.deque()
+    try:
+        for batch in batcher.batches(requests):
+            pending.append((start, len(batch), asyncio.ensure_future(_run_one(batch))))
+            start += len(batch)
+            if len(pending) == max_concurrency:
+                batch_start, size, task = pending.popleft()
+                yield _batch_result(batch_start, size, await task, output)
+
+        while pending:
+            batch_start, size, task = pending.popleft()
+            yield _batch_result(batch_start, size, await task, output)
+    finally:
+        for _, _, task in pending:
+            task.cancel()
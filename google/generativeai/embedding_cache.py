@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent cache for `genai.embed_content` results."""
+from __future__ import annotations
+
+import array
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Sequence
+
+import google.ai.generativelanguage as glm
+
+__all__ = ["EmbeddingCache"]
+
+DEFAULT_MAX_SIZE_BYTES = 1 << 30
+
+# SQLite limits the number of `?` parameters in a single statement.
+_MAX_QUERY_PARAMS = 500
+# `ContentEmbedding.values` are 32-bit floats, so storing them as such loses nothing.
+_VECTOR_TYPECODE = "f"
+
+
+class EmbeddingCache:
+    """A content addressed, on-disk cache of embeddings, backed by SQLite.
+
+    Pass it to `genai.embed_content` to only send the contents that aren't in the cache yet:
+
+    >>> cache = genai.EmbeddingCache("embeddings.sqlite")
+    >>> result = genai.embed_content(model, documents, cache=cache)
+
+    Entries are keyed by a hash of the whole `glm.EmbedContentRequest`: the model, task type,
+    title, output dimensionality and content. Vectors are stored as 32-bit floats. When the
+    stored vectors exceed `max_size_bytes`, the least recently used entries are evicted.
+
+    The cache can be shared between threads.
+
+    Args:
+        path: The SQLite database file. The default `":memory:"` keeps the cache in memory.
+        max_size_bytes: The maximum size of the stored vectors, or `None` for no limit.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike = ":memory:",
+        *,
+        max_size_bytes: int | None = DEFAULT_MAX_SIZE_BYTES,
+    ):
+        if max_size_bytes is not None and max_size_bytes < 0:
+            raise ValueError(
+                f"Invalid value: `max_size_bytes` must be a non-negative integer. Received: {max_size_bytes}."
+            )
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(os.fspath(path), check_same_thread=False)
+        # Makes the rows replaced by `INSERT OR REPLACE` fire the delete trigger.
+        self._connection.execute("PRAGMA recursive_triggers = ON")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+            # The total size of the vectors is kept up to date by triggers, so eviction
+            # doesn't have to scan the table. It's stored in the database, so processes sharing
+            # the file agree on it.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), size INTEGER NOT NULL)"
+            )
+            self._connection.execute(
+                "INSERT OR IGNORE INTO stats (id, size) "
+                "SELECT 0, COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS embeddings_insert AFTER INSERT ON embeddings "
+                "BEGIN UPDATE stats SET size = size + LENGTH(NEW.vector); END"
+            )
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS embeddings_delete AFTER DELETE ON embeddings "
+                "BEGIN UPDATE stats SET size = size - LENGTH(OLD.vector); END"
+            )
+
+    @staticmethod
+    def key(request: glm.EmbedContentRequest) -> str:
+        """Returns the cache key of an embedding request."""
+        data = glm.EmbedContentRequest.pb(request).SerializeToString(deterministic=True)
+        return hashlib.sha256(data).hexdigest()
+
+    def get_many(self, keys: Sequence[str]) -> list[list[float] | None]:
+        """Returns the cached vector for each key, or `None` where it's missing."""
+        found = {}
+        now = time.time()
+        with self._lock, self._connection:
+            for start in range(0, len(keys), _MAX_QUERY_PARAMS):
+                chunk = list(keys[start : start + _MAX_QUERY_PARAMS])
+                params = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({params})", chunk
+                )
+                found.update(rows)
+                self._connection.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({params})", [now, *chunk]
+                )
+
+        result = []
+        for key in keys:
+            vector = found.get(key)
+            if vector is None:
+                self.misses += 1
+                result.append(None)
+            else:
+                self.hits += 1
+                result.append(array.array(_VECTOR_TYPECODE, vector).tolist())
+        return result
+
+    def put_many(self, items: Iterable[tuple[str, Sequence[float]]]):
+        """Stores the `(key, vector)` pairs, then evicts the oldest entries if over the size limit."""
+        now = time.time()
+        rows = [
+            (key, array.array(_VECTOR_TYPECODE, vector).tobytes(), now) for key, vector in items
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._evict()
+
+    def _evict(self):
+        if self.max_size_bytes is None:
+            return
+        (size,) = self._connection.execute("SELECT size FROM stats").fetchone()
+        if size <= self.max_size_bytes:
+            return
+
+        excess = size - self.max_size_bytes
+        evicted = []
+        for key, length in self._connection.execute(
+            "SELECT key, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        ):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= length
+        self._connection.executemany("DELETE FROM embeddings WHERE key = ?", evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM embeddings")
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -14,19 +14,57 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import datetime
+import hashlib
+import mmap
 import os
 import pathlib
 import mimetypes
-from typing import Iterable
+import random
+import threading
+import time
+from typing import Any, AsyncIterable, Callable, Iterable, Iterator, Union
 import logging
 import google.ai.generativelanguage as glm
 from itertools import islice
 
+import tqdm.auto as tqdm
+
 from google.generativeai.types import file_types
 
+from google.generativeai import client as client_lib
+from google.generativeai import utils
 from google.generativeai.client import get_default_file_client
+from google.generativeai.client import get_default_file_async_client
+
+__all__ = [
+    "upload_file",
+    "upload_file_async",
+    "upload_files",
+    "get_file",
+    "get_file_async",
+    "list_files",
+    "list_files_async",
+    "delete_file",
+    "delete_file_async",
+    "wait_for_files",
+    "wait_for_files_async",
+]
+
+DEFAULT_UPLOAD_CONCURRENCY = 8
+# How long the index of existing files is trusted before it's listed again.
+DEFAULT_UPLOAD_INDEX_MAX_AGE = 300.0
+_HASH_BLOCK_SIZE = 16 * 1024 * 1024
+# Waiting on at least this many files refreshes them with one `list_files` scan, instead of
+# a `get_file` call each.
+_WAIT_LIST_FILES_THRESHOLD = 10
+
+FileNameType = Union[str, file_types.File, glm.File]
 
-__all__ = ["upload_file", "get_file", "list_files", "delete_file"]
+# `True` shows a tqdm progress bar, a callable is called with `(bytes_uploaded, total_bytes)`.
+ProgressType = Union[bool, Callable[[int, int], None]]
 
 
 def upload_file(
@@ -36,6 +74,9 @@ def upload_file(
     name: str | None = None,
     display_name: str | None = None,
     resumable: bool = True,
+    chunk_size: int = client_lib.DEFAULT_UPLOAD_CHUNK_SIZE,
+    progress: ProgressType = False,
+    deduplicate: bool = False,
 ) -> file_types.File:
     """Calls the API to upload a file using a supported file service.
 
@@ -49,14 +90,277 @@ def upload_file(
         resumable: Whether to use the resumable upload protocol. By default, this is enabled.
             See details at
             https://googleapis.github.io/google-api-python-client/docs/epy/googleapiclient.http.MediaFileUpload-class.html#resumable
+            An interrupted resumable upload continues from the last byte the server received.
+        chunk_size: The number of bytes sent per request of a resumable upload. Must be a
+            multiple of 256 KiB.
+        progress: `True` to show a progress bar, or a function called with
+            `(bytes_uploaded, total_bytes)` as the upload progresses.
+        deduplicate: If `True`, the file's SHA-256 hash is checked against the `ACTIVE` files
+            already uploaded, and a file with the same hash and MIME type is returned instead
+            of uploading it again. The existing files are listed with `list_files` and cached
+            for a few minutes. The returned file keeps its original `name` and `display_name`.
 
     Returns:
         file_types.File: The response of the uploaded file.
     """
+    path = pathlib.Path(os.fspath(path))
+    with _Progress(progress) as callback:
+        return _upload_file(
+            path,
+            mime_type=mime_type,
+            name=name,
+            display_name=display_name,
+            resumable=resumable,
+            chunk_size=chunk_size,
+            progress=callback,
+            deduplicate=deduplicate,
+        )
+
+
+def upload_files(
+    paths: Iterable[str | pathlib.Path | os.PathLike],
+    *,
+    max_concurrency: int = DEFAULT_UPLOAD_CONCURRENCY,
+    resumable: bool = True,
+    chunk_size: int = client_lib.DEFAULT_UPLOAD_CHUNK_SIZE,
+    progress: ProgressType = False,
+    deduplicate: bool = False,
+) -> list[file_types.File | Exception]:
+    """Uploads many files concurrently, see `upload_file`.
+
+    The MIME type of each file is inferred from its extension, and its display name is the
+    file name.
+
+    Args:
+        paths: The paths of the files to upload.
+        max_concurrency: The maximum number of uploads in progress at once.
+        resumable: Whether to use the resumable upload protocol.
+        chunk_size: The number of bytes sent per request of a resumable upload.
+        progress: `True` to show one progress bar for all the files, or a function called with
+            `(bytes_uploaded, total_bytes)` summed over all the files.
+        deduplicate: If `True`, files that were already uploaded are not uploaded again, see
+            `upload_file`.
+
+    Returns:
+        The uploaded files, in the order of `paths`. A file that failed to upload is replaced
+        by the exception raised for it, so one failure doesn't lose the other uploads.
+    """
+    if max_concurrency < 1:
+        raise ValueError(
+            f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+        )
+    paths = [pathlib.Path(os.fspath(path)) for path in paths]
+    # A missing file is reported in place by its upload, it just doesn't count toward the total.
+    sizes = [path.stat().st_size if path.is_file() else 0 for path in paths]
+
+    with _Progress(progress) as callback:
+        lock = threading.Lock()
+        uploaded = [0] * len(paths)
+        total_uploaded = 0
+
+        def _upload_one(index: int):
+            def file_progress(file_uploaded: int, file_total: int):
+                nonlocal total_uploaded
+                if callback is None:
+                    return
+                with lock:
+                    total_uploaded += file_uploaded - uploaded[index]
+                    uploaded[index] = file_uploaded
+                    callback(total_uploaded, sum(sizes))
+
+            try:
+                return _upload_file(
+                    paths[index],
+                    resumable=resumable,
+                    chunk_size=chunk_size,
+                    progress=file_progress,
+                    deduplicate=deduplicate,
+                )
+            except Exception as e:
+                return e
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(_upload_one, range(len(paths))))
+
+
+class _Progress:
+    """Turns a `ProgressType` into a `(bytes_uploaded, total_bytes)` callback, or `None`.
+
+    For `True`, the callback drives a tqdm bar that is closed on exit.
+    """
+
+    def __init__(self, progress: ProgressType):
+        self._bar = None
+        if progress is True:
+            self._bar = tqdm.tqdm(unit="B", unit_scale=True, unit_divisor=1024)
+            self.callback = self._update_bar
+        elif callable(progress):
+            self.callback = progress
+        else:
+            self.callback = None
+
+    def _update_bar(self, uploaded: int, total: int):
+        self._bar.total = total
+        self._bar.update(uploaded - self._bar.n)
+
+    def __enter__(self):
+        return self.callback
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._bar is not None:
+            self._bar.close()
+
+
+def _upload_file(
+    path: pathlib.Path,
+    *,
+    mime_type: str | None = None,
+    name: str | None = None,
+    display_name: str | None = None,
+    resumable: bool,
+    chunk_size: int,
+    progress: Callable[[int, int], None] | None,
+    deduplicate: bool = False,
+) -> file_types.File:
     client = get_default_file_client()
+    mime_type, name, display_name = _file_fields(path, mime_type, name, display_name)
+    if deduplicate:
+        digest = _sha256(path)
+        existing = _get_upload_index().lookup(digest, mime_type)
+        if existing is not None:
+            if progress is not None:
+                size = path.stat().st_size
+                progress(size, size)
+            return existing
 
-    path = pathlib.Path(os.fspath(path))
+    response = client.create_file(
+        path=path,
+        mime_type=mime_type,
+        name=name,
+        display_name=display_name,
+        resumable=resumable,
+        chunk_size=chunk_size,
+        progress=progress,
+    )
+    uploaded = file_types.File(response)
+    if deduplicate:
+        _get_upload_index().add(digest, uploaded)
+    return uploaded
+
+
+def _sha256(path: pathlib.Path) -> bytes:
+    """Returns the SHA-256 digest of a file, hashing it through a memory map, block by block."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be memory mapped.
+            return sha256.digest()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                for start in range(0, len(view), _HASH_BLOCK_SIZE):
+                    sha256.update(view[start : start + _HASH_BLOCK_SIZE])
+            finally:
+                view.release()
+    return sha256.digest()
+
+
+def _normalize_sha256(sha256_hash: bytes) -> bytes | None:
+    """Returns a `File.sha256_hash` as a raw digest, whether it's raw or hex encoded."""
+    if len(sha256_hash) == hashlib.sha256().digest_size:
+        return bytes(sha256_hash)
+    try:
+        return bytes.fromhex(sha256_hash.decode("ascii"))
+    except ValueError:
+        return None
+
+
+class _UploadIndex:
+    """The `ACTIVE` files of the project, by SHA-256 digest and MIME type.
+
+    The index is filled from `list_files`, and listed again once it's older than `max_age`.
+    Files uploaded or deleted through this module update it directly. Only one thread lists
+    the files at a time, the others wait for its result.
+    """
 
+    def __init__(self, max_age: float = DEFAULT_UPLOAD_INDEX_MAX_AGE):
+        self.max_age = max_age
+        self._files: dict[tuple[bytes, str | None], file_types.File] = {}
+        self._refreshed_at: float | None = None
+        self._scope = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def set_scope(self, scope: Any):
+        """Empties the index if `scope`, like the client configuration, has changed."""
+        with self._lock:
+            if scope != self._scope:
+                self._files = {}
+                self._refreshed_at = None
+                self._scope = scope
+
+    def _is_stale(self) -> bool:
+        with self._lock:
+            return (
+                self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.max_age
+            )
+
+    def refresh(self):
+        with self._lock:
+            scope = self._scope
+        files = {}
+        for f in list_files():
+            digest = _normalize_sha256(f.sha256_hash)
+            if f.state == glm.File.State.ACTIVE and digest is not None:
+                files[(digest, f.mime_type)] = f
+        with self._lock:
+            if scope != self._scope:
+                # The files were listed with a configuration that's no longer current.
+                return
+            self._files = files
+            self._refreshed_at = time.monotonic()
+
+    def lookup(self, digest: bytes, mime_type: str | None) -> file_types.File | None:
+        if self._is_stale():
+            with self._refresh_lock:
+                # Another thread may have refreshed the index while this one waited.
+                if self._is_stale():
+                    self.refresh()
+
+        with self._lock:
+            f = self._files.get((digest, mime_type))
+        if f is None:
+            return None
+        expiration_time = f.expiration_time
+        if expiration_time and expiration_time <= datetime.datetime.now(datetime.timezone.utc):
+            return None
+        return f
+
+    def add(self, digest: bytes, f: file_types.File):
+        if f.state != glm.File.State.ACTIVE:
+            # Files still processing are picked up by the next refresh.
+            return
+        with self._lock:
+            self._files[(digest, f.mime_type)] = f
+
+    def discard(self, name: str):
+        with self._lock:
+            self._files = {key: f for key, f in self._files.items() if f.name != name}
+
+
+_upload_index = _UploadIndex()
+
+
+def _get_upload_index() -> _UploadIndex:
+    """Returns the index of uploaded files for the current client configuration."""
+    _upload_index.set_scope(client_lib._client_manager.config_version)
+    return _upload_index
+
+
+def _file_fields(
+    path: pathlib.Path, mime_type: str | None, name: str | None, display_name: str | None
+) -> tuple[str | None, str | None, str]:
+    """Fills in the defaults for a file's `mime_type`, `name` and `display_name`."""
     if mime_type is None:
         mime_type, _ = mimetypes.guess_type(path)
 
@@ -66,18 +370,63 @@ def upload_file(
     if display_name is None:
         display_name = path.name
 
-    response = client.create_file(
-        path=path, mime_type=mime_type, name=name, display_name=display_name, resumable=resumable
-    )
-    return file_types.File(response)
+    return mime_type, name, display_name
+
+
+async def upload_file_async(
+    path: str | pathlib.Path | os.PathLike,
+    *,
+    mime_type: str | None = None,
+    name: str | None = None,
+    display_name: str | None = None,
+    resumable: bool = True,
+    chunk_size: int = client_lib.DEFAULT_UPLOAD_CHUNK_SIZE,
+    progress: ProgressType = False,
+    deduplicate: bool = False,
+) -> file_types.File:
+    """The async version of `upload_file`.
+
+    The upload runs in a worker thread, so it doesn't block the event loop. `progress` is
+    called from that thread.
+    """
+    client = get_default_file_async_client()
+    path = pathlib.Path(os.fspath(path))
+    mime_type, name, display_name = _file_fields(path, mime_type, name, display_name)
+    with _Progress(progress) as callback:
+        if deduplicate:
+            # Hashing and refreshing the index block, so they run in a worker thread.
+            digest = await asyncio.to_thread(_sha256, path)
+            existing = await asyncio.to_thread(_get_upload_index().lookup, digest, mime_type)
+            if existing is not None:
+                if callback is not None:
+                    size = path.stat().st_size
+                    callback(size, size)
+                return existing
+
+        response = await client.create_file(
+            path=path,
+            mime_type=mime_type,
+            name=name,
+            display_name=display_name,
+            resumable=resumable,
+            chunk_size=chunk_size,
+            progress=callback,
+        )
+    uploaded = file_types.File(response)
+    if deduplicate:
+        _get_upload_index().add(digest, uploaded)
+    return uploaded
+
 
+def list_files(page_size=100, prefetch: int = utils.DEFAULT_PREFETCH) -> Iterable[file_types.File]:
+    """Calls the API to list files using a supported file service.
 
-def list_files(page_size=100) -> Iterable[file_types.File]:
-    """Calls the API to list files using a supported file service."""
+    While one page of files is consumed, up to `prefetch` more are fetched in the background.
+    """
     client = get_default_file_client()
 
     response = client.list_files(glm.ListFilesRequest(page_size=page_size))
-    for proto in response:
+    for proto in utils.iter_prefetched(response, "files", prefetch):
         yield file_types.File(proto)
 
 
@@ -94,3 +443,179 @@ def delete_file(name):
     request = glm.DeleteFileRequest(name=name)
     client = get_default_file_client()
     client.delete_file(request=request)
+    _get_upload_index().discard(name)
+
+
+async def list_files_async(
+    page_size=100, prefetch: int = utils.DEFAULT_PREFETCH
+) -> AsyncIterable[file_types.File]:
+    """The async version of `list_files`."""
+    client = get_default_file_async_client()
+
+    response = await client.list_files(glm.ListFilesRequest(page_size=page_size))
+    async for proto in utils.aiter_prefetched(response, "files", prefetch):
+        yield file_types.File(proto)
+
+
+async def get_file_async(name) -> file_types.File:
+    """The async version of `get_file`."""
+    client = get_default_file_async_client()
+    return file_types.File(await client.get_file(name=name))
+
+
+async def delete_file_async(name):
+    """The async version of `delete_file`."""
+    if isinstance(name, (file_types.File, glm.File)):
+        name = name.name
+    request = glm.DeleteFileRequest(name=name)
+    client = get_default_file_async_client()
+    await client.delete_file(request=request)
+    _get_upload_index().discard(name)
+
+
+def _file_name(f: FileNameType) -> str:
+    if isinstance(f, (file_types.File, glm.File)):
+        return f.name
+    return f
+
+
+def _is_processed(f: file_types.File | glm.File) -> bool:
+    return f.state in (glm.File.State.ACTIVE, glm.File.State.FAILED)
+
+
+def _poll_delay(poll: int, poll_interval: float, max_poll_interval: float) -> float:
+    """An exponential backoff, with jitter so many waiters don't poll in lockstep."""
+    delay = min(poll_interval * 2**poll, max_poll_interval)
+    return random.uniform(delay / 2, delay)
+
+
+def _wait_timeout_error(pending: dict[str, file_types.File], timeout: float) -> TimeoutError:
+    return TimeoutError(
+        f"Timed out after {timeout} seconds waiting for files to be processed: {sorted(pending)}."
+    )
+
+
+def _wait_pending(files: Iterable[FileNameType]) -> tuple[list[file_types.File], dict[str, None]]:
+    """Splits `files` into the ones already processed and the names still to wait for."""
+    done = []
+    pending = {}
+    for f in files:
+        if not isinstance(f, (str, file_types.File, glm.File)):
+            # For example an exception from `upload_files`.
+            raise TypeError(
+                f"Invalid input: `files` must contain file names or `File` objects. Received a '{type(f).__name__}' object: {f!r}"
+            )
+        if isinstance(f, (file_types.File, glm.File)) and _is_processed(f):
+            done.append(file_types.File(f))
+        else:
+            pending[_file_name(f)] = None
+    return done, pending
+
+
+def wait_for_files(
+    files: Iterable[FileNameType],
+    *,
+    timeout: float | None = None,
+    poll_interval: float = 1.0,
+    max_poll_interval: float = 30.0,
+) -> Iterator[file_types.File]:
+    """Waits for uploaded files to finish processing, yielding each one as soon as it's done.
+
+    Files like videos are `PROCESSING` for a while after `upload_file` returns, and can't be
+    used in a prompt until they're `ACTIVE`.
+
+    ```
+    results = genai.upload_files(paths)
+    files = [r for r in results if not isinstance(r, Exception)]
+    for f in genai.wait_for_files(files, timeout=600):
+        if f.state.name == "FAILED":
+            print(f.name, f.error)
+    ```
+
+    The files are polled with exponential backoff. When waiting on many files, each poll is one
+    `list_files` scan rather than a `get_file` call per file.
+
+    Args:
+        files: The files to wait for, as `File` objects or names.
+        timeout: The maximum number of seconds to wait. `None` waits forever.
+        poll_interval: The number of seconds before the first poll. It doubles with every poll.
+        max_poll_interval: The longest wait between polls.
+
+    Yields:
+        The refreshed files, as each one becomes `ACTIVE` or `FAILED`.
+
+    Raises:
+        TimeoutError: If files are still processing after `timeout` seconds.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    done, pending = _wait_pending(files)
+    yield from done
+
+    poll = 0
+    while pending:
+        delay = _poll_delay(poll, poll_interval, max_poll_interval)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _wait_timeout_error(pending, timeout)
+            delay = min(delay, remaining)
+        time.sleep(delay)
+        poll += 1
+
+        if len(pending) >= _WAIT_LIST_FILES_THRESHOLD:
+            found = {}
+            for f in list_files():
+                if f.name in pending:
+                    found[f.name] = f
+                    if len(found) == len(pending):
+                        break
+            # A file missing from the listing gets an explicit error from `get_file`.
+            refreshed = [found.get(name) or get_file(name) for name in pending]
+        else:
+            refreshed = [get_file(name) for name in pending]
+
+        for f in refreshed:
+            if _is_processed(f):
+                del pending[f.name]
+                yield f
+
+
+async def wait_for_files_async(
+    files: Iterable[FileNameType],
+    *,
+    timeout: float | None = None,
+    poll_interval: float = 1.0,
+    max_poll_interval: float = 30.0,
+) -> AsyncIterable[file_types.File]:
+    """The async version of `wait_for_files`."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    done, pending = _wait_pending(files)
+    for f in done:
+        yield f
+
+    poll = 0
+    while pending:
+        delay = _poll_delay(poll, poll_interval, max_poll_interval)
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise _wait_timeout_error(pending, timeout)
+            delay = min(delay, remaining)
+        await asyncio.sleep(delay)
+        poll += 1
+
+        if len(pending) >= _WAIT_LIST_FILES_THRESHOLD:
+            found = {}
+            async for f in list_files_async():
+                if f.name in pending:
+                    found[f.name] = f
+                    if len(found) == len(pending):
+                        break
+            refreshed = [found.get(name) or await get_file_async(name) for name in pending]
+        else:
+            refreshed = await asyncio.gather(*[get_file_async(name) for name in pending])
+
+        for f in refreshed:
+            if _is_processed(f):
+                del pending[f.name]
+                yield f
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+import asyncio
+from collections.abc import AsyncIterable, Iterable
+import concurrent.futures
 import textwrap
+import time
 from typing import Any
 import reprlib
 
@@ -16,8 +19,12 @@ from google.generativeai import client
 from google.generativeai.types import content_types
 from google.generativeai.types import generation_types
 from google.generativeai.types import helper_types
+from google.generativeai.types import history_types
 from google.generativeai.types import safety_types
 
+# The default number of requests `generate_content_batch` keeps in flight at once.
+DEFAULT_MAX_CONCURRENCY = 8
+
 
 class GenerativeModel:
     """
@@ -91,6 +98,10 @@ class GenerativeModel:
         else:
             self._system_instruction = content_types.to_content(system_instruction)
 
+        self._request_template: glm.GenerateContentRequest | None = None
+
+        # Only set to override the default clients. Otherwise a default client is fetched for
+        # each request, so pooled clients and per event loop async clients are used correctly.
         self._client = None
         self._async_client = None
 
@@ -127,6 +138,59 @@ class GenerativeModel:
         tool_config: content_types.ToolConfigType | None,
     ) -> glm.GenerateContentRequest:
         """Creates a `glm.GenerateContentRequest` from raw inputs."""
+        request = self._prepare_request_template(
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            tools=tools,
+            tool_config=tool_config,
+        )
+        contents = content_types.to_contents(contents)
+        # Copy the underlying protos directly: for a long chat history, assigning the list to
+        # `request.contents` spends most of its time re-marshaling every `glm.Content`.
+        request._pb.contents.extend([c._pb for c in contents])
+        return request
+
+    def _prepare_request_template(
+        self,
+        *,
+        generation_config: generation_types.GenerationConfigType | None = None,
+        safety_settings: safety_types.SafetySettingOptions | None = None,
+        tools: content_types.FunctionLibraryType | None,
+        tool_config: content_types.ToolConfigType | None,
+    ) -> glm.GenerateContentRequest:
+        """Creates a `glm.GenerateContentRequest`, with everything except the `contents`.
+
+        Without per-call overrides this is a copy of a template that is built once and cached on
+        the model, so the config merging, safety normalization and tool conversion aren't repeated
+        for every request.
+        """
+        if (
+            generation_config in (None, {})
+            and safety_settings in (None, {})
+            and (tools is None or tools is self._tools)
+            and tool_config is None
+        ):
+            if self._request_template is None:
+                self._request_template = self._build_request_template(
+                    generation_config=None, safety_settings=None, tools=None, tool_config=None
+                )
+            return glm.GenerateContentRequest(self._request_template)
+
+        return self._build_request_template(
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            tools=tools,
+            tool_config=tool_config,
+        )
+
+    def _build_request_template(
+        self,
+        *,
+        generation_config: generation_types.GenerationConfigType | None,
+        safety_settings: safety_types.SafetySettingOptions | None,
+        tools: content_types.FunctionLibraryType | None,
+        tool_config: content_types.ToolConfigType | None,
+    ) -> glm.GenerateContentRequest:
         tools_lib = self._get_tools_lib(tools)
         if tools_lib is not None:
             tools_lib = tools_lib.to_proto()
@@ -136,8 +200,6 @@ class GenerativeModel:
         else:
             tool_config = content_types.to_tool_config(tool_config)
 
-        contents = content_types.to_contents(contents)
-
         generation_config = generation_types.to_generation_config_dict(generation_config)
         merged_gc = self._generation_config.copy()
         merged_gc.update(generation_config)
@@ -149,7 +211,6 @@ class GenerativeModel:
 
         return glm.GenerateContentRequest(
             model=self._model_name,
-            contents=contents,
             generation_config=merged_gc,
             safety_settings=merged_ss,
             tools=tools_lib,
@@ -240,8 +301,7 @@ class GenerativeModel:
             tools=tools,
             tool_config=tool_config,
         )
-        if self._client is None:
-            self._client = client.get_default_generative_client()
+        generative_client = self._client or client.get_default_generative_client()
 
         if request_options is None:
             request_options = {}
@@ -249,13 +309,13 @@ class GenerativeModel:
         try:
             if stream:
                 with generation_types.rewrite_stream_error():
-                    iterator = self._client.stream_generate_content(
+                    iterator = generative_client.stream_generate_content(
                         request,
                         **request_options,
                     )
                 return generation_types.GenerateContentResponse.from_iterator(iterator)
             else:
-                response = self._client.generate_content(
+                response = generative_client.generate_content(
                     request,
                     **request_options,
                 )
@@ -290,8 +350,7 @@ class GenerativeModel:
             tools=tools,
             tool_config=tool_config,
         )
-        if self._async_client is None:
-            self._async_client = client.get_default_generative_async_client()
+        generative_client = self._async_client or client.get_default_generative_async_client()
 
         if request_options is None:
             request_options = {}
@@ -299,13 +358,13 @@ class GenerativeModel:
         try:
             if stream:
                 with generation_types.rewrite_stream_error():
-                    iterator = await self._async_client.stream_generate_content(
+                    iterator = await generative_client.stream_generate_content(
                         request,
                         **request_options,
                     )
                 return await generation_types.AsyncGenerateContentResponse.from_aiterator(iterator)
             else:
-                response = await self._async_client.generate_content(
+                response = await generative_client.generate_content(
                     request,
                     **request_options,
                 )
@@ -318,6 +377,175 @@ class GenerativeModel:
                 )
             raise
 
+    def generate_content_batch(
+        self,
+        contents_list: Iterable[content_types.ContentsType],
+        *,
+        generation_config: generation_types.GenerationConfigType | None = None,
+        safety_settings: safety_types.SafetySettingOptions | None = None,
+        tools: content_types.FunctionLibraryType | None = None,
+        tool_config: content_types.ToolConfigType | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        request_options: helper_types.RequestOptionsType | None = None,
+    ) -> list[generation_types.GenerateContentResponse | Exception]:
+        """Runs `GenerativeModel.generate_content` over many independent prompts concurrently.
+
+        The requests are sent from a pool of at most `max_concurrency` threads. The generation
+        config, safety settings, tools and system instruction are merged once and shared by
+        every request.
+
+        >>> model = genai.GenerativeModel('models/gemini-pro')
+        >>> results = model.generate_content_batch(['Tell me a joke', 'Tell me a poem'])
+        >>> for result in results:
+        ...     if isinstance(result, Exception):
+        ...         print('failed:', result)
+        ...     else:
+        ...         print(result.text)
+
+        Arguments:
+            contents_list: An iterable where each item is the `contents` for one request.
+            generation_config: Overrides for the model's generation config.
+            safety_settings: Overrides for the model's safety settings.
+            tools: Overrides for the model's tools.
+            tool_config: Overrides for the model's tool config.
+            max_concurrency: The maximum number of requests in flight at once.
+            request_options: Options for each request.
+
+        Returns:
+            A list with one entry per input, in input order. Each entry is either the
+            `GenerateContentResponse` or the `Exception` raised by that request.
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+            )
+
+        requests = self._prepare_batch_requests(
+            contents_list,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            tools=tools,
+            tool_config=tool_config,
+        )
+
+        if request_options is None:
+            request_options = {}
+
+        return self._run_batch(
+            requests, max_concurrency=max_concurrency, request_options=request_options
+        )
+
+    async def generate_content_batch_async(
+        self,
+        contents_list: Iterable[content_types.ContentsType],
+        *,
+        generation_config: generation_types.GenerationConfigType | None = None,
+        safety_settings: safety_types.SafetySettingOptions | None = None,
+        tools: content_types.FunctionLibraryType | None = None,
+        tool_config: content_types.ToolConfigType | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        request_options: helper_types.RequestOptionsType | None = None,
+    ) -> list[generation_types.AsyncGenerateContentResponse | Exception]:
+        """The async version of `GenerativeModel.generate_content_batch`.
+
+        At most `max_concurrency` requests are awaited at once, using an `asyncio.Semaphore`.
+        """
+        if max_concurrency < 1:
+            raise ValueError(
+                f"Invalid value: `max_concurrency` must be a positive integer. Received: {max_concurrency}."
+            )
+
+        requests = self._prepare_batch_requests(
+            contents_list,
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            tools=tools,
+            tool_config=tool_config,
+        )
+
+        if request_options is None:
+            request_options = {}
+
+        return await self._run_batch_async(
+            requests, max_concurrency=max_concurrency, request_options=request_options
+        )
+
+    def _prepare_batch_requests(
+        self,
+        contents_list: Iterable[content_types.ContentsType],
+        *,
+        generation_config: generation_types.GenerationConfigType | None,
+        safety_settings: safety_types.SafetySettingOptions | None,
+        tools: content_types.FunctionLibraryType | None,
+        tool_config: content_types.ToolConfigType | None,
+    ) -> list[glm.GenerateContentRequest | Exception]:
+        """Builds one request per item, sharing a single request template.
+
+        Items that can't be converted are returned as the `Exception` raised during conversion,
+        so they are reported in place instead of failing the whole batch.
+        """
+        template = self._prepare_request_template(
+            generation_config=generation_config,
+            safety_settings=safety_settings,
+            tools=tools,
+            tool_config=tool_config,
+        )
+
+        requests = []
+        for contents in contents_list:
+            try:
+                if not contents:
+                    raise TypeError("contents must not be empty")
+                request = glm.GenerateContentRequest(template)
+                request.contents = content_types.to_contents(contents)
+            except Exception as e:
+                request = e
+            requests.append(request)
+        return requests
+
+    def _run_batch(
+        self,
+        requests: list[glm.GenerateContentRequest | Exception],
+        *,
+        max_concurrency: int,
+        request_options: helper_types.RequestOptionsType,
+    ) -> list[generation_types.GenerateContentResponse | Exception]:
+        def _run_one(request):
+            if isinstance(request, Exception):
+                return request
+            # Fetched per request, so a batch is spread over the pooled clients.
+            generative_client = self._client or client.get_default_generative_client()
+            try:
+                response = generative_client.generate_content(request, **request_options)
+            except Exception as e:
+                return e
+            return generation_types.GenerateContentResponse.from_response(response)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(_run_one, requests))
+
+    async def _run_batch_async(
+        self,
+        requests: list[glm.GenerateContentRequest | Exception],
+        *,
+        max_concurrency: int,
+        request_options: helper_types.RequestOptionsType,
+    ) -> list[generation_types.AsyncGenerateContentResponse | Exception]:
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _run_one(request):
+            if isinstance(request, Exception):
+                return request
+            generative_client = self._async_client or client.get_default_generative_async_client()
+            async with semaphore:
+                try:
+                    response = await generative_client.generate_content(request, **request_options)
+                except Exception as e:
+                    return e
+            return generation_types.AsyncGenerateContentResponse.from_response(response)
+
+        return list(await asyncio.gather(*(_run_one(request) for request in requests)))
+
     # fmt: off
     def count_tokens(
         self,
@@ -332,8 +560,7 @@ class GenerativeModel:
         if request_options is None:
             request_options = {}
 
-        if self._client is None:
-            self._client = client.get_default_generative_client()
+        generative_client = self._client or client.get_default_generative_client()
 
         request = glm.CountTokensRequest(
             model=self.model_name,
@@ -344,7 +571,7 @@ class GenerativeModel:
                 tools=tools,
                 tool_config=tool_config,
         ))
-        return self._client.count_tokens(request, **request_options)
+        return generative_client.count_tokens(request, **request_options)
 
     async def count_tokens_async(
         self,
@@ -359,8 +586,7 @@ class GenerativeModel:
         if request_options is None:
             request_options = {}
 
-        if self._async_client is None:
-            self._async_client = client.get_default_generative_async_client()
+        generative_client = self._async_client or client.get_default_generative_async_client()
 
         request = glm.CountTokensRequest(
             model=self.model_name,
@@ -371,7 +597,7 @@ class GenerativeModel:
                 tools=tools,
                 tool_config=tool_config,
         ))
-        return await self._async_client.count_tokens(request, **request_options)
+        return await generative_client.count_tokens(request, **request_options)
 
     # fmt: on
 
@@ -380,6 +606,9 @@ class GenerativeModel:
         *,
         history: Iterable[content_types.StrictContentType] | None = None,
         enable_automatic_function_calling: bool = False,
+        enable_parallel_function_calling: bool = False,
+        function_call_timeout: float | None = None,
+        history_policy: history_types.HistoryPolicyType | None = None,
     ) -> ChatSession:
         """Returns a `genai.ChatSession` attached to this model.
 
@@ -389,6 +618,12 @@ class GenerativeModel:
 
         Arguments:
             history: An iterable of `glm.Content` objects, or equivalents to initialize the session.
+            enable_automatic_function_calling: If True, call the `tools` functions requested by
+                the model and send the results back automatically.
+            enable_parallel_function_calling: If True, the function calls the model requests in
+                a single turn are executed concurrently.
+            function_call_timeout: The maximum number of seconds each automatic function call may take.
+            history_policy: A `genai.types.HistoryPolicy` that bounds the history sent with each message.
         """
         if self._generation_config.get("candidate_count", 1) > 1:
             raise ValueError(
@@ -398,6 +633,9 @@ class GenerativeModel:
             model=self,
             history=history,
             enable_automatic_function_calling=enable_automatic_function_calling,
+            enable_parallel_function_calling=enable_parallel_function_calling,
+            function_call_timeout=function_call_timeout,
+            history_policy=history_policy,
         )
 
 
@@ -418,6 +656,16 @@ class ChatSession:
     Arguments:
         model: The model to use in the chat.
         history: A chat history to initialize the object with.
+        enable_automatic_function_calling: If True, call the `tools` functions requested by
+            the model and send the results back automatically.
+        enable_parallel_function_calling: If True, the function calls the model requests in a
+            single turn are executed concurrently: synchronous functions in a thread pool, and
+            `async def` functions (with `send_message_async`) with `asyncio.gather`.
+        function_call_timeout: The maximum number of seconds each automatic function call may
+            take before a `TimeoutError` is raised.
+        history_policy: Called before each message is sent to trim the history, for example
+            `genai.types.KeepLastTurns(10)` or `genai.types.TokenBudget(30_000)`. By default the
+            whole history is sent with every message.
     """
 
     _USER_ROLE = "user"
@@ -428,12 +676,27 @@ class ChatSession:
         model: GenerativeModel,
         history: Iterable[content_types.StrictContentType] | None = None,
         enable_automatic_function_calling: bool = False,
+        enable_parallel_function_calling: bool = False,
+        function_call_timeout: float | None = None,
+        history_policy: history_types.HistoryPolicyType | None = None,
     ):
         self.model: GenerativeModel = model
         self._history: list[glm.Content] = content_types.to_contents(history)
         self._last_sent: glm.Content | None = None
         self._last_received: generation_types.BaseGenerateContentResponse | None = None
         self.enable_automatic_function_calling = enable_automatic_function_calling
+        self.enable_parallel_function_calling = enable_parallel_function_calling
+        self.function_call_timeout = function_call_timeout
+        self.history_policy = history_policy
+
+        # Token counts recorded from `usage_metadata`, keyed by `id()` of the `glm.Content`. The
+        # content is kept alongside its count, so a reused `id()` is never mistaken for it.
+        self._token_counts: dict[int, tuple[glm.Content, int]] = {}
+        # The tokens in the history, plus the system instruction and tools, as the model last
+        # counted them. `None` when unknown.
+        self._context_token_count: int | None = None
+        if not self._history and model._system_instruction is None and model._tools is None:
+            self._context_token_count = 0
 
     def send_message(
         self,
@@ -468,6 +731,12 @@ class ChatSession:
         Once iteration over chunks is complete, the `response` and `ChatSession` are in states identical to the
         `stream=False` case. Some properties are not available until iteration is complete.
 
+        Streaming also works with `enable_automatic_function_calling=True`. The `function_call` parts are
+        not yielded: when a turn ends with function calls they are executed, and the chunks of the model's
+        follow-up turn are yielded from the same `response`. The intermediate turns are added to the
+        `ChatSession.history`. Once iteration is complete, `response.text` and the other accumulated
+        attributes hold the final turn only, and `response` is `ChatSession.last`.
+
         Like `GenerativeModel.generate_content` this method lets you override the model's `generation_config` and
         `safety_settings`.
 
@@ -480,11 +749,6 @@ class ChatSession:
         if request_options is None:
             request_options = {}
 
-        if self.enable_automatic_function_calling and stream:
-            raise NotImplementedError(
-                "Unsupported configuration: The `google.generativeai` SDK currently does not support the combination of `stream=True` and `enable_automatic_function_calling=True`."
-            )
-
         tools_lib = self.model._get_tools_lib(tools)
 
         content = content_types.to_content(content)
@@ -492,7 +756,7 @@ class ChatSession:
         if not content.role:
             content.role = self._USER_ROLE
 
-        history = self.history[:]
+        history = self._apply_history_policy(content)
         history.append(content)
 
         generation_config = generation_types.to_generation_config_dict(generation_config)
@@ -513,8 +777,19 @@ class ChatSession:
 
         self._check_response(response=response, stream=stream)
 
-        if self.enable_automatic_function_calling and tools_lib is not None:
-            self.history, content, response = self._handle_afc(
+        if self.enable_automatic_function_calling and tools_lib is not None and stream:
+            response = generation_types.GenerateContentResponse.from_iterator(
+                self._handle_afc_stream(
+                    response=response,
+                    history=history,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                    tools_lib=tools_lib,
+                    request_options=request_options,
+                )
+            )
+        elif self.enable_automatic_function_calling and tools_lib is not None:
+            history, content, response = self._handle_afc(
                 response=response,
                 history=history,
                 generation_config=generation_config,
@@ -523,12 +798,81 @@ class ChatSession:
                 tools_lib=tools_lib,
                 request_options=request_options,
             )
+            # Not through the `history` setter, which would discard the recorded token counts.
+            self._history = history
 
         self._last_sent = content
         self._last_received = response
 
         return response
 
+    def _apply_history_policy(self, content: glm.Content) -> list[glm.Content]:
+        history = self.history[:]
+        if self.history_policy is not None:
+            self._replace_history(self.history_policy(self, history, content))
+            history = self._history[:]
+        return history
+
+    async def _apply_history_policy_async(self, content: glm.Content) -> list[glm.Content]:
+        history = self.history[:]
+        if self.history_policy is not None:
+            # Policies may call the model (`SummarizeAndDrop`), keep that off the event loop.
+            new_history = await asyncio.to_thread(self.history_policy, self, history, content)
+            self._replace_history(new_history)
+            history = self._history[:]
+        return history
+
+    def _replace_history(self, history: list[glm.Content]):
+        """Replaces the history with the result of the `history_policy`, keeping the token counts."""
+        old_ids = {id(c) for c in self._history}
+        new_ids = {id(c) for c in history}
+        removed = [c for c in self._history if id(c) not in new_ids]
+        added = [c for c in history if id(c) not in old_ids]
+
+        if self._context_token_count is not None:
+            removed_counts = [self._recorded_token_count(c) for c in removed]
+            added_counts = [self._recorded_token_count(c) for c in added]
+            if None in removed_counts or None in added_counts:
+                self._context_token_count = None
+            else:
+                self._context_token_count += sum(added_counts) - sum(removed_counts)
+
+        for c in removed:
+            self._token_counts.pop(id(c), None)
+        self._history = list(history)
+
+    def _recorded_token_count(self, content: glm.Content) -> int | None:
+        entry = self._token_counts.get(id(content))
+        if entry is None or entry[0] is not content:
+            return None
+        return entry[1]
+
+    def _record_token_count(self, content: glm.Content, count: int):
+        self._token_counts[id(content)] = (content, count)
+
+    def _record_turn_token_counts(self, sent: glm.Content, received: glm.Content, usage_metadata):
+        """Splits a response's `usage_metadata` between the message sent and the one received."""
+        prompt_tokens = usage_metadata.prompt_token_count
+        if not prompt_tokens:
+            self._context_token_count = None
+            return
+
+        if self._context_token_count is not None:
+            # The prompt is the previous context plus the new message.
+            self._record_token_count(sent, max(prompt_tokens - self._context_token_count, 0))
+        self._record_token_count(received, usage_metadata.candidates_token_count)
+        self._context_token_count = prompt_tokens + usage_metadata.candidates_token_count
+
+    @property
+    def history_token_counts(self) -> list[int | None]:
+        """The token count of each `glm.Content` in the `history`, `None` where it isn't known.
+
+        The counts are taken from the `usage_metadata` of the responses. The system instruction and
+        tools aren't part of any count, so if the model has them the first message's count isn't
+        known.
+        """
+        return [self._recorded_token_count(c) for c in self.history]
+
     def _check_response(self, *, response, stream):
         if response.prompt_feedback.block_reason:
             raise generation_types.BlockedPromptException(response.prompt_feedback)
@@ -566,16 +910,11 @@ class ChatSession:
         while function_calls := self._get_function_calls(response):
             if not all(callable(tools_lib[fc]) for fc in function_calls):
                 break
-            history.append(response.candidates[0].content)
-
-            function_response_parts: list[glm.Part] = []
-            for fc in function_calls:
-                fr = tools_lib(fc)
-                assert fr is not None, (
-                    "Unexpected state: The function reference (fr) should never be None. It should only return None if the declaration "
-                    "is not callable, which is checked earlier in the code."
-                )
-                function_response_parts.append(fr)
+            received = response.candidates[0].content
+            self._record_turn_token_counts(history[-1], received, response.usage_metadata)
+            history.append(received)
+
+            function_response_parts = self._call_functions(tools_lib, function_calls)
 
             send = glm.Content(role=self._USER_ROLE, parts=function_response_parts)
             history.append(send)
@@ -594,6 +933,141 @@ class ChatSession:
         *history, content = history
         return history, content, response
 
+    def _handle_afc_stream(
+        self,
+        *,
+        response,
+        history,
+        generation_config,
+        safety_settings,
+        tools_lib,
+        request_options,
+    ) -> Iterable[glm.GenerateContentResponse]:
+        """Yields the chunks of a streamed automatic function calling exchange, turn by turn.
+
+        Function calls are executed when the turn requesting them ends, then the follow-up turn is
+        streamed. When the exchange ends, the chat state is updated as `_handle_afc` would.
+        """
+        last_chunk = None
+        yielded = False
+        while True:
+            for chunk in response:
+                last_chunk = chunk._result
+                chunk = _strip_function_calls(last_chunk, tools_lib)
+                if chunk is not None:
+                    yielded = True
+                    yield chunk
+
+            function_calls = self._get_function_calls(response)
+            if not function_calls or not all(callable(tools_lib[fc]) for fc in function_calls):
+                break
+            received = response.candidates[0].content
+            self._record_turn_token_counts(history[-1], received, response.usage_metadata)
+            history.append(received)
+
+            function_response_parts = self._call_functions(tools_lib, function_calls)
+
+            send = glm.Content(role=self._USER_ROLE, parts=function_response_parts)
+            history.append(send)
+
+            response = self.model.generate_content(
+                contents=history,
+                generation_config=generation_config,
+                safety_settings=safety_settings,
+                stream=True,
+                tools=tools_lib,
+                request_options=request_options,
+            )
+
+            self._check_response(response=response, stream=True)
+
+        if not yielded:
+            # Every chunk was a function call, the stream still needs a first chunk.
+            yield last_chunk
+
+        *history, content = history
+        # Not through the `history` setter, which would discard the recorded token counts.
+        self._history = history
+        self._last_sent = content
+        # `self._last_received` is the response `send_message` returned, which wraps this
+        # generator. It gets the final turn's result, instead of the chunks of every turn.
+        self._last_received._set_result(response._result)
+
+    def _call_functions(
+        self, tools_lib: content_types.FunctionLibrary, function_calls: list[glm.FunctionCall]
+    ) -> list[glm.Part]:
+        """Executes the function calls from one model turn, returning the parts in call order."""
+        timeout = self.function_call_timeout
+        if not self.enable_parallel_function_calling and timeout is None:
+            return [_call_function(tools_lib, fc) for fc in function_calls]
+
+        if self.enable_parallel_function_calling:
+            max_workers = len(function_calls)
+        else:
+            # A single worker still runs the calls one at a time, but lets them time out.
+            max_workers = 1
+
+        # Not a `with` block: that would wait for a timed out call to finish.
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [executor.submit(_call_function, tools_lib, fc) for fc in function_calls]
+            if timeout is not None and self.enable_parallel_function_calling:
+                deadline = time.monotonic() + timeout
+            else:
+                deadline = None
+
+            function_response_parts = []
+            for fc, future in zip(function_calls, futures):
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0)
+                try:
+                    function_response_parts.append(future.result(timeout=timeout))
+                except concurrent.futures.TimeoutError as e:
+                    if future.done():
+                        # The function itself raised the `TimeoutError`.
+                        raise
+                    raise TimeoutError(
+                        _function_timeout_message(fc, self.function_call_timeout)
+                    ) from e
+            return function_response_parts
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _call_functions_async(
+        self, tools_lib: content_types.FunctionLibrary, function_calls: list[glm.FunctionCall]
+    ) -> list[glm.Part]:
+        """The async version of `ChatSession._call_functions`.
+
+        `async def` functions are awaited. With `enable_parallel_function_calling` (or a
+        `function_call_timeout`) synchronous functions are run in a thread so they don't block
+        the event loop.
+        """
+        if self.enable_parallel_function_calling:
+            return list(
+                await asyncio.gather(
+                    *(self._call_function_async(tools_lib, fc) for fc in function_calls)
+                )
+            )
+
+        return [await self._call_function_async(tools_lib, fc) for fc in function_calls]
+
+    async def _call_function_async(
+        self, tools_lib: content_types.FunctionLibrary, fc: glm.FunctionCall
+    ) -> glm.Part:
+        declaration = tools_lib[fc]
+        if getattr(declaration, "is_coroutine", False):
+            call = tools_lib.call_async(fc)
+        elif self.enable_parallel_function_calling or self.function_call_timeout is not None:
+            call = asyncio.to_thread(_call_function, tools_lib, fc)
+        else:
+            return _call_function(tools_lib, fc)
+
+        try:
+            fr = await asyncio.wait_for(call, timeout=self.function_call_timeout)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(_function_timeout_message(fc, self.function_call_timeout)) from e
+        return _checked_function_response(fr)
+
     async def send_message_async(
         self,
         content: content_types.ContentType,
@@ -609,11 +1083,6 @@ class ChatSession:
         if request_options is None:
             request_options = {}
 
-        if self.enable_automatic_function_calling and stream:
-            raise NotImplementedError(
-                "Unsupported configuration: The `google.generativeai` SDK currently does not support the combination of `stream=True` and `enable_automatic_function_calling=True`."
-            )
-
         tools_lib = self.model._get_tools_lib(tools)
 
         content = content_types.to_content(content)
@@ -621,7 +1090,7 @@ class ChatSession:
         if not content.role:
             content.role = self._USER_ROLE
 
-        history = self.history[:]
+        history = await self._apply_history_policy_async(content)
         history.append(content)
 
         generation_config = generation_types.to_generation_config_dict(generation_config)
@@ -642,8 +1111,19 @@ class ChatSession:
 
         self._check_response(response=response, stream=stream)
 
-        if self.enable_automatic_function_calling and tools_lib is not None:
-            self.history, content, response = await self._handle_afc_async(
+        if self.enable_automatic_function_calling and tools_lib is not None and stream:
+            response = await generation_types.AsyncGenerateContentResponse.from_aiterator(
+                self._handle_afc_stream_async(
+                    response=response,
+                    history=history,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings,
+                    tools_lib=tools_lib,
+                    request_options=request_options,
+                )
+            )
+        elif self.enable_automatic_function_calling and tools_lib is not None:
+            history, content, response = await self._handle_afc_async(
                 response=response,
                 history=history,
                 generation_config=generation_config,
@@ -652,6 +1132,8 @@ class ChatSession:
                 tools_lib=tools_lib,
                 request_options=request_options,
             )
+            # Not through the `history` setter, which would discard the recorded token counts.
+            self._history = history
 
         self._last_sent = content
         self._last_received = response
@@ -673,16 +1155,11 @@ class ChatSession:
         while function_calls := self._get_function_calls(response):
             if not all(callable(tools_lib[fc]) for fc in function_calls):
                 break
-            history.append(response.candidates[0].content)
-
-            function_response_parts: list[glm.Part] = []
-            for fc in function_calls:
-                fr = tools_lib(fc)
-                assert fr is not None, (
-                    "Unexpected state: The function reference (fr) should never be None. It should only return None if the declaration "
-                    "is not callable, which is checked earlier in the code."
-                )
-                function_response_parts.append(fr)
+            received = response.candidates[0].content
+            self._record_turn_token_counts(history[-1], received, response.usage_metadata)
+            history.append(received)
+
+            function_response_parts = await self._call_functions_async(tools_lib, function_calls)
 
             send = glm.Content(role=self._USER_ROLE, parts=function_response_parts)
             history.append(send)
@@ -701,6 +1178,62 @@ class ChatSession:
         *history, content = history
         return history, content, response
 
+    async def _handle_afc_stream_async(
+        self,
+        *,
+        response,
+        history,
+        generation_config,
+        safety_settings,
+        tools_lib,
+        request_options,
+    ) -> AsyncIterable[glm.GenerateContentResponse]:
+        """The async version of `ChatSession._handle_afc_stream`."""
+        last_chunk = None
+        yielded = False
+        while True:
+            async for chunk in response:
+                last_chunk = chunk._result
+                chunk = _strip_function_calls(last_chunk, tools_lib)
+                if chunk is not None:
+                    yielded = True
+                    yield chunk
+
+            function_calls = self._get_function_calls(response)
+            if not function_calls or not all(callable(tools_lib[fc]) for fc in function_calls):
+                break
+            received = response.candidates[0].content
+            self._record_turn_token_counts(history[-1], received, response.usage_metadata)
+            history.append(received)
+
+            function_response_parts = await self._call_functions_async(tools_lib, function_calls)
+
+            send = glm.Content(role=self._USER_ROLE, parts=function_response_parts)
+            history.append(send)
+
+            response = await self.model.generate_content_async(
+                contents=history,
+                generation_config=generation_config,
+                safety_settings=safety_settings,
+                stream=True,
+                tools=tools_lib,
+                request_options=request_options,
+            )
+
+            self._check_response(response=response, stream=True)
+
+        if not yielded:
+            # Every chunk was a function call, the stream still needs a first chunk.
+            yield last_chunk
+
+        *history, content = history
+        # Not through the `history` setter, which would discard the recorded token counts.
+        self._history = history
+        self._last_sent = content
+        # `self._last_received` is the response `send_message` returned, which wraps this
+        # generator. It gets the final turn's result, instead of the chunks of every turn.
+        self._last_received._set_result(response._result)
+
     def __copy__(self):
         return ChatSession(
             model=self.model,
@@ -712,6 +1245,7 @@ class ChatSession:
         """Removes the last request/response pair from the chat history."""
         if self._last_received is None:
             result = self._history.pop(-2), self._history.pop()
+            self._context_token_count = None
             return result
         else:
             result = self._last_sent, self._last_received.candidates[0].content
@@ -753,6 +1287,7 @@ class ChatSession:
         if not received.role:
             received.role = self._MODEL_ROLE
         self._history.extend([sent, received])
+        self._record_turn_token_counts(sent, received, last.usage_metadata)
 
         self._last_sent = None
         self._last_received = None
@@ -765,6 +1300,10 @@ class ChatSession:
         self._last_sent = None
         self._last_received = None
 
+        ids = {id(c) for c in self._history}
+        self._token_counts = {k: v for k, v in self._token_counts.items() if k in ids}
+        self._context_token_count = None
+
     def __repr__(self) -> str:
         _dict_repr = reprlib.Repr()
         _model = str(self.model).replace("\n", "\n" + " " * 4)
@@ -799,3 +1338,48 @@ class ChatSession:
             + _model
             + _history
         )
+
+
+def _checked_function_response(fr: glm.Part | None) -> glm.Part:
+    assert fr is not None, (
+        "Unexpected state: The function reference (fr) should never be None. It should only return None if the declaration "
+        "is not callable, which is checked earlier in the code."
+    )
+    return fr
+
+
+def _call_function(tools_lib: content_types.FunctionLibrary, fc: glm.FunctionCall) -> glm.Part:
+    return _checked_function_response(tools_lib(fc))
+
+
+def _strip_function_calls(
+    chunk: glm.GenerateContentResponse, tools_lib: content_types.FunctionLibrary
+) -> glm.GenerateContentResponse | None:
+    """Removes the callable `function_call` parts from a streamed chunk.
+
+    Returns `None` if nothing is left.
+    """
+    if not chunk.candidates:
+        return chunk
+
+    parts = chunk.candidates[0].content.parts
+    keep = [
+        part
+        for part in parts
+        if not ("function_call" in part and callable(tools_lib[part.function_call]))
+    ]
+    if len(keep) == len(parts):
+        return chunk
+    if not keep:
+        return None
+
+    chunk = glm.GenerateContentResponse(chunk)
+    chunk.candidates[0].content.parts = keep
+    return chunk
+
+
+def _function_timeout_message(fc: glm.FunctionCall, timeout: float) -> str:
+    return (
+        f"Timeout: The automatic function call to `{fc.name}` did not complete within "
+        f"`function_call_timeout={timeout}` seconds."
+    )
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A time-to-live cache for model metadata, shared by `genai.get_model` and friends."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Union
+
+import google.ai.generativelanguage as glm
+
+__all__ = ["ModelCache", "get_default_model_cache", "set_default_model_cache"]
+
+DEFAULT_TTL = 600.0
+
+ModelProto = Union[glm.Model, glm.TunedModel]
+
+# The key of the `list_models` listing, which can't collide with a model name.
+_LISTING_KEY = ""
+
+
+class ModelCache:
+    """Caches `glm.Model` and `glm.TunedModel` protos, and the `list_models` listing.
+
+    Model metadata rarely changes, so by default `genai.get_model`, `genai.get_base_model`,
+    `genai.get_tuned_model` and `genai.list_models` go through a process wide `ModelCache`,
+    and the functions that resolve a model's base model don't pay an RPC each time:
+
+    >>> genai.get_default_model_cache().invalidate("tunedModels/my-model")
+
+    Only calls made with the default client are cached, and calling `genai.configure` empties
+    the cache. Tuned models are only cached once they're `ACTIVE` or `FAILED`, so polling a
+    tuned model's `state` always reaches the API. Creating, updating or deleting a tuned model
+    through `genai` invalidates its entry.
+
+    The cache can be shared between threads.
+
+    Args:
+        ttl: The number of seconds an entry is used for.
+        path: An optional JSON file for a snapshot of the cache. The snapshot is loaded, if it
+            exists, and rewritten whenever the cache changes, so the entries that haven't
+            expired survive a restart. The snapshot is used with whatever configuration comes
+            first, so use a separate `path` per API key or project.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL, *, path: str | os.PathLike | None = None):
+        if ttl < 0:
+            raise ValueError(f"Invalid value: `ttl` must be non-negative. Received: {ttl}.")
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # key -> (expiry as a `time.time()`, value)
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._scope = None
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def _get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, values: dict[str, Any]):
+        if not self.ttl:
+            return
+        expiry = time.time() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expiry, value)
+            self._save()
+
+    def get(self, name: str) -> ModelProto | None:
+        """Returns the cached model, or `None` if it's missing or expired."""
+        model = self._get(name)
+        return None if model is None else type(model)(model)
+
+    def put(self, model: ModelProto, *, name: str | None = None):
+        """Caches a model under `name`, by default its own name."""
+        self._put({name or model.name: type(model)(model)})
+
+    def get_listing(self) -> list[glm.Model] | None:
+        """Returns the cached `list_models` listing, or `None` if it's missing or expired."""
+        models = self._get(_LISTING_KEY)
+        return None if models is None else [glm.Model(model) for model in models]
+
+    def put_listing(self, models: list[glm.Model]):
+        """Caches the `list_models` listing, and each of the models in it."""
+        models = [glm.Model(model) for model in models]
+        self._put({_LISTING_KEY: models, **{model.name: model for model in models}})
+
+    def invalidate(self, name: str | None = None):
+        """Removes a model from the cache, or everything if no `name` is given."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+            self._save()
+
+    def set_scope(self, scope: Any):
+        """Empties the cache if `scope`, like the client configuration, has changed.
+
+        The first scope adopts the entries already there, such as the ones loaded from `path`.
+        """
+        with self._lock:
+            if self._scope is not None and scope != self._scope:
+                self._entries.clear()
+            self._scope = scope
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _load(self):
+        with open(self.path, encoding="utf-8") as f:
+            snapshot = json.load(f)
+        now = time.time()
+        for key, (expiry, value) in snapshot.items():
+            if expiry <= now:
+                continue
+            if key == _LISTING_KEY:
+                value = [glm.Model.from_json(model) for model in value]
+            elif key.startswith("tunedModels/"):
+                value = glm.TunedModel.from_json(value)
+            else:
+                value = glm.Model.from_json(value)
+            self._entries[key] = (expiry, value)
+
+    def _save(self):
+        if self.path is None:
+            return
+        snapshot = {}
+        for key, (expiry, value) in self._entries.items():
+            if key == _LISTING_KEY:
+                value = [glm.Model.to_json(model) for model in value]
+            else:
+                value = type(value).to_json(value)
+            snapshot[key] = (expiry, value)
+
+        # Write to a temporary file and rename it, so a concurrent reader never sees half a file.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+_default_cache: ModelCache | None = ModelCache()
+
+
+def get_default_model_cache() -> ModelCache | None:
+    """Returns the cache used by `genai.get_model` and friends, `None` if caching is off."""
+    return _default_cache
+
+
+def set_default_model_cache(cache: ModelCache | None):
+    """Replaces the cache used by `genai.get_model` and friends. `None` turns caching off."""
+    global _default_cache
+    _default_cache = cache
@@ -18,6 +18,8 @@ import typing
 from typing import Any, Literal
 
 import google.ai.generativelanguage as glm
+from google.generativeai import client as client_lib
+from google.generativeai import model_cache
 from google.generativeai import operations
 from google.generativeai.client import get_default_model_client
 from google.generativeai.types import model_types
@@ -26,6 +28,28 @@ from google.api_core import operation
 from google.api_core import protobuf_helpers
 from google.protobuf import field_mask_pb2
 from google.generativeai.utils import flatten_update_paths
+from google.generativeai.utils import iter_prefetched
+from google.generativeai.utils import DEFAULT_PREFETCH
+
+
+def _get_model_cache(client) -> model_cache.ModelCache | None:
+    """Returns the default model cache, if `client` is the default client and caching is on."""
+    cache = model_cache.get_default_model_cache()
+    if client is not None or cache is None:
+        return None
+    cache.set_scope(client_lib._client_manager.config_version)
+    return cache
+
+
+# A tuned model is only cached once its state can't change any more, so that polling
+# `get_tuned_model(name).state` sees the model become `ACTIVE`.
+_CACHEABLE_TUNED_MODEL_STATES = (glm.TunedModel.State.ACTIVE, glm.TunedModel.State.FAILED)
+
+
+def _invalidate_cached_model(name: str):
+    cache = model_cache.get_default_model_cache()
+    if cache is not None:
+        cache.invalidate(name)
 
 
 def get_model(
@@ -75,6 +99,8 @@ def get_base_model(
     pprint.pprint(model)
     ```
 
+    With the default client the result is cached, see `genai.get_default_model_cache`.
+
     Args:
         name: The name of the model to fetch. Should start with `models/`
         client: The client to use.
@@ -86,6 +112,7 @@ def get_base_model(
     if request_options is None:
         request_options = {}
 
+    cache = _get_model_cache(client)
     if client is None:
         client = get_default_model_client()
 
@@ -95,9 +122,12 @@ def get_base_model(
             f"Invalid model name: Base model names must start with `models/`. Received: {name}"
         )
 
-    result = client.get_model(name=name, **request_options)
-    result = type(result).to_dict(result)
-    return model_types.Model(**result)
+    cached = None if cache is None else cache.get(name)
+    result = cached if cached is not None else client.get_model(name=name, **request_options)
+    model = model_types.Model(**type(result).to_dict(result))
+    if cache is not None and cached is None:
+        cache.put(result, name=name)
+    return model
 
 
 def get_tuned_model(
@@ -125,6 +155,7 @@ def get_tuned_model(
     if request_options is None:
         request_options = {}
 
+    cache = _get_model_cache(client)
     if client is None:
         client = get_default_model_client()
 
@@ -135,9 +166,12 @@ def get_tuned_model(
             f"Invalid model name: Tuned model names must start with `tunedModels/`. Received: {name}"
         )
 
-    result = client.get_tuned_model(name=name, **request_options)
-
-    return model_types.decode_tuned_model(result)
+    cached = None if cache is None else cache.get(name)
+    result = cached if cached is not None else client.get_tuned_model(name=name, **request_options)
+    tuned_model = model_types.decode_tuned_model(result)
+    if cache is not None and cached is None and result.state in _CACHEABLE_TUNED_MODEL_STATES:
+        cache.put(result, name=name)
+    return tuned_model
 
 
 def get_base_model_name(
@@ -175,6 +209,7 @@ def list_models(
     page_size: int | None = 50,
     client: glm.ModelServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    prefetch: int = DEFAULT_PREFETCH,
 ) -> model_types.ModelsIterable:
     """Calls the API to list all available models.
 
@@ -188,6 +223,7 @@ def list_models(
         page_size: How many `types.Models` to fetch per page (api call).
         client: You may pass a `glm.ModelServiceClient` instead of using the default client.
         request_options: Options for the request.
+        prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
     Yields:
         `types.Model` objects.
@@ -196,12 +232,25 @@ def list_models(
     if request_options is None:
         request_options = {}
 
+    cache = _get_model_cache(client)
     if client is None:
         client = get_default_model_client()
 
-    for model in client.list_models(page_size=page_size, **request_options):
+    listing = None if cache is None else cache.get_listing()
+    if listing is not None:
+        for model in listing:
+            yield model_types.Model(**type(model).to_dict(model))
+        return
+
+    listing = []
+    pager = client.list_models(page_size=page_size, **request_options)
+    for model in iter_prefetched(pager, "models", prefetch):
+        listing.append(model)
         model = type(model).to_dict(model)
         yield model_types.Model(**model)
+    # Only a complete listing is cached.
+    if cache is not None:
+        cache.put_listing(listing)
 
 
 def list_tuned_models(
@@ -209,6 +258,7 @@ def list_tuned_models(
     page_size: int | None = 50,
     client: glm.ModelServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    prefetch: int = DEFAULT_PREFETCH,
 ) -> model_types.TunedModelsIterable:
     """Calls the API to list all tuned models.
 
@@ -222,6 +272,7 @@ def list_tuned_models(
         page_size: How many `types.Models` to fetch per page (api call).
         client: You may pass a `glm.ModelServiceClient` instead of using the default client.
         request_options: Options for the request.
+        prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
     Yields:
         `types.TunedModel` objects.
@@ -232,10 +283,11 @@ def list_tuned_models(
     if client is None:
         client = get_default_model_client()
 
-    for model in client.list_tuned_models(
+    pager = client.list_tuned_models(
         page_size=page_size,
         **request_options,
-    ):
+    )
+    for model in iter_prefetched(pager, "tuned_models", prefetch):
         model = type(model).to_dict(model)
         yield model_types.decode_tuned_model(model)
 
@@ -362,6 +414,8 @@ def create_tuned_model(
     operation = client.create_tuned_model(
         dict(tuned_model_id=id, tuned_model=tuned_model), **request_options
     )
+    if id is not None:
+        _invalidate_cached_model(f"tunedModels/{id}")
 
     return operations.CreateTunedModelOperation.from_core_operation(operation)
 
@@ -436,6 +490,7 @@ def update_tuned_model(
         glm.UpdateTunedModelRequest(tuned_model=tuned_model, update_mask=field_mask),
         **request_options,
     )
+    _invalidate_cached_model(name)
     return model_types.decode_tuned_model(result)
 
 
@@ -461,3 +516,4 @@ def delete_tuned_model(
 
     name = model_types.make_model_name(tuned_model)
     client.delete_tuned_model(name=name, **request_options)
+    _invalidate_cached_model(name)
@@ -14,18 +14,27 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import functools
-from typing import Iterator
+import time
+from typing import AsyncIterator, Iterable, Iterator
 
 from google.ai import generativelanguage as glm
 
 from google.generativeai import client as client_lib
 from google.generativeai.types import model_types
 from google.api_core import operation as operation_lib
+from google.longrunning import operations_pb2
 
 import tqdm.auto as tqdm
 
 
+# Waiting on at least this many operations refreshes them with one `list_operations` scan,
+# instead of a `get_operation` call each.
+_WAIT_LIST_OPERATIONS_THRESHOLD = 5
+
+
 def list_operations(*, client=None) -> Iterator[CreateTunedModelOperation]:
     """Calls the API to list all operations"""
 
@@ -131,11 +140,155 @@ class CreateTunedModelOperation(operation_lib.Operation):
         bar.update(self.metadata.completed_steps - bar.n)
         return self.result()
 
+    def _update_from_proto(self, proto):
+        """Sets the operation's status from a refreshed `Operation` proto."""
+        if not self._operation.done:
+            self._operation = proto
+            self._set_result_from_operation()
+
     def set_result(self, result: glm.TunedModel):
         result = model_types.decode_tuned_model(result)
         super().set_result(result)
 
 
+@dataclasses.dataclass
+class OperationStatus:
+    """A status update from `wait_for_operations_async`.
+
+    Attributes:
+        operation: The operation, which is updated in place. Once `done` its `result()` or
+            `exception()` are available without blocking.
+        metadata: The operation's progress.
+        done: Whether the operation is complete.
+    """
+
+    operation: CreateTunedModelOperation
+    metadata: glm.CreateTunedModelMetadata | None
+    done: bool
+
+
+def _completed_steps(op: CreateTunedModelOperation) -> int:
+    metadata = op.metadata
+    return 0 if metadata is None else metadata.completed_steps
+
+
+class _PollSchedule:
+    """When to poll one operation next.
+
+    The interval shrinks while `completed_steps` keeps moving, and backs off exponentially
+    while it doesn't, so slow tuning jobs aren't polled more than they need to be.
+    """
+
+    def __init__(self, poll_interval: float, max_poll_interval: float):
+        self.min_interval = poll_interval
+        self.max_interval = max_poll_interval
+        self.interval = poll_interval
+        self.next_poll = time.monotonic()
+        self.completed_steps = None
+
+    def record(self, completed_steps: int) -> bool:
+        """Schedules the next poll, and returns whether there was progress since the last one."""
+        progressed = completed_steps != self.completed_steps
+        if progressed:
+            self.interval = max(self.interval / 2, self.min_interval)
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        self.completed_steps = completed_steps
+        self.next_poll = time.monotonic() + self.interval
+        return progressed
+
+
+def _refresh_operations(client, names: list[str]) -> dict[str, operations_pb2.Operation]:
+    """Gets the current `Operation` protos for `names`, in as few calls as possible."""
+    found = {}
+    if len(names) >= _WAIT_LIST_OPERATIONS_THRESHOLD:
+        wanted = set(names)
+        for proto in client.list_operations(name="", filter_=""):
+            if proto.name in wanted:
+                found[proto.name] = proto
+                if len(found) == len(wanted):
+                    break
+    # An operation missing from the listing gets an explicit error from `get_operation`.
+    for name in names:
+        if name not in found:
+            found[name] = client.get_operation(name=name)
+    return found
+
+
+async def wait_for_operations_async(
+    operations: Iterable[CreateTunedModelOperation | str],
+    *,
+    client=None,
+    timeout: float | None = None,
+    poll_interval: float = 5.0,
+    max_poll_interval: float = 60.0,
+) -> AsyncIterator[OperationStatus]:
+    """Tracks many tuning operations at once, yielding their status as they progress.
+
+    ```
+    operations = [genai.create_tuned_model(...) for ... in ...]
+    async for status in genai.wait_for_operations_async(operations):
+        print(status.operation.name, status.metadata.completed_percent)
+        if status.done:
+            print(status.operation.result())
+    ```
+
+    All the due operations are refreshed together, with one `list_operations` scan when there
+    are several of them. The calls run in a worker thread, so they don't block the event loop.
+
+    Args:
+        operations: The operations, or their names.
+        client: The operations client, the default one if not provided.
+        timeout: The maximum number of seconds to wait. `None` waits forever.
+        poll_interval: The shortest time between two polls of an operation.
+        max_poll_interval: The longest time between two polls of an operation.
+
+    Yields:
+        An `OperationStatus` for each operation when it first reports, whenever its
+        `completed_steps` changes, and when it's done.
+
+    Raises:
+        TimeoutError: If operations are still running after `timeout` seconds.
+    """
+    if client is None:
+        client = client_lib.get_default_operations_client()
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    pending = {}
+    for op in operations:
+        if isinstance(op, str):
+            op = await asyncio.to_thread(get_operation, op, client=client)
+        pending[op.name] = (op, _PollSchedule(poll_interval, max_poll_interval))
+
+    for op, schedule in list(pending.values()):
+        schedule.record(_completed_steps(op))
+        yield OperationStatus(operation=op, metadata=op.metadata, done=op._operation.done)
+        if op._operation.done:
+            del pending[op.name]
+
+    while pending:
+        next_poll = min(schedule.next_poll for _, schedule in pending.values())
+        if deadline is not None and next_poll > deadline:
+            await asyncio.sleep(max(deadline - time.monotonic(), 0))
+            raise TimeoutError(
+                f"Timed out after {timeout} seconds waiting for operations: {sorted(pending)}."
+            )
+        await asyncio.sleep(max(next_poll - time.monotonic(), 0))
+
+        now = time.monotonic()
+        due = [name for name, (_, schedule) in pending.items() if schedule.next_poll <= now]
+        protos = await asyncio.to_thread(_refresh_operations, client, due)
+        for name in due:
+            op, schedule = pending[name]
+            op._update_from_proto(protos[name])
+            progressed = schedule.record(_completed_steps(op))
+            done = op._operation.done
+            if progressed or done:
+                yield OperationStatus(operation=op, metadata=op.metadata, done=done)
+            if done:
+                del pending[name]
+
+
 def from_gapic(
     cls,
     *,
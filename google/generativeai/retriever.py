@@ -26,6 +26,9 @@ from google.generativeai.client import get_default_retriever_async_client
 from google.generativeai.types import helper_types
 from google.generativeai.types.model_types import idecode_time
 from google.generativeai.types import retriever_types
+from google.generativeai.utils import aiter_prefetched
+from google.generativeai.utils import iter_prefetched
+from google.generativeai.utils import DEFAULT_PREFETCH
 
 
 def create_corpus(
@@ -210,6 +213,7 @@ def list_corpora(
     page_size: Optional[int] = None,
     client: glm.RetrieverServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    prefetch: int = DEFAULT_PREFETCH,
 ) -> Iterable[retriever_types.Corpus]:
     """Calls the API to list all `Corpora` in the service and returns a list of paginated `Corpora`.
 
@@ -217,6 +221,7 @@ def list_corpora(
         page_size: Maximum number of `Corpora` to request.
         page_token: A page token, received from a previous ListCorpora call.
         request_options: Options for the request.
+        prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
     Return:
         Paginated list of `Corpora`.
@@ -228,7 +233,8 @@ def list_corpora(
         client = get_default_retriever_client()
 
     request = glm.ListCorporaRequest(page_size=page_size)
-    for corpus in client.list_corpora(request, **request_options):
+    pager = client.list_corpora(request, **request_options)
+    for corpus in iter_prefetched(pager, "corpora", prefetch):
         corpus = type(corpus).to_dict(corpus)
         idecode_time(corpus, "create_time")
         idecode_time(corpus, "update_time")
@@ -240,6 +246,7 @@ async def list_corpora_async(
     page_size: Optional[int] = None,
     client: glm.RetrieverServiceClient | None = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    prefetch: int = DEFAULT_PREFETCH,
 ) -> AsyncIterable[retriever_types.Corpus]:
     """This is the async version of `retriever.list_corpora`."""
     if request_options is None:
@@ -249,7 +256,8 @@ async def list_corpora_async(
         client = get_default_retriever_async_client()
 
     request = glm.ListCorporaRequest(page_size=page_size)
-    async for corpus in await client.list_corpora(request, **request_options):
+    pager = await client.list_corpora(request, **request_options)
+    async for corpus in aiter_prefetched(pager, "corpora", prefetch):
         corpus = type(corpus).to_dict(corpus)
         idecode_time(corpus, "create_time")
         idecode_time(corpus, "update_time")
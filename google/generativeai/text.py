@@ -17,6 +17,7 @@ from __future__ import annotations
 import dataclasses
 from collections.abc import Iterable, Sequence
 import itertools
+import typing
 from typing import Any, Iterable, overload, TypeVar
 
 import google.ai.generativelanguage as glm
@@ -27,8 +28,12 @@ from google.generativeai.types import helper_types
 from google.generativeai.types import text_types
 from google.generativeai.types import model_types
 from google.generativeai import models
+from google.generativeai import embedding as embedding_lib
 from google.generativeai.types import palm_safety_types
 
+if typing.TYPE_CHECKING:
+    import numpy as np
+
 DEFAULT_TEXT_MODEL = "models/text-bison-001"
 EMBEDDING_MAX_BATCH_SIZE = 100
 
@@ -280,6 +285,8 @@ def generate_embeddings(
     text: str,
     client: glm.TextServiceClient = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
 ) -> text_types.EmbeddingDict: ...
 
 
@@ -289,6 +296,9 @@ def generate_embeddings(
     text: Sequence[str],
     client: glm.TextServiceClient = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    deduplicate: bool = False,
 ) -> text_types.BatchEmbeddingDict: ...
 
 
@@ -297,6 +307,9 @@ def generate_embeddings(
     text: str | Sequence[str],
     client: glm.TextServiceClient = None,
     request_options: helper_types.RequestOptionsType | None = None,
+    output: str = "list",
+    out: np.ndarray | None = None,
+    deduplicate: bool = False,
 ) -> text_types.EmbeddingDict | text_types.BatchEmbeddingDict:
     """Calls the API to create an embedding for the text passed in.
 
@@ -310,10 +323,18 @@ def generate_embeddings(
 
         request_options: Options for the request.
 
+        output: `"list"` (default), or `"numpy"` to return the embeddings as a `float32` NumPy
+                array, see `genai.embed_content`.
+
+        out: With `output="numpy"`, an optional array to write the embeddings into.
+
+        deduplicate: If True, identical texts are only sent once, see `genai.embed_content`.
+
     Returns:
         Dictionary containing the embedding (list of float values) for the input text.
     """
     model = model_types.make_model_name(model)
+    embedding_lib._check_output(output, out)
 
     if request_options is None:
         request_options = {}
@@ -327,19 +348,44 @@ def generate_embeddings(
             embedding_request,
             **request_options,
         )
+        if output == "numpy":
+            values = glm.EmbedTextResponse.pb(embedding_response).embedding.value
+            if out is not None:
+                out = out.reshape(1, -1)
+            return {"embedding": embedding_lib._embeddings_to_array([values], out)[0]}
         embedding_dict = type(embedding_response).to_dict(embedding_response)
         embedding_dict["embedding"] = embedding_dict["embedding"]["value"]
     else:
+        texts = text
+        if deduplicate:
+            texts = list(dict.fromkeys(text))
+            embedding_lib._record_duplicates(len(text), len(text) - len(texts))
+
         result = {"embedding": []}
-        for batch in _batched(text, EMBEDDING_MAX_BATCH_SIZE):
+        for batch in _batched(texts, EMBEDDING_MAX_BATCH_SIZE):
             # TODO(markdaoust): This could use an option for returning an iterator or wait-bar.
             embedding_request = glm.BatchEmbedTextRequest(model=model, texts=batch)
             embedding_response = client.batch_embed_text(
                 embedding_request,
                 **request_options,
             )
-            embedding_dict = type(embedding_response).to_dict(embedding_response)
-            result["embedding"].extend(e["value"] for e in embedding_dict["embeddings"])
+            if output == "numpy":
+                pb = glm.BatchEmbedTextResponse.pb(embedding_response)
+                result["embedding"].extend(e.value for e in pb.embeddings)
+            else:
+                embedding_dict = type(embedding_response).to_dict(embedding_response)
+                result["embedding"].extend(e["value"] for e in embedding_dict["embeddings"])
+        if deduplicate:
+            by_text = dict(zip(texts, result["embedding"]))
+            seen = set()
+            result["embedding"] = []
+            for t in text:
+                # Each duplicate gets its own list.
+                vector = list(by_text[t]) if output == "list" and t in seen else by_text[t]
+                seen.add(t)
+                result["embedding"].append(vector)
+        if output == "numpy":
+            result["embedding"] = embedding_lib._embeddings_to_array(result["embedding"], out)
         return result
 
     return embedding_dict
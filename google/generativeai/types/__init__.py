@@ -20,6 +20,7 @@ from google.generativeai.types.discuss_types import *
 from google.generativeai.types.file_types import *
 from google.generativeai.types.generation_types import *
 from google.generativeai.types.helper_types import *
+from google.generativeai.types.history_types import *
 from google.generativeai.types.model_types import *
 from google.generativeai.types.safety_types import *
 from google.generativeai.types.text_types import *
@@ -280,6 +280,11 @@ def to_contents(contents: ContentsType) -> list[glm.Content]:
     if contents is None:
         return []
 
+    if isinstance(contents, list) and all(type(c) is glm.Content for c in contents):
+        # Fast path for already converted contents, like a `ChatSession.history`. This skips
+        # re-validating every previous turn of a long conversation.
+        return list(contents)
+
     if isinstance(contents, Iterable) and not isinstance(contents, (str, Mapping)):
         try:
             # strict_to_content so [[parts], [parts]] doesn't assume roles.
@@ -584,6 +589,20 @@ class CallableFunctionDeclaration(FunctionDeclaration):
             result = {"result": result}
         return glm.FunctionResponse(name=fc.name, response=result)
 
+    @property
+    def is_coroutine(self) -> bool:
+        """True if the wrapped function is an `async def` function."""
+        return inspect.iscoroutinefunction(self.function)
+
+    async def call_async(self, fc: glm.FunctionCall) -> glm.FunctionResponse:
+        """Calls the function, awaiting the result if it is a coroutine function."""
+        result = self.function(**fc.args)
+        if inspect.isawaitable(result):
+            result = await result
+        if not isinstance(result, dict):
+            result = {"result": result}
+        return glm.FunctionResponse(name=fc.name, response=result)
+
 
 FunctionDeclarationType = Union[
     FunctionDeclaration,
@@ -726,6 +745,18 @@ class FunctionLibrary:
         response = declaration(fc)
         return glm.Part(function_response=response)
 
+    async def call_async(self, fc: glm.FunctionCall) -> glm.Part | None:
+        """Like `FunctionLibrary.__call__`, but awaits `async def` functions."""
+        declaration = self[fc]
+        if not callable(declaration):
+            return None
+
+        if isinstance(declaration, CallableFunctionDeclaration):
+            response = await declaration.call_async(fc)
+        else:
+            response = declaration(fc)
+        return glm.Part(function_response=response)
+
     def to_proto(self):
         return [tool.to_proto() for tool in self._tools]
 
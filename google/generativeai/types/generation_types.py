@@ -327,6 +327,119 @@ def _join_chunks(chunks: Iterable[glm.GenerateContentResponse]):
     )
 
 
+class _CandidateAccumulator:
+    """Incrementally merges the chunks of a single streamed candidate.
+
+    This applies the same rules as `_join_candidates`, but appends to per-candidate
+    buffers in place instead of rebuilding the whole `glm.Candidate` for every chunk.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.role = ""
+        # Each entry is either a non-text `glm.Part`, or a `[first_part, text_pieces]` run of
+        # consecutive text parts that will be joined into a single part.
+        self.parts: list[glm.Part | list] = []
+        self.finish_reason = glm.Candidate.FinishReason.FINISH_REASON_UNSPECIFIED
+        self.safety_ratings: dict[int, list] = {}
+        self.citation_metadata: glm.CitationMetadata | None = None
+        self.token_count = 0
+
+    def add_candidate(self, candidate: glm.Candidate):
+        content = candidate.content
+        if not self.role:
+            self.role = content.role
+
+        parts = self.parts
+        for part in content.parts:
+            text = part.text
+            if text and parts and isinstance(parts[-1], list):
+                parts[-1][1].append(text)
+            elif text:
+                parts.append([part, [text]])
+            else:
+                parts.append(part)
+
+        for rating in candidate.safety_ratings:
+            entry = self.safety_ratings.get(rating.category)
+            if entry is None:
+                self.safety_ratings[rating.category] = [rating.probability, rating.blocked]
+            else:
+                entry[0] = rating.probability
+                entry[1] = entry[1] or rating.blocked
+
+        self.finish_reason = candidate.finish_reason
+        self.citation_metadata = candidate.citation_metadata
+        self.token_count = candidate.token_count
+
+    def to_proto(self) -> glm.Candidate:
+        parts = []
+        for part in self.parts:
+            if isinstance(part, list):
+                first, pieces = part
+                if len(pieces) > 1:
+                    first = glm.Part(first)
+                    first.text = "".join(pieces)
+                part = first
+            parts.append(part)
+
+        safety_ratings = [
+            glm.SafetyRating(category=category, probability=probability, blocked=blocked)
+            for category, (probability, blocked) in self.safety_ratings.items()
+        ]
+
+        return glm.Candidate(
+            index=self.index,
+            content=glm.Content(role=self.role, parts=parts),
+            finish_reason=self.finish_reason,
+            safety_ratings=safety_ratings,
+            citation_metadata=self.citation_metadata,
+            token_count=self.token_count,
+        )
+
+
+class _ResponseAccumulator:
+    """Incrementally merges streamed `glm.GenerateContentResponse` chunks.
+
+    Calling `_join_chunks([result, chunk])` for every chunk copies everything received so far,
+    making a stream of `n` chunks cost `O(n**2)`. This class keeps per-candidate buffers that are
+    appended to in place, and only builds the merged proto (the same one `_join_chunks` would
+    return) when `result` is read.
+    """
+
+    def __init__(self, first: glm.GenerateContentResponse):
+        self._prompt_feedback = first.prompt_feedback
+        self._usage_metadata = first.usage_metadata
+        self._candidates: dict[int, _CandidateAccumulator] = {}
+        self._result: glm.GenerateContentResponse | None = None
+        self._add_candidates(first)
+
+    def _add_candidates(self, chunk: glm.GenerateContentResponse):
+        for candidate in chunk.candidates:
+            accumulator = self._candidates.get(candidate.index)
+            if accumulator is None:
+                accumulator = _CandidateAccumulator(candidate.index)
+                self._candidates[candidate.index] = accumulator
+            accumulator.add_candidate(candidate)
+
+    def add_chunk(self, chunk: glm.GenerateContentResponse):
+        self._add_candidates(chunk)
+        self._usage_metadata = chunk.usage_metadata
+        self._result = None
+
+    @property
+    def result(self) -> glm.GenerateContentResponse:
+        if self._result is None:
+            self._result = glm.GenerateContentResponse(
+                candidates=[
+                    accumulator.to_proto() for _, accumulator in sorted(self._candidates.items())
+                ],
+                prompt_feedback=self._prompt_feedback,
+                usage_metadata=self._usage_metadata,
+            )
+        return self._result
+
+
 _INCOMPLETE_ITERATION_MESSAGE = """\
 Please let the response complete iteration before accessing the final accumulated
 attributes (or call `response.resolve()`)"""
@@ -346,7 +459,8 @@ class BaseGenerateContentResponse:
     ):
         self._done = done
         self._iterator = iterator
-        self._result = result
+        self._first_result = result
+        self._accumulator: _ResponseAccumulator | None = None
         if chunks is None:
             self._chunks = [result]
         else:
@@ -356,6 +470,22 @@ class BaseGenerateContentResponse:
         else:
             self._error = None
 
+    @property
+    def _result(self) -> glm.GenerateContentResponse:
+        if self._accumulator is None:
+            return self._first_result
+        return self._accumulator.result
+
+    def _accumulate(self, chunk: glm.GenerateContentResponse):
+        if self._accumulator is None:
+            self._accumulator = _ResponseAccumulator(self._first_result)
+        self._accumulator.add_chunk(chunk)
+
+    def _set_result(self, result: glm.GenerateContentResponse):
+        """Replaces the accumulated result, the chunks already received are kept."""
+        self._first_result = result
+        self._accumulator = None
+
     def to_dict(self):
         """Returns the result as a JSON-compatible dict.
 
@@ -556,7 +686,7 @@ class GenerateContentResponse(BaseGenerateContentResponse):
                     self._done = True
                 else:
                     self._chunks.append(item)
-                    self._result = _join_chunks([self._result, item])
+                    self._accumulate(item)
 
             item = self._chunks[n]
 
@@ -623,7 +753,7 @@ class AsyncGenerateContentResponse(BaseGenerateContentResponse):
                     self._done = True
                 else:
                     self._chunks.append(item)
-                    self._result = _join_chunks([self._result, item])
+                    self._accumulate(item)
 
             item = self._chunks[n]
 
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Policies that bound the size of a `ChatSession.history`."""
+from __future__ import annotations
+
+import abc
+import typing
+from typing import Callable, Union
+
+from google.ai import generativelanguage as glm
+from google.generativeai import client as client_lib
+
+if typing.TYPE_CHECKING:
+    from google.generativeai.generative_models import ChatSession
+
+__all__ = [
+    "HistoryPolicy",
+    "HistoryPolicyType",
+    "KeepLastTurns",
+    "TokenBudget",
+    "SummarizeAndDrop",
+]
+
+# Rough sizes used for a `glm.Content` with no recorded token count.
+_CHARS_PER_TOKEN = 4
+_TOKENS_PER_BLOB = 258
+
+DEFAULT_SUMMARY_PROMPT = (
+    "Summarize our conversation so far. Keep every fact, decision and open question "
+    "that may be needed to continue it."
+)
+
+
+class HistoryPolicy(abc.ABC):
+    """Decides which part of a `ChatSession.history` is kept, and sent, with each new message.
+
+    Before each message is sent, the `ChatSession` calls its `history_policy` with the current
+    history (not including the new message) and replaces its history with the result.
+
+    Any callable with the same signature can be used as a policy.
+    """
+
+    @abc.abstractmethod
+    def __call__(
+        self, chat: ChatSession, history: list[glm.Content], content: glm.Content
+    ) -> list[glm.Content]:
+        """Returns the history to keep before `content` is sent.
+
+        Args:
+            chat: The `ChatSession` sending the message.
+            history: The current history. This is a copy, it's safe to modify.
+            content: The message about to be sent.
+        """
+
+
+HistoryPolicyType = Union[
+    HistoryPolicy,
+    Callable[["ChatSession", list[glm.Content], glm.Content], list[glm.Content]],
+]
+
+
+def _turn_starts(history: list[glm.Content]) -> list[int]:
+    """Returns the indices of the user messages that start each turn.
+
+    Function responses are sent with the `user` role, but they belong to the turn of the
+    function call, so the history is never cut between the two.
+    """
+    return [
+        i
+        for i, content in enumerate(history)
+        if content.role == "user" and not any("function_response" in part for part in content.parts)
+    ]
+
+
+def _estimate_tokens(content: glm.Content) -> int:
+    tokens = 0
+    for part in content.parts:
+        if "text" in part:
+            tokens += len(part.text) // _CHARS_PER_TOKEN + 1
+        elif "inline_data" in part or "file_data" in part:
+            tokens += _TOKENS_PER_BLOB
+        else:
+            tokens += glm.Part.pb(part).ByteSize() // _CHARS_PER_TOKEN + 1
+    return tokens
+
+
+def _estimate_request_tokens(chat: ChatSession) -> int:
+    """Estimates the tokens of the system instruction and tools sent with every request."""
+    tokens = 0
+    if chat.model._system_instruction is not None:
+        tokens += _estimate_tokens(chat.model._system_instruction)
+    if chat.model._tools is not None:
+        size = sum(glm.Tool.pb(tool).ByteSize() for tool in chat.model._tools.to_proto())
+        tokens += size // _CHARS_PER_TOKEN + 1
+    return tokens
+
+
+def _count_tokens(chat: ChatSession, content: glm.Content) -> int:
+    """Counts the tokens of `content` alone with the `count_tokens` API, on the model's client."""
+    generative_client = chat.model._client or client_lib.get_default_generative_client()
+    response = generative_client.count_tokens(
+        glm.CountTokensRequest(model=chat.model.model_name, contents=[content])
+    )
+    return response.total_tokens
+
+
+def _token_counts(
+    chat: ChatSession, contents: list[glm.Content], use_count_tokens: bool
+) -> list[int]:
+    """Returns a token count for each of the `contents`, the last one being the new message.
+
+    Counts recorded from the `usage_metadata` of previous responses are used where available.
+    Otherwise the count comes from the `count_tokens` API if `use_count_tokens` is set, or from a
+    rough estimate of 4 characters per token.
+
+    The new message's count includes the model's system instruction and tools. They're sent with
+    every request, and the new message is never dropped.
+    """
+    *history, content = contents
+    counts = []
+    for c in history:
+        count = chat._recorded_token_count(c)
+        if count is None and use_count_tokens:
+            count = _count_tokens(chat, c)
+            chat._record_token_count(c, count)
+        if count is None:
+            count = _estimate_tokens(c)
+        counts.append(count)
+
+    if use_count_tokens:
+        counts.append(chat.model.count_tokens([content]).total_tokens)
+    else:
+        counts.append(_estimate_tokens(content) + _estimate_request_tokens(chat))
+    return counts
+
+
+class KeepLastTurns(HistoryPolicy):
+    """Keeps only the last `max_turns` turns of the conversation.
+
+    A turn is a user message and everything that follows it until the next user message,
+    including any automatic function calls and responses.
+    """
+
+    def __init__(self, max_turns: int):
+        if max_turns < 0:
+            raise ValueError(
+                f"Invalid value: `max_turns` must be a non-negative integer. Received: {max_turns}."
+            )
+        self.max_turns = max_turns
+
+    def __call__(
+        self, chat: ChatSession, history: list[glm.Content], content: glm.Content
+    ) -> list[glm.Content]:
+        starts = _turn_starts(history)
+        if len(starts) <= self.max_turns:
+            return history
+        if self.max_turns == 0:
+            return []
+        return history[starts[-self.max_turns] :]
+
+
+class TokenBudget(HistoryPolicy):
+    """Drops the oldest turns until the history and the new message fit in `max_tokens`.
+
+    The token counts come from the `usage_metadata` of previous responses, so no extra request
+    is needed for turns the `ChatSession` received. Other contents are estimated, or counted
+    with the `count_tokens` API if `use_count_tokens=True`. The system instruction and tools
+    count toward the budget, since they're sent with every request.
+    """
+
+    def __init__(self, max_tokens: int, *, use_count_tokens: bool = False):
+        if max_tokens < 1:
+            raise ValueError(
+                f"Invalid value: `max_tokens` must be a positive integer. Received: {max_tokens}."
+            )
+        self.max_tokens = max_tokens
+        self.use_count_tokens = use_count_tokens
+
+    def __call__(
+        self, chat: ChatSession, history: list[glm.Content], content: glm.Content
+    ) -> list[glm.Content]:
+        counts = _token_counts(chat, history + [content], self.use_count_tokens)
+        total = sum(counts)
+        if total <= self.max_tokens:
+            return history
+
+        for cut in _turn_starts(history)[1:]:
+            if total - sum(counts[:cut]) <= self.max_tokens:
+                return history[cut:]
+        return []
+
+
+class SummarizeAndDrop(HistoryPolicy):
+    """Replaces the oldest turns with a model written summary when over `max_tokens`.
+
+    When the history and the new message exceed `max_tokens`, everything except the last
+    `keep_last_turns` turns is sent to the chat's model with the `prompt`, and replaced in the
+    history by that request and the model's summary. Token counts are handled as in
+    `TokenBudget`.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        *,
+        keep_last_turns: int = 2,
+        prompt: str = DEFAULT_SUMMARY_PROMPT,
+        use_count_tokens: bool = False,
+    ):
+        if max_tokens < 1:
+            raise ValueError(
+                f"Invalid value: `max_tokens` must be a positive integer. Received: {max_tokens}."
+            )
+        if keep_last_turns < 0:
+            raise ValueError(
+                f"Invalid value: `keep_last_turns` must be a non-negative integer. Received: {keep_last_turns}."
+            )
+        self.max_tokens = max_tokens
+        self.keep_last_turns = keep_last_turns
+        self.prompt = prompt
+        self.use_count_tokens = use_count_tokens
+
+    def __call__(
+        self, chat: ChatSession, history: list[glm.Content], content: glm.Content
+    ) -> list[glm.Content]:
+        counts = _token_counts(chat, history + [content], self.use_count_tokens)
+        if sum(counts) <= self.max_tokens:
+            return history
+
+        starts = _turn_starts(history)
+        if len(starts) <= self.keep_last_turns:
+            return history
+        if self.keep_last_turns == 0:
+            cut = len(history)
+        else:
+            cut = starts[-self.keep_last_turns]
+
+        request = glm.Content(role="user", parts=[glm.Part(text=self.prompt)])
+        tool_config = None
+        if chat.model._tools is not None:
+            tool_config = {"function_calling_config": "none"}
+        response = chat.model.generate_content(history[:cut] + [request], tool_config=tool_config)
+
+        summary = response.candidates[0].content
+        if not summary.role:
+            summary.role = "model"
+        if response.usage_metadata.candidates_token_count:
+            chat._record_token_count(summary, response.usage_metadata.candidates_token_count)
+
+        return [request, summary] + history[cut:]
@@ -19,6 +19,7 @@ from collections.abc import Mapping
 import csv
 import dataclasses
 import datetime
+import hashlib
 import json
 import pathlib
 import re
@@ -227,40 +228,202 @@ TuningDataOptions = Union[
 
 
 def encode_tuning_data(
-    data: TuningDataOptions, input_key="text_input", output_key="output"
+    data: TuningDataOptions,
+    input_key="text_input",
+    output_key="output",
+    *,
+    deduplicate: bool = False,
 ) -> glm.Dataset:
+    """Converts tuning data to a `glm.Dataset`, see `TuningDataEncoder`.
+
+    `data` can be a `glm.Dataset`, a mapping of columns, an iterable of examples, or a path or
+    URL to a `.csv`, `.json` or `.jsonl` file (or a Google Sheets URL).
+    """
     if isinstance(data, glm.Dataset):
         return data
 
+    encoder = TuningDataEncoder(input_key, output_key, deduplicate=deduplicate)
+    encoder.add_data(data)
+    return encoder.dataset()
+
+
+def _read_lines(data: str | pathlib.Path) -> Iterable[str]:
+    """Yields the lines of a URL or local file, one at a time."""
     if isinstance(data, str):
-        # Strings are either URLs or system paths.
-        if re.match(r"^\w+://\S+$", data):
-            data = _normalize_url(data)
-        else:
-            # Normalize system paths to use pathlib
-            data = pathlib.Path(data)
+        with urllib.request.urlopen(data) as f:
+            for line in f:
+                yield line.decode("utf-8")
+    else:
+        with data.open("r", encoding="utf-8", newline="") as f:
+            yield from f
 
-    if isinstance(data, (str, pathlib.Path)):
-        if isinstance(data, str):
-            f = urllib.request.urlopen(data)
-            # csv needs strings, json does not.
-            content = (line.decode("utf-8") for line in f)
-        else:
-            f = data.open("r")
-            content = f
 
-        if str(data).lower().endswith(".json"):
-            with f:
-                data = json.load(f)
+def _read_jsonl(lines: Iterable[str]) -> Iterable[Any]:
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number} of the JSONL data: {e}") from e
+
+
+# Tuning data is mostly English text, at about 4 characters per token.
+_CHARS_PER_TOKEN = 4
+
+
+@string_utils.prettyprint
+@dataclasses.dataclass
+class TuningDataStats:
+    """Statistics about the examples seen by a `TuningDataEncoder`.
+
+    Attributes:
+        example_count: The number of examples in the dataset.
+        duplicate_count: The number of duplicate examples that were dropped.
+        input_chars: The total length of the inputs.
+        output_chars: The total length of the outputs.
+        max_input_chars: The length of the longest input.
+        max_output_chars: The length of the longest output.
+        size_bytes: The size of the encoded examples.
+    """
+
+    example_count: int = 0
+    duplicate_count: int = 0
+    input_chars: int = 0
+    output_chars: int = 0
+    max_input_chars: int = 0
+    max_output_chars: int = 0
+    size_bytes: int = 0
+
+    @property
+    def estimated_token_count(self) -> int:
+        """A rough estimate of the number of tokens, without calling the API."""
+        return -(-(self.input_chars + self.output_chars) // _CHARS_PER_TOKEN)
+
+
+class TuningDataEncoder:
+    """Builds a `glm.Dataset` from tuning examples, one example at a time.
+
+    Files are read incrementally, and each example is written straight into the dataset proto,
+    so a large dataset is held in memory only once:
+
+    >>> encoder = TuningDataEncoder(deduplicate=True)
+    >>> encoder.add_data("data.jsonl")
+    >>> encoder.stats.example_count
+    >>> dataset = encoder.dataset()
+
+    Examples are validated as they are added: both the input and the output must be non-empty.
+
+    Args:
+        input_key: The key, or column, of the inputs in dict examples and files.
+        output_key: The key, or column, of the outputs in dict examples and files.
+        deduplicate: Whether to drop examples identical to an earlier one. Only a hash of each
+            example is kept to find them.
+    """
+
+    def __init__(self, input_key="text_input", output_key="output", *, deduplicate=False):
+        self.input_key = input_key
+        self.output_key = output_key
+        self.deduplicate = deduplicate
+        self.stats = TuningDataStats()
+        self._dataset_pb = glm.Dataset.pb()()
+        self._examples = self._dataset_pb.examples.examples
+        self._seen: set[bytes] = set()
+
+    def add(self, text_input: Any, output: Any):
+        """Adds one example. Non-string values are converted with `str`."""
+        text_input = text_input if isinstance(text_input, str) else str(text_input)
+        output = output if isinstance(output, str) else str(output)
+        index = self.stats.example_count + self.stats.duplicate_count
+        if not text_input:
+            raise ValueError(f"Invalid example {index}: The `{self.input_key}` is empty.")
+        if not output:
+            raise ValueError(f"Invalid example {index}: The `{self.output_key}` is empty.")
+
+        if self.deduplicate:
+            key = hashlib.blake2b(digest_size=16)
+            for text in (text_input, output):
+                encoded = text.encode("utf-8")
+                # The length prefix keeps ("ab", "c") and ("a", "bc") apart.
+                key.update(len(encoded).to_bytes(8, "little"))
+                key.update(encoded)
+            key = key.digest()
+            if key in self._seen:
+                self.stats.duplicate_count += 1
+                return
+            self._seen.add(key)
+
+        example = self._examples.add(text_input=text_input, output=output)
+        stats = self.stats
+        stats.example_count += 1
+        stats.input_chars += len(text_input)
+        stats.output_chars += len(output)
+        stats.max_input_chars = max(stats.max_input_chars, len(text_input))
+        stats.max_output_chars = max(stats.max_output_chars, len(output))
+        stats.size_bytes += example.ByteSize()
+
+    def add_example(self, example: TuningExampleOptions):
+        """Adds a `glm.TuningExample`, an `(input, output)` pair, or a dict."""
+        if isinstance(example, glm.TuningExample):
+            self.add(example.text_input, example.output)
+        elif isinstance(example, (tuple, list)):
+            text_input, output = example
+            self.add(text_input, output)
+        else:  # dict
+            index = self.stats.example_count + self.stats.duplicate_count
+            for key in (self.input_key, self.output_key):
+                if key not in example:
+                    raise KeyError(
+                        f"Invalid example {index}: The key '{key}' does not exist in the example. "
+                        f"Available keys are: {sorted(example.keys())}."
+                    )
+            self.add(example[self.input_key], example[self.output_key])
+
+    def add_columns(self, data: Mapping[str, Iterable[Any]]):
+        """Adds the examples of a mapping of columns, like a `pandas.DataFrame`."""
+        for key, kind in ((self.input_key, "input"), (self.output_key, "output")):
+            if key not in data:
+                raise KeyError(
+                    f"Invalid key: The {kind} key '{key}' does not exist in the data. "
+                    f"Available keys are: {sorted(data.keys())}."
+                )
+        for text_input, output in zip(data[self.input_key], data[self.output_key]):
+            self.add(text_input, output)
+
+    def add_data(self, data: TuningDataOptions):
+        """Adds all the examples of `data`, see `encode_tuning_data`."""
+        if isinstance(data, glm.Dataset):
+            for example in data.examples.examples:
+                self.add_example(example)
+            return
+
+        if isinstance(data, str):
+            # Strings are either URLs or system paths.
+            if re.match(r"^\w+://\S+$", data):
+                data = _normalize_url(data)
+            else:
+                # Normalize system paths to use pathlib
+                data = pathlib.Path(data)
+
+        if isinstance(data, (str, pathlib.Path)):
+            suffix = str(data).lower()
+            if suffix.endswith(".json"):
+                # A JSON document can't be parsed incrementally with the standard library.
+                data = json.loads("".join(_read_lines(data)))
+            elif suffix.endswith((".jsonl", ".ndjson")):
+                data = _read_jsonl(_read_lines(data))
+            else:
+                data = csv.DictReader(_read_lines(data))
+
+        if hasattr(data, "keys"):
+            self.add_columns(data)
         else:
-            with f:
-                data = csv.DictReader(content)
-                return _convert_iterable(data, input_key, output_key)
+            for example in data:
+                self.add_example(example)
 
-    if hasattr(data, "keys"):
-        return _convert_dict(data, input_key, output_key)
-    else:
-        return _convert_iterable(data, input_key, output_key)
+    def dataset(self) -> glm.Dataset:
+        """Returns the dataset. It shares its memory with the encoder, rather than copying it."""
+        return glm.Dataset.wrap(self._dataset_pb)
 
 
 def _normalize_url(url: str) -> str:
@@ -281,38 +444,6 @@ def _normalize_url(url: str) -> str:
     return url
 
 
-def _convert_dict(data, input_key, output_key):
-    new_data = list()
-
-    try:
-        inputs = data[input_key]
-    except KeyError:
-        raise KeyError(
-            f"Invalid key: The input key '{input_key}' does not exist in the data. "
-            f"Available keys are: {sorted(data.keys())}."
-        )
-
-    try:
-        outputs = data[output_key]
-    except KeyError:
-        raise KeyError(
-            f"Invalid key: The output key '{output_key}' does not exist in the data. "
-            f"Available keys are: {sorted(data.keys())}."
-        )
-
-    for i, o in zip(inputs, outputs):
-        new_data.append(glm.TuningExample({"text_input": str(i), "output": str(o)}))
-    return glm.Dataset(examples=glm.TuningExamples(examples=new_data))
-
-
-def _convert_iterable(data, input_key, output_key):
-    new_data = list()
-    for example in data:
-        example = encode_tuning_example(example, input_key, output_key)
-        new_data.append(example)
-    return glm.Dataset(examples=glm.TuningExamples(examples=new_data))
-
-
 def encode_tuning_example(example: TuningExampleOptions, input_key, output_key):
     if isinstance(example, glm.TuningExample):
         return example
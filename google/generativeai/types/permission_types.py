@@ -25,6 +25,9 @@ from google.protobuf import field_mask_pb2
 from google.generativeai.client import get_default_permission_client
 from google.generativeai.client import get_default_permission_async_client
 from google.generativeai.utils import flatten_update_paths
+from google.generativeai.utils import aiter_prefetched
+from google.generativeai.utils import iter_prefetched
+from google.generativeai.utils import DEFAULT_PREFETCH
 from google.generativeai import string_utils
 
 
@@ -345,6 +348,7 @@ class Permissions:
         self,
         page_size: Optional[int] = None,
         client: glm.PermissionServiceClient | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> Iterable[Permission]:
         """
         List `Permission`s enforced on a resource (self).
@@ -352,6 +356,7 @@ class Permissions:
         Args:
             parent: The resource name of the parent resource in which the permission will be listed.
             page_size: The maximum number of permissions to return (per page). The service may return fewer permissions.
+            prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
         Returns:
             Paginated list of `Permission` objects.
@@ -362,7 +367,8 @@ class Permissions:
         request = glm.ListPermissionsRequest(
             parent=self.parent, page_size=page_size  # pytype: disable=attribute-error
         )
-        for permission in client.list_permissions(request):
+        pager = client.list_permissions(request)
+        for permission in iter_prefetched(pager, "permissions", prefetch):
             permission = type(permission).to_dict(permission)
             yield Permission(**permission)
 
@@ -370,6 +376,7 @@ class Permissions:
         self,
         page_size: Optional[int] = None,
         client: glm.PermissionServiceAsyncClient | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> AsyncIterable[Permission]:
         """
         This is the async version of `PermissionAdapter.list_permissions`.
@@ -380,7 +387,8 @@ class Permissions:
         request = glm.ListPermissionsRequest(
             parent=self.parent, page_size=page_size  # pytype: disable=attribute-error
         )
-        async for permission in await client.list_permissions(request):
+        pager = await client.list_permissions(request)
+        async for permission in aiter_prefetched(pager, "permissions", prefetch):
             permission = type(permission).to_dict(permission)
             yield Permission(**permission)
 
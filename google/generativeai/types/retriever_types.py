@@ -32,6 +32,9 @@ from google.generativeai.types import helper_types
 from google.generativeai.types import permission_types
 from google.generativeai.types.model_types import idecode_time
 from google.generativeai.utils import flatten_update_paths
+from google.generativeai.utils import aiter_prefetched
+from google.generativeai.utils import iter_prefetched
+from google.generativeai.utils import DEFAULT_PREFETCH
 
 _VALID_NAME = r"[a-z0-9]([a-z0-9-]{0,38}[a-z0-9])$"
 NAME_ERROR_MSG = """The `name` must consist of alphanumeric characters (or -) and be 40 or fewer characters; or be empty. The name you entered:
@@ -622,6 +625,7 @@ class Corpus:
         page_size: int | None = None,
         client: glm.RetrieverServiceClient | None = None,
         request_options: helper_types.RequestOptionsType | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> Iterable[Document]:
         """
         List documents in corpus.
@@ -630,6 +634,7 @@ class Corpus:
             name: The name of the `Corpus` containing `Document`s.
             page_size: The maximum number of `Document`s to return (per page). The service may return fewer `Document`s.
             request_options: Options for the request.
+            prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
         Return:
             Paginated list of `Document`s.
@@ -644,7 +649,8 @@ class Corpus:
             parent=self.name,
             page_size=page_size,
         )
-        for doc in client.list_documents(request, **request_options):
+        pager = client.list_documents(request, **request_options)
+        for doc in iter_prefetched(pager, "documents", prefetch):
             yield decode_document(doc)
 
     async def list_documents_async(
@@ -652,6 +658,7 @@ class Corpus:
         page_size: int | None = None,
         client: glm.RetrieverServiceAsyncClient | None = None,
         request_options: helper_types.RequestOptionsType | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> AsyncIterable[Document]:
         """This is the async version of `Corpus.list_documents`."""
         if request_options is None:
@@ -664,7 +671,8 @@ class Corpus:
             parent=self.name,
             page_size=page_size,
         )
-        async for doc in await client.list_documents(request, **request_options):
+        pager = await client.list_documents(request, **request_options)
+        async for doc in aiter_prefetched(pager, "documents", prefetch):
             yield decode_document(doc)
 
     # PERMISSIONS STUBS: ..deprecated:: >0.5.2
@@ -1002,6 +1010,7 @@ class Document(abc.ABC):
         page_size: int | None = None,
         client: glm.RetrieverServiceClient | None = None,
         request_options: helper_types.RequestOptionsType | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> Iterable[Chunk]:
         """
         List chunks of a document.
@@ -1009,6 +1018,7 @@ class Document(abc.ABC):
         Args:
             page_size: Maximum number of `Chunk`s to request.
             request_options: Options for the request.
+            prefetch: How many pages to fetch in the background, ahead of the page being consumed.
 
         Return:
             List of chunks in the document.
@@ -1020,7 +1030,8 @@ class Document(abc.ABC):
             client = get_default_retriever_client()
 
         request = glm.ListChunksRequest(parent=self.name, page_size=page_size)
-        for chunk in client.list_chunks(request, **request_options):
+        pager = client.list_chunks(request, **request_options)
+        for chunk in iter_prefetched(pager, "chunks", prefetch):
             yield decode_chunk(chunk)
 
     async def list_chunks_async(
@@ -1028,6 +1039,7 @@ class Document(abc.ABC):
         page_size: int | None = None,
         client: glm.RetrieverServiceClient | None = None,
         request_options: helper_types.RequestOptionsType | None = None,
+        prefetch: int = DEFAULT_PREFETCH,
     ) -> AsyncIterable[Chunk]:
         """This is the async version of `Document.list_chunks`."""
         if request_options is None:
@@ -1037,7 +1049,8 @@ class Document(abc.ABC):
             client = get_default_retriever_async_client()
 
         request = glm.ListChunksRequest(parent=self.name, page_size=page_size)
-        async for chunk in await client.list_chunks(request, **request_options):
+        pager = await client.list_chunks(request, **request_options)
+        async for chunk in aiter_prefetched(pager, "chunks", prefetch):
             yield decode_chunk(chunk)
 
     def query(
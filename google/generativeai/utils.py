@@ -14,6 +14,16 @@
 # limitations under the License.
 from __future__ import annotations
 
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+
+# The number of pages the `list_*` functions fetch ahead of the one being consumed.
+DEFAULT_PREFETCH = 1
+
+_DONE = object()
+
 
 def flatten_update_paths(updates):
     """Flattens a nested dictionary into a single level dictionary, with keys representing the original path."""
@@ -27,3 +37,103 @@ def flatten_update_paths(updates):
             new_updates[key] = value
 
     return new_updates
+
+
+def _prefetch_in_thread(iterable: Iterable[Any], size: int) -> Iterator[Any]:
+    """Iterates over `iterable` in a background thread, buffering up to `size` items."""
+    buffer = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def _put(entry) -> bool:
+        # Gives up once the consumer is gone, so an abandoned iteration doesn't leak the thread.
+        while not stopped.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put((item, None)):
+                    return
+            _put((_DONE, None))
+        except BaseException as e:
+            _put((None, e))
+
+    threading.Thread(target=_produce, daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if error is not None:
+                raise error
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+def iter_prefetched(pager: Iterable[Any], field: str, prefetch: int = DEFAULT_PREFETCH):
+    """Iterates over the items of a paginated response, fetching the next pages in the background.
+
+    While the items of one page are consumed, up to `prefetch` more pages are fetched by a
+    background thread, so the consumer doesn't wait a round trip per page.
+
+    Args:
+        pager: A `glm` pager, like the `ListModelsPager` returned by `list_models`. Any other
+            iterable is iterated over directly.
+        field: The name of the pages' repeated field, like `"models"`.
+        prefetch: The maximum number of pages fetched ahead. `0` fetches each page only when
+            it's needed.
+    """
+    if prefetch < 0:
+        raise ValueError(
+            f"Invalid value: `prefetch` must be a non-negative integer. Received: {prefetch}."
+        )
+    pages = getattr(pager, "pages", None)
+    if pages is None or prefetch == 0:
+        yield from pager
+        return
+    for page in _prefetch_in_thread(pages, prefetch):
+        yield from getattr(page, field)
+
+
+async def aiter_prefetched(
+    pager: AsyncIterable[Any], field: str, prefetch: int = DEFAULT_PREFETCH
+) -> AsyncIterator[Any]:
+    """The async version of `iter_prefetched`. The pages are fetched by an `asyncio` task."""
+    if prefetch < 0:
+        raise ValueError(
+            f"Invalid value: `prefetch` must be a non-negative integer. Received: {prefetch}."
+        )
+    pages = getattr(pager, "pages", None)
+    if pages is None or prefetch == 0:
+        async for item in pager:
+            yield item
+        return
+
+    buffer = asyncio.Queue(maxsize=prefetch)
+
+    async def _produce():
+        try:
+            async for page in pages:
+                await buffer.put((page, None))
+            await buffer.put((_DONE, None))
+        except Exception as e:
+            await buffer.put((None, e))
+
+    task = asyncio.create_task(_produce())
+    try:
+        while True:
+            page, error = await buffer.get()
+            if error is not None:
+                raise error
+            if page is _DONE:
+                return
+            for item in getattr(page, field):
+                yield item
+    finally:
+        task.cancel()
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""An in-process nearest neighbour index for `genai.embed_content` results.
+
+This module requires NumPy.
+
+>>> from google.generativeai import vector_index
+>>> index = vector_index.VectorIndex(metric="cosine")
+>>> index.add(genai.embed_content(model, documents, output="numpy"))
+>>> scores, ids = index.search(genai.embed_content(model, "query", output="numpy"), k=5)
+"""
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+from typing import Any, Mapping, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "The NumPy library is required for `vector_index`. Install it with `pip install google-generativeai[numpy]`."
+    ) from e
+
+__all__ = ["VectorIndex"]
+
+EmbeddingsType = Union[np.ndarray, Sequence[Sequence[float]], Sequence[float], Mapping[str, Any]]
+
+_METRICS = ("cosine", "dot")
+
+# The number of stored vectors scored at once by an exact search, this bounds its memory use.
+_BLOCK_ROWS = 1 << 16
+
+_METADATA_FILE = "index.json"
+_VECTORS_FILE = "vectors.npy"
+_CENTROIDS_FILE = "centroids.npy"
+_ASSIGNMENTS_FILE = "assignments.npy"
+
+
+def _to_matrix(embeddings: EmbeddingsType) -> np.ndarray:
+    """Converts `embed_content` output, or any vector or matrix, to a 2D `float32` array."""
+    if isinstance(embeddings, Mapping):
+        embeddings = embeddings["embedding"]
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    if matrix.ndim != 2:
+        raise ValueError(
+            f"Invalid input: Expected a vector or a matrix of embeddings. Received an array with shape {matrix.shape}."
+        )
+    return matrix
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def _top_k(scores: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the `k` largest scores of each row, and their columns, sorted best first."""
+    if k < scores.shape[1]:
+        columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    top = np.take_along_axis(scores, columns, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(columns, order, axis=1)
+
+
+class VectorIndex:
+    """A nearest neighbour index over embedding vectors, kept in memory or memory-mapped.
+
+    Vectors are identified by their position: the first vector added has id 0.
+
+    Searches are exact by default: every stored vector is scored with a matrix product. After
+    `build_ivf`, `search(..., n_probe=...)` only scores the vectors in the `n_probe` clusters
+    closest to each query, which is much faster on large indexes at the cost of some recall.
+
+    Args:
+        metric: `"cosine"` (vectors are normalized when added) or `"dot"`.
+    """
+
+    def __init__(self, metric: str = "cosine"):
+        if metric not in _METRICS:
+            raise ValueError(
+                f"Invalid value: `metric` must be one of {_METRICS}. Received: {metric!r}."
+            )
+        self.metric = metric
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._centroids: np.ndarray | None = None
+        self._assignments: np.ndarray | None = None
+        # The inverted lists, as vector ids sorted by cluster and each cluster's start offset.
+        self._list_ids: np.ndarray | None = None
+        self._list_offsets: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimensions(self) -> int:
+        return self._vectors.shape[1]
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The stored vectors, normalized for the `"cosine"` metric."""
+        return self._vectors[: self._size]
+
+    def reserve(self, capacity: int, dimensions: int):
+        """Preallocates room for `capacity` vectors, so adding them never copies the index."""
+        if self._size and dimensions != self.dimensions:
+            raise ValueError(
+                f"Invalid input: The index holds {self.dimensions} dimensional vectors. Received: {dimensions}."
+            )
+        if capacity <= len(self._vectors) and self._vectors.flags.writeable:
+            return
+        vectors = np.empty((max(capacity, self._size), dimensions), dtype=np.float32)
+        if self._size:
+            vectors[: self._size] = self._vectors[: self._size]
+        self._vectors = vectors
+
+    def add(self, embeddings: EmbeddingsType) -> range:
+        """Adds vectors to the index, and returns their ids.
+
+        Args:
+            embeddings: A vector, a matrix with one vector per row, or the result of
+                `genai.embed_content`.
+        """
+        matrix = _to_matrix(embeddings)
+        if self.metric == "cosine":
+            matrix = _normalize(matrix)
+        if self._size and matrix.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Invalid input: The index holds {self.dimensions} dimensional vectors. Received {matrix.shape[1]} dimensional vectors."
+            )
+
+        start = self._size
+        stop = start + len(matrix)
+        if stop > len(self._vectors) or not self._vectors.flags.writeable:
+            # Grow geometrically, so adding one vector at a time stays linear overall.
+            self.reserve(max(stop, 2 * len(self._vectors)), matrix.shape[1])
+        self._vectors[start:stop] = matrix
+        self._size = stop
+
+        if self._centroids is not None:
+            assignments = self._assign(matrix)
+            self._assignments = np.concatenate([self._assignments, assignments])
+            self._list_ids = None
+        return range(start, stop)
+
+    def search(
+        self, queries: EmbeddingsType, k: int = 10, *, n_probe: int | None = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Finds the `k` stored vectors with the highest scores for each query.
+
+        Args:
+            queries: A vector, a matrix with one query per row, or the result of
+                `genai.embed_content`.
+            k: The number of neighbours to return.
+            n_probe: If set, do an approximate search of the `n_probe` closest clusters built by
+                `build_ivf`. By default the search is exact.
+
+        Returns:
+            The scores and the ids of the neighbours, as `(number of queries, k)` arrays sorted
+            best first. If the index holds fewer than `k` vectors, there are fewer columns.
+        """
+        if k < 1:
+            raise ValueError(f"Invalid value: `k` must be a positive integer. Received: {k}.")
+        queries = _to_matrix(queries)
+        if self.metric == "cosine":
+            queries = _normalize(queries)
+        if self._size and queries.shape[1] != self.dimensions:
+            raise ValueError(
+                f"Invalid input: The index holds {self.dimensions} dimensional vectors. Received {queries.shape[1]} dimensional queries."
+            )
+
+        k = min(k, self._size)
+        if k == 0:
+            empty = np.empty((len(queries), 0))
+            return empty.astype(np.float32), empty.astype(np.int64)
+
+        if n_probe is None:
+            return self._search_exact(queries, k)
+        if self._centroids is None:
+            raise ValueError("Invalid state: Call `build_ivf` before searching with `n_probe`.")
+        return self._search_ivf(queries, k, n_probe)
+
+    def _search_exact(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_ids = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, self._size, _BLOCK_ROWS):
+            block = self._vectors[start : min(start + _BLOCK_ROWS, self._size)]
+            scores, ids = _top_k(queries @ block.T, k)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            ids = np.concatenate([best_ids, ids + start], axis=1)
+            best_scores, columns = _top_k(scores, k)
+            best_ids = np.take_along_axis(ids, columns, axis=1)
+        return best_scores, best_ids
+
+    def _search_ivf(
+        self, queries: np.ndarray, k: int, n_probe: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        self._build_lists()
+        n_probe = min(n_probe, len(self._centroids))
+        _, probes = _top_k(queries @ self._centroids.T, n_probe)
+
+        # Visit each probed list once, scoring every query that probes it, so the list's rows
+        # are gathered from `self._vectors` once per search instead of once per query.
+        found_scores = [[] for _ in queries]
+        found_ids = [[] for _ in queries]
+        for j in np.unique(probes):
+            ids = self._list_ids[self._list_offsets[j] : self._list_offsets[j + 1]]
+            if not len(ids):
+                continue
+            rows = np.flatnonzero((probes == j).any(axis=1))
+            scores, columns = _top_k(queries[rows] @ self._vectors[ids].T, k)
+            for row, i in enumerate(rows):
+                found_scores[i].append(scores[row])
+                found_ids[i].append(ids[columns[row]])
+
+        all_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        all_ids = np.full((len(queries), k), -1, dtype=np.int64)
+        for i in range(len(queries)):
+            if not found_ids[i]:
+                continue
+            candidates = np.concatenate(found_ids[i])
+            scores, columns = _top_k(np.concatenate(found_scores[i])[None, :], k)
+            all_scores[i, : scores.shape[1]] = scores[0]
+            all_ids[i, : columns.shape[1]] = candidates[columns[0]]
+        return all_scores, all_ids
+
+    def build_ivf(
+        self,
+        n_lists: int | None = None,
+        *,
+        n_iter: int = 10,
+        sample_size: int | None = None,
+        seed: int = 0,
+    ):
+        """Clusters the vectors with k-means, for approximate searches with `n_probe`.
+
+        Vectors added later are assigned to the nearest existing cluster.
+
+        Args:
+            n_lists: The number of clusters. Defaults to `sqrt(len(index))`.
+            n_iter: The number of k-means iterations.
+            sample_size: The number of vectors the clusters are trained on. Defaults to
+                `32 * n_lists`.
+            seed: The random seed for the sampling and initialization.
+        """
+        if not self._size:
+            raise ValueError("Invalid state: Add vectors to the index before calling `build_ivf`.")
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(self._size)))
+        n_lists = min(n_lists, self._size)
+        if sample_size is None:
+            sample_size = 32 * n_lists
+
+        rng = np.random.default_rng(seed)
+        sample_ids = np.sort(rng.choice(self._size, min(sample_size, self._size), replace=False))
+        sample = np.asarray(self._vectors[sample_ids])
+
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)]
+        for _ in range(n_iter):
+            self._centroids = centroids
+            assignments = self._assign(sample)
+            counts = np.bincount(assignments, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            order = np.argsort(assignments, kind="stable")
+            non_empty = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[non_empty]
+            sums[non_empty] = np.add.reduceat(sample[order], starts, axis=0)
+
+            centroids = sums / np.maximum(counts, 1)[:, None]
+            empty = np.flatnonzero(counts == 0)
+            centroids[empty] = sample[rng.choice(len(sample), len(empty))]
+            if self.metric == "cosine":
+                centroids = _normalize(centroids)
+
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = self._assign(self.vectors)
+        self._list_ids = None
+
+    def _assign(self, matrix: np.ndarray) -> np.ndarray:
+        assignments = np.empty(len(matrix), dtype=np.int32)
+        for start in range(0, len(matrix), _BLOCK_ROWS):
+            block = matrix[start : start + _BLOCK_ROWS]
+            assignments[start : start + len(block)] = np.argmax(block @ self._centroids.T, axis=1)
+        return assignments
+
+    def _build_lists(self):
+        if self._list_ids is not None:
+            return
+        self._list_ids = np.argsort(self._assignments, kind="stable")
+        counts = np.bincount(self._assignments, minlength=len(self._centroids))
+        self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def save(self, directory: str | os.PathLike):
+        """Saves the index as `.npy` files in `directory`, which can be memory-mapped by `load`."""
+        directory = pathlib.Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / _VECTORS_FILE, self.vectors)
+        if self._centroids is not None:
+            np.save(directory / _CENTROIDS_FILE, self._centroids)
+            np.save(directory / _ASSIGNMENTS_FILE, self._assignments)
+        metadata = {"metric": self.metric, "size": self._size, "ivf": self._centroids is not None}
+        (directory / _METADATA_FILE).write_text(json.dumps(metadata))
+
+    @classmethod
+    def load(cls, directory: str | os.PathLike, *, mmap: bool = True) -> VectorIndex:
+        """Loads an index written by `save`.
+
+        Args:
+            directory: The directory passed to `save`.
+            mmap: If True, the vectors are memory-mapped read-only instead of read into memory.
+                They're copied into memory if more vectors are added.
+        """
+        directory = pathlib.Path(directory)
+        metadata = json.loads((directory / _METADATA_FILE).read_text())
+        mmap_mode = "r" if mmap else None
+
+        index = cls(metric=metadata["metric"])
+        index._vectors = np.load(directory / _VECTORS_FILE, mmap_mode=mmap_mode)
+        index._size = metadata["size"]
+        if metadata["ivf"]:
+            index._centroids = np.load(directory / _CENTROIDS_FILE)
+            index._assignments = np.load(directory / _ASSIGNMENTS_FILE)
+        return index
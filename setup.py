@@ -53,7 +53,19 @@ dependencies = [
 ]
 
 extras_require = {
-    "dev": ["absl-py", "black", "nose2", "pandas", "pytype", "pyyaml", "Pillow", "ipython"],
+    # For `output="numpy"` in `embed_content`, and for `vector_index`.
+    "numpy": ["numpy"],
+    "dev": [
+        "absl-py",
+        "black",
+        "nose2",
+        "numpy",
+        "pandas",
+        "pytype",
+        "pyyaml",
+        "Pillow",
+        "ipython",
+    ],
 }
 
 url = "https://github.com/google/generative-ai-python"
@@ -96,5 +108,6 @@ setuptools.setup(
     install_requires=dependencies,
     extras_require=extras_require,
     include_package_data=True,
+    package_data={"google.generativeai": ["*.json"]},
     zip_safe=False,
 )
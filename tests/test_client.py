@@ -1,14 +1,34 @@
+import asyncio
 import os
+import pathlib
+import tempfile
+import threading
+import time
+from concurrent import futures
 from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
 
+import grpc
+import httplib2
+import googleapiclient.errors
+import googleapiclient.http
+
 from google.api_core import client_options
 import google.ai.generativelanguage as glm
 from google.generativeai import client
 
 
+def run_in_new_loop(coroutine):
+    # Unlike `asyncio.run`, this leaves the thread's current event loop in place.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
 class ClientTests(parameterized.TestCase):
     def setUp(self):
         super().setUp()
@@ -70,47 +90,289 @@ class ClientTests(parameterized.TestCase):
         actual_client_opts = client._client_manager.client_config["client_options"]
         self.assertEqual(actual_client_opts.api_key, "AIzA_env")
 
-    class DummyClient:
-        def __init__(self, *args, **kwargs):
-            pass
+    def _start_recording_server(self):
+        """Starts a local gRPC server that records the metadata of each call."""
+        received = []
 
-        def generate_text(self, metadata=None):
-            self.metadata = metadata
+        class RecordingHandler(grpc.GenericRpcHandler):
+            def service(self, handler_call_details):
+                received.append(dict(handler_call_details.invocation_metadata))
+                # An empty message is a valid serialization of any response.
+                return grpc.unary_unary_rpc_method_handler(lambda request, context: b"")
 
-        not_a_function = 7
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+        server.add_generic_rpc_handlers([RecordingHandler()])
+        port = server.add_insecure_port("localhost:0")
+        server.start()
+        self.addCleanup(server.stop, None)
+        return f"localhost:{port}", received
 
-        def _hidden(self):
-            self.called_hidden = True
+    def test_default_metadata(self):
+        address, received = self._start_recording_server()
+        client.configure(api_key="AIzA_key", default_metadata=[("hello", "world")])
+
+        def create_channel(*args, options=(), **kwargs):
+            return grpc.insecure_channel(address, options=options)
+
+        with mock.patch.object(
+            glm.GenerativeServiceClient.get_transport_class("grpc"),
+            "create_channel",
+            side_effect=create_channel,
+        ):
+            generative_client = client.get_default_generative_client()
+
+        generative_client.count_tokens(model="models/gemini-pro", contents=[])
+        generative_client.count_tokens(
+            model="models/gemini-pro", contents=[], metadata=[("per-call", "value")]
+        )
 
-        @staticmethod
-        def static():
-            pass
+        self.assertEqual("world", received[0]["hello"])
+        self.assertEqual("world", received[1]["hello"])
+        self.assertEqual("value", received[1]["per-call"])
 
-        @classmethod
-        def classm(cls):
-            cls.called_classm = True
+    def test_default_metadata_async(self):
+        address, received = self._start_recording_server()
+        client.configure(api_key="AIzA_key", default_metadata=[("hello", "world")])
 
-    @mock.patch.object(glm, "TextServiceClient", DummyClient)
-    def test_default_metadata(self):
-        # The metadata wrapper injects this argument.
-        metadata = [("hello", "world")]
-        client.configure(default_metadata=metadata)
+        def create_channel(*args, options=(), interceptors=None, **kwargs):
+            return grpc.aio.insecure_channel(address, options=options, interceptors=interceptors)
+
+        async def count_tokens():
+            with mock.patch.object(
+                glm.GenerativeServiceAsyncClient.get_transport_class("grpc_asyncio"),
+                "create_channel",
+                side_effect=create_channel,
+            ):
+                generative_client = client.get_default_generative_async_client()
+            await generative_client.count_tokens(model="models/gemini-pro", contents=[])
+
+        run_in_new_loop(count_tokens())
+
+        self.assertEqual("world", received[0]["hello"])
+
+    def test_default_metadata_rest(self):
+        client.configure(
+            api_key="AIzA_key", transport="rest", default_metadata=[("hello", "world")]
+        )
+
+        model_client = client.get_default_model_client()
+        operations_client = client.get_default_operations_client()
+
+        self.assertEqual("world", model_client._transport._session.headers["hello"])
+        self.assertEqual("world", operations_client._transport._session.headers["hello"])
+
+    @mock.patch.object(glm, "TextServiceClient")
+    def test_default_client_created_once_across_threads(self, mock_client_cls):
+        def slow_client(**kwargs):
+            time.sleep(0.05)
+            return mock.MagicMock()
+
+        mock_client_cls.side_effect = slow_client
+        client.configure(api_key="AIzA_key")
+
+        barrier = threading.Barrier(8)
+        results = []
+
+        def get_client():
+            barrier.wait()
+            results.append(client.get_default_text_client())
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, mock_client_cls.call_count)
+        self.assertLen({id(result) for result in results}, 1)
+
+    def test_async_clients_are_per_event_loop(self):
+        client.configure(api_key="AIzA_key")
+
+        async def get_clients():
+            return (
+                client.get_default_generative_async_client(),
+                client.get_default_generative_async_client(),
+            )
+
+        first_a, first_b = run_in_new_loop(get_clients())
+        second_a, second_b = run_in_new_loop(get_clients())
 
-        text_client = client.get_default_text_client()
-        text_client.generate_text()
+        self.assertIs(first_a, first_b)
+        self.assertIs(second_a, second_b)
+        self.assertIsNot(first_a, second_a)
+        # The first loop is closed, so its clients were dropped.
+        self.assertLen(client._client_manager.loop_clients, 1)
 
-        self.assertEqual(metadata, text_client.metadata)
+    def test_async_clients_outside_of_a_loop_are_cached(self):
+        client.configure(api_key="AIzA_key")
 
-        self.assertEqual(text_client.not_a_function, ClientTests.DummyClient.not_a_function)
+        first = client.get_default_generative_async_client()
+        second = client.get_default_generative_async_client()
 
-        # Since these don't have a metadata arg, they'll fail if the wrapper is applied.
-        text_client._hidden()
-        self.assertTrue(text_client.called_hidden)
+        self.assertIs(first, second)
 
-        text_client.static()
+    def test_async_client_override_used_on_every_loop(self):
+        override = mock.MagicMock()
+        client._client_manager.clients["generative_async"] = override
+
+        async def get_client():
+            return client.get_default_generative_async_client()
+
+        self.assertIs(override, run_in_new_loop(get_client()))
+        self.assertIs(override, run_in_new_loop(get_client()))
+
+    def test_channel_pool(self):
+        client.configure(api_key="AIzA_key", channel_pool_size=3)
+
+        clients = [client.get_default_generative_client() for _ in range(6)]
+
+        self.assertLen({id(c) for c in clients}, 3)
+        self.assertEqual(clients[:3], clients[3:])
+        self.assertLen({id(c._transport.grpc_channel) for c in clients}, 3)
+
+    def test_channel_pool_async(self):
+        client.configure(api_key="AIzA_key", channel_pool_size=2)
+
+        async def get_clients():
+            return [client.get_default_generative_async_client() for _ in range(4)]
+
+        clients = run_in_new_loop(get_clients())
+        self.assertLen({id(c) for c in clients}, 2)
+
+    def test_channel_pool_size_must_be_positive(self):
+        with self.assertRaisesRegex(ValueError, "channel_pool_size"):
+            client.configure(api_key="AIzA_key", channel_pool_size=0)
+
+    def _tempdir(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return tmp.name
+
+    def _make_file_client(self, **kwargs):
+        self.addCleanup(client._discovery_documents.clear)
+        client._discovery_documents.clear()
+        return client.FileServiceClient(client_options={"api_key": "AIzA_key"}, **kwargs)
+
+    def _upload(self, file_client):
+        path = pathlib.Path(self._tempdir()) / "data.txt"
+        path.write_text("data")
+        with mock.patch.object(
+            googleapiclient.http.HttpRequest,
+            "execute",
+            autospec=True,
+            return_value={"file": {"name": "files/abc"}},
+        ) as execute, mock.patch.object(file_client, "get_file") as get_file:
+            file_client.create_file(path, mime_type="text/plain", resumable=False)
+        get_file.assert_called_once_with({"name": "files/abc"})
+        return execute
+
+    def test_discovery_document_cached_on_disk(self):
+        cache_dir = self._tempdir()
+        document = client.BUNDLED_DISCOVERY_DOCUMENT.read_text()
+
+        with mock.patch.object(client, "_fetch_discovery_document", return_value=document) as fetch:
+            self._upload(self._make_file_client(discovery_cache_dir=cache_dir))
+            self._upload(self._make_file_client(discovery_cache_dir=cache_dir))
+
+        fetch.assert_called_once()
+        self.assertLen(os.listdir(cache_dir), 1)
+        self.assertIn(client.GENAI_API_VERSION, os.listdir(cache_dir)[0])
+
+    def test_discovery_document_fetched_once_per_process(self):
+        document = client.BUNDLED_DISCOVERY_DOCUMENT.read_text()
+
+        with mock.patch.object(client, "_fetch_discovery_document", return_value=document) as fetch:
+            file_client = self._make_file_client(discovery_cache_dir=None)
+            self._upload(file_client)
+            self._upload(client.FileServiceClient(client_options={"api_key": "AIzA_key"}))
+
+        fetch.assert_called_once()
+
+    def test_bundled_discovery_document(self):
+        with mock.patch.object(client, "_fetch_discovery_document") as fetch:
+            execute = self._upload(self._make_file_client(use_bundled_discovery=True))
+
+        fetch.assert_not_called()
+        request = execute.call_args.args[0]
+        self.assertStartsWith(
+            request.uri, "https://generativelanguage.googleapis.com/upload/v1beta/files?"
+        )
 
-        text_client.classm()
-        self.assertTrue(ClientTests.DummyClient.called_classm)
+    def test_bundled_discovery_document_when_fetch_fails(self):
+        with mock.patch.object(
+            client, "_fetch_discovery_document", side_effect=httplib2.HttpLib2Error("offline")
+        ):
+            self._upload(self._make_file_client(discovery_cache_dir=None))
+
+    def test_uploads_reuse_http(self):
+        file_client = self._make_file_client(use_bundled_discovery=True)
+
+        first = self._upload(file_client).call_args.kwargs["http"]
+        second = self._upload(file_client).call_args.kwargs["http"]
+        self.assertIs(first, second)
+
+        other_thread = []
+        thread = threading.Thread(target=lambda: other_thread.append(self._upload(file_client)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(first, other_thread[0].call_args.kwargs["http"])
+
+    def test_resumable_upload_resumes_after_errors(self):
+        file_client = self._make_file_client(use_bundled_discovery=True)
+        path = pathlib.Path(self._tempdir()) / "data.txt"
+        path.write_bytes(b"x" * 100)
+
+        progress = googleapiclient.http.MediaUploadProgress
+        responses = [
+            (progress(40, 100), None),
+            ConnectionResetError("reset"),
+            googleapiclient.errors.HttpError(httplib2.Response({"status": 503}), b""),
+            (progress(80, 100), None),
+            (None, {"file": {"name": "files/abc"}}),
+        ]
+
+        def next_chunk(request, http=None, num_retries=0):
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        calls = []
+        with mock.patch.object(
+            googleapiclient.http.HttpRequest, "next_chunk", autospec=True, side_effect=next_chunk
+        ), mock.patch.object(file_client, "get_file"), mock.patch("time.sleep") as sleep:
+            file_client.create_file(
+                path,
+                mime_type="text/plain",
+                chunk_size=256 * 1024,
+                progress=lambda *args: calls.append(args),
+            )
+
+        self.assertEqual([(40, 100), (80, 100), (100, 100)], calls)
+        self.assertEqual(2, sleep.call_count)
+
+    def test_resumable_upload_gives_up(self):
+        file_client = self._make_file_client(use_bundled_discovery=True)
+        path = pathlib.Path(self._tempdir()) / "data.txt"
+        path.write_bytes(b"x" * 100)
+
+        with mock.patch.object(
+            googleapiclient.http.HttpRequest,
+            "next_chunk",
+            autospec=True,
+            side_effect=googleapiclient.errors.HttpError(httplib2.Response({"status": 400}), b""),
+        ) as next_chunk, mock.patch("time.sleep"):
+            with self.assertRaises(googleapiclient.errors.HttpError):
+                file_client.create_file(path, mime_type="text/plain")
+
+        # Client errors aren't retried.
+        next_chunk.assert_called_once()
+
+    def test_upload_chunk_size_must_be_aligned(self):
+        file_client = self._make_file_client(use_bundled_discovery=True)
+        with self.assertRaisesRegex(ValueError, "chunk_size"):
+            file_client.create_file("data.txt", chunk_size=1000)
 
     def test_same_config(self):
         cm1 = client._ClientManager()
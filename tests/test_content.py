@@ -191,6 +191,19 @@ class UnitTests(parameterized.TestCase):
         self.assertIsInstance(part, glm.Part)
         self.assertEqual(part.text, "Hello world!")
 
+    def test_to_contents_reuses_converted_contents(self):
+        history = [
+            glm.Content(role="user", parts=[{"text": "Hello"}]),
+            glm.Content(role="model", parts=[{"text": "Hi!"}]),
+        ]
+        contents = content_types.to_contents(history)
+
+        # A new list, holding the same objects.
+        self.assertIsNot(history, contents)
+        self.assertLen(contents, 2)
+        for original, converted in zip(history, contents):
+            self.assertIs(original, converted)
+
     def test_dict_to_content_fails(self):
         with self.assertRaises(KeyError):
             content_types.to_content({"bad": "dict"})
@@ -19,8 +19,11 @@ import unittest
 import unittest.mock as mock
 
 import google.ai.generativelanguage as glm
+import google.api_core.exceptions
+import numpy as np
 
 from google.generativeai import embedding
+from google.generativeai import embedding_cache
 
 from google.generativeai import client
 from absl.testing import absltest
@@ -104,6 +107,202 @@ class UnitTests(parameterized.TestCase):
             math.ceil(len(texts) / embedding.EMBEDDING_MAX_BATCH_SIZE),
         )
 
+    def test_batch_embed_contents_concurrently(self):
+        def batch_embed_contents(request, **kwargs):
+            self.observed_requests.append(request)
+            if request.requests[0].content.parts[0].text == "bad":
+                raise ValueError("bad batch")
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[
+                    glm.ContentEmbedding(values=[float(r.content.parts[0].text)])
+                    for r in request.requests
+                ]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        texts = [str(i) for i in range(250)]
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=3)
+        self.assertEqual(emb["embedding"], [[float(i)] for i in range(250)])
+        self.assertLen(self.observed_requests, 3)
+
+        texts[100] = "bad"
+        with self.assertRaises(embedding.BatchEmbeddingError) as cm:
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=3)
+        self.assertEqual(cm.exception.failed_indices, list(range(100, 200)))
+        self.assertLen(cm.exception.errors, 1)
+        self.assertEqual(cm.exception.embedding[:100], [[float(i)] for i in range(100)])
+        self.assertEqual(cm.exception.embedding[100:200], [None] * 100)
+
+        with self.assertRaises(ValueError):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=0)
+
+    def test_embed_content_numpy_not_installed(self):
+        with mock.patch.object(embedding, "np", None):
+            with self.assertRaisesRegex(ImportError, r"google-generativeai\[numpy\]"):
+                embedding.embed_content(model=DEFAULT_EMB_MODEL, content="hello", output="numpy")
+
+    def test_embed_content_numpy(self):
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content="hello", output="numpy")
+        self.assertEqual(emb["embedding"].dtype, np.float32)
+        np.testing.assert_array_equal(emb["embedding"], [1, 2, 3])
+
+        texts = ["What are you?"] * 150
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, output="numpy")
+        self.assertEqual(emb["embedding"].shape, (150, 3))
+        self.assertEqual(emb["embedding"].dtype, np.float32)
+        np.testing.assert_array_equal(emb["embedding"][-1], [1, 2, 3])
+
+        out = np.zeros((150, 3), dtype=np.float32)
+        emb = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=texts, output="numpy", out=out
+        )
+        self.assertIs(emb["embedding"], out)
+        np.testing.assert_array_equal(out[0], [1, 2, 3])
+
+        with self.assertRaises(ValueError):
+            embedding.embed_content(
+                model=DEFAULT_EMB_MODEL, content=texts, output="numpy", out=out[:10]
+            )
+        with self.assertRaises(ValueError):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, out=out)
+
+    def test_batch_embed_contents_cache(self):
+        cache = embedding_cache.EmbeddingCache()
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a", "b"], cache=cache)
+        self.assertLen(self.observed_requests[-1].requests, 2)
+
+        self.observed_requests.clear()
+        emb2 = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=["a", "c", "b"], cache=cache
+        )
+        self.assertLen(self.observed_requests, 1)
+        self.assertEqual(
+            [r.content.parts[0].text for r in self.observed_requests[0].requests], ["c"]
+        )
+        self.assertEqual(emb2["embedding"], [emb["embedding"][0]] * 3)
+        self.assertEqual(cache.hits, 2)
+
+        self.observed_requests.clear()
+        emb3 = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=["a", "b", "c"], cache=cache, output="numpy"
+        )
+        self.assertEmpty(self.observed_requests)
+        self.assertEqual(emb3["embedding"].shape, (3, 3))
+
+    def test_batch_embed_contents_deduplicate(self):
+        embedding.deduplication_stats.reset()
+        texts = ["a", "b", "a", "c", "b", "a"]
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, deduplicate=True)
+
+        self.assertLen(self.observed_requests, 1)
+        self.assertEqual(
+            [r.content.parts[0].text for r in self.observed_requests[0].requests], ["a", "b", "c"]
+        )
+        self.assertLen(emb["embedding"], 6)
+        self.assertIsNot(emb["embedding"][0], emb["embedding"][2])
+        self.assertEqual(embedding.deduplication_stats.inputs, 6)
+        self.assertEqual(embedding.deduplication_stats.duplicates, 3)
+
+        emb = embedding.embed_content(
+            model=DEFAULT_EMB_MODEL, content=texts, deduplicate=True, output="numpy"
+        )
+        self.assertEqual(emb["embedding"].shape, (6, 3))
+
+    def test_batch_embed_contents_batcher_packs_by_size(self):
+        batcher = embedding.EmbeddingBatcher(max_batch_bytes=1000)
+        texts = ["short"] * 10 + ["long" * 100] * 4
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, batcher=batcher)
+
+        self.assertLen(emb["embedding"], len(texts))
+        self.assertEqual([count for count, _ in batcher.shapes], [11, 2, 1])
+        self.assertTrue(all(size <= 1000 for _, size in batcher.shapes))
+
+    def test_batch_embed_contents_splits_too_large_batches(self):
+        def batch_embed_contents(request, **kwargs):
+            self.observed_requests.append(request)
+            if len(request.requests) > 30:
+                raise google.api_core.exceptions.InvalidArgument(
+                    "Request payload size exceeds the limit"
+                )
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[
+                    glm.ContentEmbedding(values=[float(r.content.parts[0].text)])
+                    for r in request.requests
+                ]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        batcher = embedding.EmbeddingBatcher()
+        texts = [str(i) for i in range(100)]
+        emb = embedding.embed_content(model=DEFAULT_EMB_MODEL, content=texts, batcher=batcher)
+
+        self.assertEqual(emb["embedding"], [[float(i)] for i in range(100)])
+        self.assertEqual([count for count, _ in batcher.shapes], [25, 25, 25, 25])
+        self.assertEqual(batcher.splits, 3)
+
+    @parameterized.named_parameters(
+        dict(testcase_name="model", message="Invalid model."),
+        dict(
+            testcase_name="mentions_a_limit",
+            message="Invalid task type: the value is outside the limit of supported types.",
+        ),
+        dict(testcase_name="token_count", message="The input token count exceeds the maximum."),
+    )
+    def test_batch_embed_contents_other_errors_are_not_split(self, message):
+        self.client.batch_embed_contents = mock.Mock(
+            side_effect=google.api_core.exceptions.InvalidArgument(message)
+        )
+        with self.assertRaises(google.api_core.exceptions.InvalidArgument):
+            embedding.embed_content(model=DEFAULT_EMB_MODEL, content=["a", "b", "c", "d"])
+        self.assertEqual(self.client.batch_embed_contents.call_count, 1)
+
+    def test_embed_content_iter(self):
+        def batch_embed_contents(request, **kwargs):
+            self.observed_requests.append(request)
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[
+                    glm.ContentEmbedding(values=[float(r.content.parts[0].text)])
+                    for r in request.requests
+                ]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        consumed = []
+
+        def texts():
+            for i in range(250):
+                consumed.append(i)
+                yield str(i)
+
+        for max_concurrency in [1, 2]:
+            consumed.clear()
+            self.observed_requests.clear()
+            results = []
+            for index, embeddings in embedding.embed_content_iter(
+                model=DEFAULT_EMB_MODEL, content=texts(), max_concurrency=max_concurrency
+            ):
+                if not results:
+                    # The input is consumed lazily.
+                    self.assertLess(len(consumed), 250)
+                results.append((index, embeddings))
+
+            self.assertEqual([index for index, _ in results], [0, 100, 200])
+            self.assertEqual(
+                [v for _, embeddings in results for v in embeddings],
+                [[float(i)] for i in range(250)],
+            )
+
+    def test_embed_content_iter_error(self):
+        self.client.batch_embed_contents = mock.Mock(side_effect=ValueError("bad batch"))
+
+        with self.assertRaises(embedding.BatchEmbeddingError) as cm:
+            for _ in embedding.embed_content_iter(model=DEFAULT_EMB_MODEL, content=["a", "b"]):
+                pass
+        self.assertEqual(cm.exception.failed_indices, [0, 1])
+
     def test_embed_content_title_and_task_1(self):
         text = "What are you?"
         emb = embedding.embed_content(
@@ -103,6 +103,89 @@ class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
             math.ceil(len(texts) / embedding.EMBEDDING_MAX_BATCH_SIZE),
         )
 
+    async def test_batch_embed_contents_concurrently(self):
+        async def batch_embed_contents(request, **kwargs):
+            self.observed_requests.append(request)
+            if request.requests[0].content.parts[0].text == "bad":
+                raise ValueError("bad batch")
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[
+                    glm.ContentEmbedding(values=[float(r.content.parts[0].text)])
+                    for r in request.requests
+                ]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        texts = [str(i) for i in range(250)]
+        emb = await embedding.embed_content_async(
+            model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=3
+        )
+        self.assertEqual(emb["embedding"], [[float(i)] for i in range(250)])
+        self.assertLen(self.observed_requests, 3)
+
+        texts[100] = "bad"
+        with self.assertRaises(embedding.BatchEmbeddingError) as cm:
+            await embedding.embed_content_async(
+                model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=3
+            )
+        self.assertEqual(cm.exception.failed_indices, list(range(100, 200)))
+        self.assertLen(cm.exception.errors, 1)
+        self.assertEqual(cm.exception.embedding[:100], [[float(i)] for i in range(100)])
+        self.assertEqual(cm.exception.embedding[100:200], [None] * 100)
+
+        with self.assertRaises(ValueError):
+            await embedding.embed_content_async(
+                model=DEFAULT_EMB_MODEL, content=texts, max_concurrency=0
+            )
+
+    async def test_embed_content_iter(self):
+        async def batch_embed_contents(request, **kwargs):
+            self.observed_requests.append(request)
+            return glm.BatchEmbedContentsResponse(
+                embeddings=[
+                    glm.ContentEmbedding(values=[float(r.content.parts[0].text)])
+                    for r in request.requests
+                ]
+            )
+
+        self.client.batch_embed_contents = batch_embed_contents
+
+        consumed = []
+
+        def texts():
+            for i in range(250):
+                consumed.append(i)
+                yield str(i)
+
+        for max_concurrency in [1, 2]:
+            consumed.clear()
+            self.observed_requests.clear()
+            results = []
+            async for index, embeddings in embedding.embed_content_aiter(
+                model=DEFAULT_EMB_MODEL, content=texts(), max_concurrency=max_concurrency
+            ):
+                if not results:
+                    # The input is consumed lazily.
+                    self.assertLess(len(consumed), 250)
+                results.append((index, embeddings))
+
+            self.assertEqual([index for index, _ in results], [0, 100, 200])
+            self.assertEqual(
+                [v for _, embeddings in results for v in embeddings],
+                [[float(i)] for i in range(250)],
+            )
+
+    async def test_embed_content_iter_error(self):
+        self.client.batch_embed_contents = mock.Mock(side_effect=ValueError("bad batch"))
+
+        with self.assertRaises(embedding.BatchEmbeddingError) as cm:
+            async for _ in embedding.embed_content_aiter(
+                model=DEFAULT_EMB_MODEL, content=["a", "b"]
+            ):
+                pass
+        self.assertEqual(cm.exception.failed_indices, [0, 1])
+
     async def test_embed_content_async_title_and_task_1(self):
         text = "What are you?"
         emb = await embedding.embed_content_async(
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+
+import google.ai.generativelanguage as glm
+
+from google.generativeai import embedding_cache
+from absl.testing import absltest
+
+
+def embed_request(text, **kwargs):
+    return glm.EmbedContentRequest(
+        model="models/embedding-001", content={"parts": [{"text": text}]}, **kwargs
+    )
+
+
+def stored_size(cache):
+    return cache._connection.execute("SELECT size FROM stats").fetchone()[0]
+
+
+class UnitTests(absltest.TestCase):
+    def test_key(self):
+        key = embedding_cache.EmbeddingCache.key
+        self.assertEqual(key(embed_request("a")), key(embed_request("a")))
+        self.assertNotEqual(key(embed_request("a")), key(embed_request("b")))
+        self.assertNotEqual(
+            key(embed_request("a")), key(embed_request("a", output_dimensionality=8))
+        )
+        self.assertNotEqual(
+            key(embed_request("a")),
+            key(embed_request("a", task_type=glm.TaskType.RETRIEVAL_QUERY)),
+        )
+
+    def test_get_and_put(self):
+        cache = embedding_cache.EmbeddingCache()
+        cache.put_many([("a", [1.0, 2.0]), ("b", [0.5, 0.25])])
+
+        self.assertEqual(cache.get_many(["b", "c", "a"]), [[0.5, 0.25], None, [1.0, 2.0]])
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(cache.misses, 1)
+        self.assertLen(cache, 2)
+
+        cache.clear()
+        self.assertEmpty(cache)
+
+    def test_eviction(self):
+        # Each vector takes 8 bytes.
+        cache = embedding_cache.EmbeddingCache(max_size_bytes=20)
+        cache.put_many([("a", [1.0, 1.0]), ("b", [2.0, 2.0])])
+        # Using "a" makes "b" the least recently used.
+        cache.get_many(["a"])
+        cache.put_many([("c", [3.0, 3.0])])
+
+        self.assertEqual(cache.get_many(["a", "b", "c"]), [[1.0, 1.0], None, [3.0, 3.0]])
+
+    def test_vectors_are_float32(self):
+        cache = embedding_cache.EmbeddingCache()
+        cache.put_many([("a", [0.1, 0.2])])
+
+        (vector,) = cache.get_many(["a"])
+        self.assertSequenceAlmostEqual(vector, [0.1, 0.2], places=6)
+        self.assertEqual(8, stored_size(cache))
+
+    def test_size_is_tracked(self):
+        cache = embedding_cache.EmbeddingCache(max_size_bytes=None)
+        cache.put_many([("a", [1.0, 1.0]), ("b", [2.0, 2.0, 2.0])])
+        self.assertEqual(20, stored_size(cache))
+        # Replacing a vector counts its new size only.
+        cache.put_many([("a", [1.0])])
+        self.assertEqual(16, stored_size(cache))
+        cache.clear()
+        self.assertEqual(0, stored_size(cache))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            with embedding_cache.EmbeddingCache(path) as cache:
+                cache.put_many([("a", [1.0, 2.0])])
+
+            with embedding_cache.EmbeddingCache(path) as cache:
+                self.assertEqual(cache.get_many(["a"]), [[1.0, 2.0]])
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -16,8 +16,13 @@
 from google.generativeai.types import file_types
 
 import collections
+import concurrent.futures
 import datetime
+import hashlib
 import os
+import tempfile
+import threading
+import time
 from typing import Iterable, Union
 import pathlib
 
@@ -26,7 +31,9 @@ import google.ai.generativelanguage as glm
 
 import google.generativeai as genai
 from google.generativeai import client as client_lib
+from google.generativeai import files as files_lib
 from absl.testing import parameterized
+from unittest import mock
 
 
 class FileServiceClient(client_lib.FileServiceClient):
@@ -34,6 +41,7 @@ class FileServiceClient(client_lib.FileServiceClient):
         self.test = test
         self.observed_requests = []
         self.responses = collections.defaultdict(list)
+        self.lock = threading.Lock()
 
     def create_file(
         self,
@@ -43,6 +51,8 @@ class FileServiceClient(client_lib.FileServiceClient):
         name: Union[str, None] = None,
         display_name: Union[str, None] = None,
         resumable: bool = True,
+        chunk_size: int = client_lib.DEFAULT_UPLOAD_CHUNK_SIZE,
+        progress=None,
     ) -> glm.File:
         self.observed_requests.append(
             dict(
@@ -51,16 +61,27 @@ class FileServiceClient(client_lib.FileServiceClient):
                 name=name,
                 display_name=display_name,
                 resumable=resumable,
+                chunk_size=chunk_size,
             )
         )
-        return self.responses["create_file"].pop(0)
+        with self.lock:
+            response = self.responses["create_file"].pop(0)
+        if isinstance(response, Exception):
+            raise response
+        if progress is not None:
+            size = os.path.getsize(path)
+            progress(size // 2, size)
+            progress(size, size)
+        return response
 
     def get_file(
         self,
-        request: glm.GetFileRequest,
+        request: Union[glm.GetFileRequest, None] = None,
+        *,
+        name: Union[str, None] = None,
         **kwargs,
     ) -> glm.File:
-        self.observed_requests.append(request)
+        self.observed_requests.append(request or glm.GetFileRequest(name=name))
         return self.responses["get_file"].pop(0)
 
     def list_files(
@@ -87,6 +108,10 @@ class UnitTests(parameterized.TestCase):
 
         client_lib._client_manager.clients["file"] = self.client
 
+        patcher = mock.patch.object(files_lib, "_upload_index", files_lib._UploadIndex())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     @property
     def observed_requests(self):
         return self.client.observed_requests
@@ -111,6 +136,238 @@ class UnitTests(parameterized.TestCase):
             glm.VideoMetadata(dict(video_duration=datetime.timedelta(seconds=30))), f.video_metadata
         )
 
+    def _write_files(self, sizes):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        paths = []
+        for i, size in enumerate(sizes):
+            path = pathlib.Path(tmp.name) / f"file_{i}.txt"
+            path.write_bytes(b"x" * size)
+            paths.append(path)
+        return paths
+
+    def test_upload_file_progress(self):
+        (path,) = self._write_files([100])
+        self.responses["create_file"].append(glm.File(name="files/a"))
+
+        calls = []
+        genai.upload_file(path, chunk_size=512 * 1024, progress=lambda *args: calls.append(args))
+
+        self.assertEqual([(50, 100), (100, 100)], calls)
+        self.assertEqual(512 * 1024, self.observed_requests[0]["chunk_size"])
+        self.assertEqual("file_0.txt", self.observed_requests[0]["display_name"])
+        self.assertEqual("text/plain", self.observed_requests[0]["mime_type"])
+
+    def test_upload_files(self):
+        paths = self._write_files([10, 20, 30])
+        self.responses["create_file"].extend(
+            [glm.File(name="files/a"), ValueError("failed"), glm.File(name="files/c")]
+        )
+
+        calls = []
+        # One worker, so the uploads happen in order and consume the responses in order.
+        results = genai.upload_files(
+            paths, max_concurrency=1, progress=lambda *args: calls.append(args)
+        )
+
+        self.assertEqual("files/a", results[0].name)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual("files/c", results[2].name)
+        self.assertEqual([str(p) for p in paths], [str(r["path"]) for r in self.observed_requests])
+        # The progress is summed over all the files.
+        self.assertEqual((5, 60), calls[0])
+        self.assertEqual((40, 60), calls[-1])
+
+    def test_upload_files_concurrently(self):
+        paths = self._write_files([10] * 20)
+        self.responses["create_file"].extend(glm.File(name=f"files/{i}") for i in range(20))
+
+        with mock.patch("tqdm.auto.tqdm") as bar:
+            results = genai.upload_files(paths, max_concurrency=4, progress=True)
+
+        self.assertLen(results, 20)
+        self.assertTrue(all(isinstance(r, file_types.File) for r in results))
+        bar.return_value.close.assert_called_once()
+
+    @parameterized.named_parameters(
+        dict(testcase_name="raw_digest", encode=lambda digest: digest),
+        dict(testcase_name="hex_digest", encode=lambda digest: digest.hex().encode()),
+    )
+    def test_upload_file_deduplicate(self, encode):
+        (path,) = self._write_files([100])
+        digest = hashlib.sha256(b"x" * 100).digest()
+        other = hashlib.sha256(b"y").digest()
+        self.responses["list_files"].append(
+            [
+                glm.File(
+                    name="files/other", sha256_hash=other, mime_type="text/plain", state="ACTIVE"
+                ),
+                glm.File(
+                    name="files/pdf",
+                    sha256_hash=digest,
+                    mime_type="application/pdf",
+                    state="ACTIVE",
+                ),
+                glm.File(
+                    name="files/processing",
+                    sha256_hash=digest,
+                    mime_type="text/plain",
+                    state="PROCESSING",
+                ),
+                glm.File(
+                    name="files/same",
+                    sha256_hash=encode(digest),
+                    mime_type="text/plain",
+                    state="ACTIVE",
+                ),
+            ]
+        )
+
+        calls = []
+        f = genai.upload_file(path, deduplicate=True, progress=lambda *args: calls.append(args))
+
+        self.assertEqual("files/same", f.name)
+        self.assertEqual([(100, 100)], calls)
+        # Only the listing, nothing was uploaded.
+        self.assertLen(self.observed_requests, 1)
+        self.assertIsInstance(self.observed_requests[0], glm.ListFilesRequest)
+
+    def test_upload_file_deduplicate_miss(self):
+        paths = self._write_files([0, 10])
+        self.responses["list_files"].append([])
+        self.responses["create_file"].extend(
+            [
+                glm.File(name="files/empty", mime_type="text/plain", state="ACTIVE"),
+                glm.File(name="files/b", mime_type="text/plain", state="ACTIVE"),
+            ]
+        )
+
+        results = genai.upload_files(paths, max_concurrency=1, deduplicate=True)
+        self.assertEqual(["files/empty", "files/b"], [f.name for f in results])
+
+        # The uploads were added to the index, so uploading them again is a no-op, without
+        # listing the files again.
+        results = genai.upload_files(paths, max_concurrency=1, deduplicate=True)
+        self.assertEqual(["files/empty", "files/b"], [f.name for f in results])
+        self.assertLen(self.observed_requests, 3)
+
+        # A deleted file is dropped from the index.
+        genai.delete_file("files/b")
+        self.responses["create_file"].append(glm.File(name="files/b2"))
+        self.assertEqual("files/b2", genai.upload_file(paths[1], deduplicate=True).name)
+
+    def test_upload_file_deduplicate_expired(self):
+        (path,) = self._write_files([10])
+        self.responses["list_files"].append(
+            [
+                glm.File(
+                    name="files/expired",
+                    sha256_hash=hashlib.sha256(b"x" * 10).digest(),
+                    mime_type="text/plain",
+                    state="ACTIVE",
+                    expiration_time=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc),
+                )
+            ]
+        )
+        self.responses["create_file"].append(glm.File(name="files/new"))
+
+        self.assertEqual("files/new", genai.upload_file(path, deduplicate=True).name)
+
+    def test_upload_index_is_scoped_to_the_configuration(self):
+        (path,) = self._write_files([10])
+        self.responses["list_files"].extend([[], []])
+        self.responses["create_file"].extend(
+            [
+                glm.File(name="files/a", mime_type="text/plain", state="ACTIVE"),
+                glm.File(name="files/b", mime_type="text/plain", state="ACTIVE"),
+            ]
+        )
+        self.assertEqual("files/a", genai.upload_file(path, deduplicate=True).name)
+
+        # Another API key may belong to another project, so its files are listed again.
+        with mock.patch.object(client_lib._client_manager, "config_version", -1):
+            self.assertEqual("files/b", genai.upload_file(path, deduplicate=True).name)
+        list_requests = [r for r in self.observed_requests if isinstance(r, glm.ListFilesRequest)]
+        self.assertLen(list_requests, 2)
+
+    def test_upload_index_refreshes_once(self):
+        listing = threading.Event()
+        calls = []
+
+        def list_files():
+            calls.append(None)
+            listing.wait(timeout=5)
+            return []
+
+        index = files_lib._UploadIndex()
+        with mock.patch.object(files_lib, "list_files", list_files):
+            with concurrent.futures.ThreadPoolExecutor(8) as executor:
+                futures = [executor.submit(index.lookup, b"x", "text/plain") for _ in range(8)]
+                # Give every thread the chance to find the index stale.
+                time.sleep(0.1)
+                listing.set()
+                self.assertEqual([None] * 8, [f.result() for f in futures])
+
+        self.assertLen(calls, 1)
+
+    def test_wait_for_files(self):
+        self.responses["get_file"].extend(
+            [
+                glm.File(name="files/a", state="PROCESSING"),
+                glm.File(name="files/a", state="ACTIVE"),
+            ]
+        )
+        files = [
+            glm.File(name="files/done", state="ACTIVE"),
+            file_types.File(glm.File(name="files/a", state="PROCESSING")),
+        ]
+
+        with mock.patch("time.sleep") as sleep:
+            results = list(genai.wait_for_files(files, poll_interval=1, max_poll_interval=1.5))
+
+        self.assertEqual(["files/done", "files/a"], [f.name for f in results])
+        self.assertEqual(glm.File.State.ACTIVE, results[1].state)
+        self.assertLen(self.observed_requests, 2)
+        # Backoff, with jitter, up to the maximum interval.
+        first, second = [call.args[0] for call in sleep.call_args_list]
+        self.assertBetween(first, 0.5, 1)
+        self.assertBetween(second, 0.75, 1.5)
+
+    def test_wait_for_many_files_lists_them(self):
+        names = [f"files/{i}" for i in range(12)]
+        self.responses["list_files"].append(
+            [glm.File(name="files/unrelated", state="PROCESSING")]
+            + [glm.File(name=name, state="ACTIVE") for name in names[:-1]]
+        )
+        # Missing from the listing, so fetched on its own.
+        self.responses["get_file"].append(glm.File(name=names[-1], state="FAILED"))
+
+        with mock.patch("time.sleep"):
+            results = list(genai.wait_for_files(names))
+
+        self.assertEqual(names, [f.name for f in results])
+        self.assertEqual(glm.File.State.FAILED, results[-1].state)
+        self.assertIsInstance(self.observed_requests[0], glm.ListFilesRequest)
+        self.assertLen(self.observed_requests, 2)
+
+    def test_wait_for_files_timeout(self):
+        self.responses["get_file"].append(glm.File(name="files/a", state="PROCESSING"))
+
+        with mock.patch("time.sleep"), mock.patch("time.monotonic", side_effect=[0, 0, 5]):
+            with self.assertRaisesRegex(TimeoutError, "files/a"):
+                list(genai.wait_for_files(["files/a"], timeout=1))
+
+    def test_wait_for_files_rejects_exceptions(self):
+        # `upload_files` returns the exceptions of the failed uploads.
+        results = ["files/a", OSError("upload failed")]
+        with self.assertRaisesRegex(TypeError, "OSError"):
+            list(genai.wait_for_files(results))
+        self.assertEmpty(self.observed_requests)
+
+    def test_upload_files_invalid_concurrency(self):
+        with self.assertRaisesRegex(ValueError, "max_concurrency"):
+            genai.upload_files([], max_concurrency=0)
+
     @parameterized.named_parameters(
         [
             dict(
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import httplib2
+import googleapiclient.errors
+import googleapiclient.http
+
+import google.ai.generativelanguage as glm
+
+import google.generativeai as genai
+from google.generativeai import client as client_lib
+from absl.testing import absltest
+from absl.testing import parameterized
+
+
+class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = self.make_client()
+        client_lib._client_manager.clients["file_async"] = self.client
+        self.addCleanup(client_lib._client_manager.clients.pop, "file_async", None)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = pathlib.Path(tmp.name) / "data.txt"
+        self.path.write_bytes(b"x" * 100)
+
+        patcher = mock.patch("time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_client(self, **kwargs):
+        client = client_lib.FileServiceAsyncClient(
+            client_options={"api_key": "AIzA_key"}, use_bundled_discovery=True, **kwargs
+        )
+        client.get_file = mock.AsyncMock(return_value=glm.File(name="files/abc"))
+        return client
+
+    def patch_next_chunk(self, responses):
+        threads = []
+
+        def next_chunk(request, http=None, num_retries=0):
+            threads.append(threading.current_thread())
+            response = responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        patcher = mock.patch.object(
+            googleapiclient.http.HttpRequest, "next_chunk", autospec=True, side_effect=next_chunk
+        )
+        next_chunk_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        return next_chunk_mock, threads
+
+    async def test_upload_file_async(self):
+        progress = googleapiclient.http.MediaUploadProgress
+        next_chunk, threads = self.patch_next_chunk(
+            [(progress(40, 100), None), (None, {"file": {"name": "files/abc"}})]
+        )
+
+        calls = []
+        f = await genai.upload_file_async(
+            self.path, chunk_size=256 * 1024, progress=lambda *args: calls.append(args)
+        )
+
+        self.assertEqual("files/abc", f.name)
+        self.client.get_file.assert_awaited_once_with({"name": "files/abc"})
+        self.assertEqual([(40, 100), (100, 100)], calls)
+        request = next_chunk.call_args.args[0]
+        self.assertStartsWith(
+            request.uri, "https://generativelanguage.googleapis.com/upload/v1beta/files?"
+        )
+        self.assertIn("key=AIzA_key", request.uri)
+        self.assertEqual({"file": {"displayName": "data.txt"}}, json.loads(request.body))
+        # The upload ran in a worker thread, not on the event loop.
+        self.assertNotIn(threading.current_thread(), threads)
+
+    async def test_upload_file_async_not_resumable(self):
+        with mock.patch.object(
+            googleapiclient.http.HttpRequest,
+            "execute",
+            autospec=True,
+            return_value={"file": {"name": "files/abc"}},
+        ) as execute:
+            f = await genai.upload_file_async(self.path, resumable=False)
+
+        self.assertEqual("files/abc", f.name)
+        execute.assert_called_once()
+
+    async def test_upload_retries_errors(self):
+        progress = googleapiclient.http.MediaUploadProgress
+        self.patch_next_chunk(
+            [
+                # The request starting the upload fails.
+                googleapiclient.errors.HttpError(httplib2.Response({"status": 503}), b""),
+                (progress(40, 100), None),
+                ConnectionResetError("reset"),
+                (None, {"file": {"name": "files/abc"}}),
+            ]
+        )
+
+        f = await genai.upload_file_async(self.path)
+
+        self.assertEqual("files/abc", f.name)
+        self.assertEqual(2, self.sleep.call_count)
+
+    async def test_upload_client_error_not_retried(self):
+        next_chunk, _ = self.patch_next_chunk(
+            [googleapiclient.errors.HttpError(httplib2.Response({"status": 400}), b"")]
+        )
+
+        with self.assertRaises(googleapiclient.errors.HttpError):
+            await genai.upload_file_async(self.path)
+        next_chunk.assert_called_once()
+        self.client.get_file.assert_not_awaited()
+
+    async def test_upload_chunk_size_must_be_aligned(self):
+        with self.assertRaisesRegex(ValueError, "chunk_size"):
+            await self.client.create_file(self.path, chunk_size=1000)
+
+    async def test_upload_sends_default_metadata(self):
+        client = self.make_client(default_metadata=[("x-goog-user-project", "p")])
+        next_chunk, _ = self.patch_next_chunk([(None, {"file": {"name": "files/abc"}})])
+
+        await client.create_file(self.path, mime_type="text/plain")
+
+        request = next_chunk.call_args.args[0]
+        self.assertEqual("p", request.headers["x-goog-user-project"])
+
+    async def test_upload_timeout(self):
+        client = self.make_client(upload_timeout=5)
+        self.assertEqual(5, client._uploader._http().timeout)
+
+    @parameterized.parameters("file", "file_async")
+    def test_make_client_passes_default_metadata(self, name):
+        manager = client_lib._ClientManager()
+        manager.configure(api_key="AIzA_key", default_metadata=[("x-goog-user-project", "p")])
+        client = manager.make_client(name)
+        self.assertEqual({"x-goog-user-project": "p"}, client._uploader._default_metadata)
+
+    async def test_get_list_delete_async(self):
+        file_client = mock.AsyncMock()
+        client_lib._client_manager.clients["file_async"] = file_client
+
+        file_client.get_file.return_value = glm.File(name="files/a")
+        f = await genai.get_file_async("files/a")
+        self.assertEqual("files/a", f.name)
+
+        async def pager():
+            for name in ["files/a", "files/b"]:
+                yield glm.File(name=name)
+
+        file_client.list_files.return_value = pager()
+        names = [f.name async for f in genai.list_files_async(page_size=2)]
+        self.assertEqual(["files/a", "files/b"], names)
+        self.assertEqual(2, file_client.list_files.call_args.args[0].page_size)
+
+        await genai.delete_file_async(f)
+        self.assertEqual("files/a", file_client.delete_file.call_args.kwargs["request"].name)
+
+    async def test_wait_for_files_async(self):
+        file_client = mock.AsyncMock()
+        client_lib._client_manager.clients["file_async"] = file_client
+        states = {"files/a": ["PROCESSING", "ACTIVE"], "files/b": ["FAILED"]}
+
+        async def get_file(name):
+            return glm.File(name=name, state=states[name].pop(0))
+
+        file_client.get_file.side_effect = get_file
+
+        with mock.patch("asyncio.sleep"):
+            results = [
+                f async for f in genai.wait_for_files_async(["files/a", "files/b"], timeout=60)
+            ]
+
+        self.assertEqual(["files/b", "files/a"], [f.name for f in results])
+
+
+if __name__ == "__main__":
+    absltest.main()
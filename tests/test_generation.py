@@ -496,6 +496,51 @@ class UnitTests(parameterized.TestCase):
 
         self.assertEqual(response.candidates[0].content.parts[0].text, "abcd")
 
+    def test_generate_content_response_long_stream(self):
+        # Accumulation is incremental, so a long stream stays linear in the number of chunks.
+        n = 10_000
+
+        def fake_stream():
+            for i in range(n):
+                yield glm.GenerateContentResponse(
+                    {
+                        "candidates": [
+                            {
+                                "content": {"parts": [{"text": f"{i % 10}"}]},
+                                "safety_ratings": [
+                                    {"category": "HARM_CATEGORY_DANGEROUS", "probability": "LOW"}
+                                ],
+                            }
+                        ],
+                        "usage_metadata": {"candidates_token_count": i + 1},
+                    }
+                )
+
+        response = generation_types.GenerateContentResponse.from_iterator(fake_stream())
+        count = sum(1 for _ in response)
+
+        self.assertEqual(n, count)
+        self.assertEqual("0123456789" * (n // 10), response.text)
+        self.assertLen(response.candidates[0].safety_ratings, 1)
+        self.assertEqual(n, response.usage_metadata.candidates_token_count)
+
+    def test_response_accumulator_matches_join_chunks(self):
+        chunks = [glm.GenerateContentResponse(candidates=cl) for cl in self.CANDIDATE_LISTS]
+        chunks[1].candidates[0].safety_ratings = [
+            glm.SafetyRating(category="HARM_CATEGORY_DANGEROUS", probability="LOW", blocked=True)
+        ]
+        chunks[2].candidates[0].safety_ratings = [
+            glm.SafetyRating(category="HARM_CATEGORY_DANGEROUS", probability="HIGH")
+        ]
+
+        accumulator = generation_types._ResponseAccumulator(chunks[0])
+        for chunk in chunks[1:]:
+            accumulator.add_chunk(chunk)
+
+        expected = generation_types._join_chunks(chunks)
+        result = accumulator.result
+        self.assertEqual(type(expected).to_dict(expected), type(result).to_dict(result))
+
     def test_generate_content_response_from_response(self):
         raw_response = glm.GenerateContentResponse(
             {"candidates": [{"content": {"parts": [{"text": "Hello world!"}]}}]}
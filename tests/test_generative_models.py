@@ -4,6 +4,7 @@ import copy
 import pathlib
 from typing import Any
 import textwrap
+import threading
 import unittest.mock
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -39,6 +40,21 @@ def simple_response(text: str) -> glm.GenerateContentResponse:
     return glm.GenerateContentResponse({"candidates": [{"content": simple_part(text)}]})
 
 
+def function_call_response(*names: str) -> glm.GenerateContentResponse:
+    return glm.GenerateContentResponse(
+        {
+            "candidates": [
+                {
+                    "content": {
+                        "role": "model",
+                        "parts": [{"function_call": {"name": name, "args": {}}} for name in names],
+                    }
+                }
+            ]
+        }
+    )
+
+
 class MockGenerativeServiceClient:
     def __init__(self, test):
         self.test = test
@@ -232,6 +248,85 @@ class CUJTests(parameterized.TestCase):
             glm.SafetySetting.HarmBlockThreshold.BLOCK_ONLY_HIGH,
         )
 
+    def test_request_template_is_cached(self):
+        model = generative_models.GenerativeModel(
+            "gemini-pro",
+            generation_config={"temperature": 0.5},
+            safety_settings="block_only_high",
+            tools=noop,
+            system_instruction="Be excellent.",
+        )
+        with unittest.mock.patch.object(
+            generative_models.GenerativeModel,
+            "_build_request_template",
+            autospec=True,
+            side_effect=generative_models.GenerativeModel._build_request_template,
+        ) as build:
+            request1 = model._prepare_request(contents="Hello", tools=None, tool_config=None)
+            request2 = model._prepare_request(contents="Goodbye", tools=None, tool_config=None)
+            self.assertEqual(1, build.call_count)
+
+            # Overrides are merged into a fresh request.
+            request3 = model._prepare_request(
+                contents="Hello",
+                generation_config={"temperature": 0.1},
+                tools=None,
+                tool_config=None,
+            )
+            self.assertEqual(2, build.call_count)
+
+        self.assertEqual("Hello", request1.contents[0].parts[0].text)
+        self.assertEqual("Goodbye", request2.contents[0].parts[0].text)
+        self.assertEqual(request1.generation_config, request2.generation_config)
+        self.assertEqual(request1.tools, request2.tools)
+        self.assertEqual("Be excellent.", request2.system_instruction.parts[0].text)
+        self.assertAlmostEqual(0.1, request3.generation_config.temperature)
+
+        # The cached template isn't modified by changes to the requests built from it.
+        request1.generation_config.temperature = 0.9
+        request4 = model._prepare_request(contents="Hello", tools=None, tool_config=None)
+        self.assertAlmostEqual(0.5, request4.generation_config.temperature)
+        self.assertEmpty(model._request_template.contents)
+
+    def test_generate_content_batch(self):
+        def generate_content(request, **kwargs):
+            self.observed_requests.append(request)
+            self.observed_kwargs.append(kwargs)
+            text = request.contents[0].parts[0].text
+            if text == "fail":
+                raise ValueError("Bad prompt")
+            return simple_response(text.upper())
+
+        self.client.generate_content = generate_content
+
+        model = generative_models.GenerativeModel(
+            "gemini-pro", generation_config={"temperature": 0.5}
+        )
+        prompts = ["a", "b", "fail", "", "c", "d"]
+        results = model.generate_content_batch(
+            prompts, max_concurrency=3, request_options={"timeout": 120}
+        )
+
+        self.assertLen(results, len(prompts))
+        self.assertEqual("A", results[0].text)
+        self.assertEqual("B", results[1].text)
+        self.assertIsInstance(results[2], ValueError)
+        self.assertIsInstance(results[3], TypeError)
+        self.assertEqual("C", results[4].text)
+        self.assertEqual("D", results[5].text)
+
+        # The empty prompt is never sent.
+        self.assertLen(self.observed_requests, 5)
+        for request, kwargs in zip(self.observed_requests, self.observed_kwargs):
+            self.assertEqual("models/gemini-pro", request.model)
+            self.assertAlmostEqual(0.5, request.generation_config.temperature)
+            self.assertEqual({"timeout": 120}, kwargs)
+
+    def test_generate_content_batch_invalid_concurrency(self):
+        model = generative_models.GenerativeModel("gemini-pro")
+        with self.assertRaises(ValueError):
+            model.generate_content_batch(["a"], max_concurrency=0)
+
     def test_stream_basic(self):
         # Streaming
         chunks = ["first", " second", " third"]
@@ -360,6 +455,100 @@ class CUJTests(parameterized.TestCase):
         self.assertEqual(history[0].role, "user")
         self.assertEqual(history[1].role, "model")
 
+    def test_chat_keep_last_turns(self):
+        self.responses["generate_content"] = [simple_response(t) for t in "abc"]
+
+        model = generative_models.GenerativeModel("gemini-pro")
+        chat = model.start_chat(history_policy=generative_models.history_types.KeepLastTurns(1))
+        for msg in ["1", "2", "3"]:
+            chat.send_message(msg)
+
+        self.assertEqual([len(r.contents) for r in self.observed_requests], [1, 3, 3])
+        self.assertEqual(
+            [c.parts[0].text for c in self.observed_requests[-1].contents], ["2", "b", "3"]
+        )
+        self.assertEqual([c.parts[0].text for c in chat.history], ["2", "b", "3", "c"])
+
+    def test_chat_token_budget(self):
+        def usage_response(text, prompt_tokens, candidates_tokens):
+            response = simple_response(text)
+            response.usage_metadata.prompt_token_count = prompt_tokens
+            response.usage_metadata.candidates_token_count = candidates_tokens
+            return response
+
+        self.responses["generate_content"] = [
+            usage_response("a", 10, 20),
+            usage_response("b", 40, 20),
+            usage_response("c", 40, 20),
+        ]
+
+        model = generative_models.GenerativeModel("gemini-pro")
+        chat = model.start_chat(history_policy=generative_models.history_types.TokenBudget(60))
+        chat.send_message("1")
+        self.assertEqual(chat.history_token_counts, [10, 20])
+
+        # 30 recorded tokens + 1 estimated for the new message.
+        chat.send_message("2")
+        self.assertLen(self.observed_requests[1].contents, 3)
+        self.assertEqual(chat.history_token_counts, [10, 20, 10, 20])
+
+        # 60 recorded tokens + 1: the first turn is dropped.
+        chat.send_message("3")
+        self.assertEqual(
+            [c.parts[0].text for c in self.observed_requests[2].contents], ["2", "b", "3"]
+        )
+        self.assertEqual(chat.history_token_counts, [10, 20, 10, 20])
+
+    def test_chat_token_budget_count_tokens(self):
+        model = generative_models.GenerativeModel("gemini-pro", system_instruction="Be brief.")
+        model._client = MockGenerativeServiceClient(self)
+        model._client.responses["count_tokens"] = [
+            glm.CountTokensResponse(total_tokens=n) for n in [10, 10, 10]
+        ]
+        history = [
+            glm.Content(role="user", parts=[glm.Part(text="1")]),
+            glm.Content(role="model", parts=[glm.Part(text="a")]),
+        ]
+        model._client.responses["generate_content"] = [simple_response("b")]
+
+        policy = generative_models.history_types.TokenBudget(25, use_count_tokens=True)
+        chat = model.start_chat(history=history, history_policy=policy)
+        chat.send_message("2")
+
+        # The history is counted on the model's client, and the new message's count includes
+        # the system instruction.
+        history_requests = model._client.observed_requests[:2]
+        self.assertEqual(["1", "a"], [r.contents[0].parts[0].text for r in history_requests])
+        message_request = model._client.observed_requests[2].generate_content_request
+        self.assertEqual("Be brief.", message_request.system_instruction.parts[0].text)
+        self.assertEqual("2", message_request.contents[0].parts[0].text)
+        self.assertEmpty(self.observed_requests)
+
+        self.assertEqual(
+            ["2"], [c.parts[0].text for c in model._client.observed_requests[3].contents]
+        )
+
+    def test_chat_summarize_and_drop(self):
+        self.responses["generate_content"] = [
+            simple_response("a" * 40),
+            simple_response("summary"),
+            simple_response("b"),
+        ]
+
+        policy = generative_models.history_types.SummarizeAndDrop(10, keep_last_turns=0)
+        model = generative_models.GenerativeModel("gemini-pro")
+        chat = model.start_chat(history_policy=policy)
+        chat.send_message("1")
+        chat.send_message("2")
+
+        summary_request = self.observed_requests[1]
+        self.assertEqual(summary_request.contents[-1].parts[0].text, policy.prompt)
+        self.assertEqual(
+            [c.parts[0].text for c in self.observed_requests[2].contents],
+            [policy.prompt, "summary", "2"],
+        )
+        self.assertEqual([c.role for c in chat.history], ["user", "model", "user", "model"])
+
     def test_chat_streaming_basic(self):
         # Chat streaming
         self.responses["stream_generate_content"] = [
@@ -637,6 +826,156 @@ class CUJTests(parameterized.TestCase):
             self.assertLen(obr.tools, 1)
             self.assertEqual(type(obr.tools[0]).to_dict(obr.tools[0]), tools)
 
+    def test_automatic_function_calling(self):
+        calls = []
+
+        def get_a() -> str:
+            calls.append("a")
+            return "A"
+
+        def get_b() -> str:
+            calls.append("b")
+            return "B"
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a, get_b])
+        self.responses["generate_content"] = [
+            function_call_response("get_a", "get_b"),
+            simple_response("done"),
+        ]
+
+        chat = model.start_chat(enable_automatic_function_calling=True)
+        response = chat.send_message("Hello")
+
+        self.assertEqual("done", response.text)
+        self.assertEqual(["a", "b"], calls)
+        sent = self.observed_requests[-1].contents[-1]
+        self.assertEqual(["get_a", "get_b"], [part.function_response.name for part in sent.parts])
+        self.assertLen(chat.history, 4)
+
+    def test_automatic_function_calling_streaming(self):
+        def get_a() -> str:
+            return "A"
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a])
+        self.responses["stream_generate_content"] = [
+            iter([simple_response("Let me check. "), function_call_response("get_a")]),
+            iter([simple_response("The answer "), simple_response("is A.")]),
+        ]
+
+        chat = model.start_chat(enable_automatic_function_calling=True)
+        response = chat.send_message("Hello", stream=True)
+
+        texts = [chunk.text for chunk in response]
+        self.assertEqual(["Let me check. ", "The answer ", "is A."], texts)
+
+        # The follow-up request includes the function call and its response.
+        self.assertLen(self.observed_requests, 2)
+        contents = self.observed_requests[-1].contents
+        self.assertEqual("get_a", contents[1].parts[1].function_call.name)
+        self.assertEqual("get_a", contents[2].parts[0].function_response.name)
+
+        # The response holds the final turn, like `chat.last`, not the "Let me check. " before
+        # the function call.
+        self.assertIs(chat.last, response)
+        self.assertEqual("The answer is A.", response.text)
+
+        history = chat.history
+        self.assertLen(history, 4)
+        self.assertEqual(["user", "model", "user", "model"], [c.role for c in history])
+        self.assertEqual("The answer is A.", history[-1].parts[0].text)
+
+    def test_automatic_function_calling_records_token_counts(self):
+        def get_a() -> str:
+            return "A"
+
+        def usage_response(response, prompt_tokens, candidates_tokens):
+            response.usage_metadata.prompt_token_count = prompt_tokens
+            response.usage_metadata.candidates_token_count = candidates_tokens
+            return response
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a])
+        self.responses["generate_content"] = [
+            usage_response(function_call_response("get_a"), 10, 5),
+            usage_response(simple_response("is A."), 30, 20),
+        ]
+        self.responses["stream_generate_content"] = [
+            iter([usage_response(function_call_response("get_a"), 60, 5)]),
+            iter([usage_response(simple_response("is A."), 100, 20)]),
+        ]
+
+        chat = model.start_chat(
+            enable_automatic_function_calling=True,
+            history_policy=generative_models.history_types.TokenBudget(1000),
+        )
+        chat.send_message("1")
+        # The first prompt also covers the tools, so "1" isn't given a count. The function
+        # response's 15 tokens are the second prompt minus the first prompt and call.
+        self.assertEqual([None, 5, 15, 20], chat.history_token_counts)
+
+        response = chat.send_message("2", stream=True)
+        list(response)
+
+        self.assertEqual([None, 5, 15, 20, 10, 5, 35, 20], chat.history_token_counts)
+
+    def test_parallel_function_calling(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def make_function(name):
+            def f() -> str:
+                # Only completes if all three calls are running at the same time.
+                barrier.wait()
+                return name.upper()
+
+            f.__name__ = name
+            return f
+
+        names = ["get_a", "get_b", "get_c"]
+        model = generative_models.GenerativeModel(
+            "gemini-pro", tools=[make_function(name) for name in names]
+        )
+        self.responses["generate_content"] = [
+            function_call_response(*names),
+            simple_response("done"),
+        ]
+
+        chat = model.start_chat(
+            enable_automatic_function_calling=True, enable_parallel_function_calling=True
+        )
+        response = chat.send_message("Hello")
+
+        self.assertEqual("done", response.text)
+        sent = self.observed_requests[-1].contents[-1]
+        self.assertEqual(names, [part.function_response.name for part in sent.parts])
+        self.assertEqual(
+            ["GET_A", "GET_B", "GET_C"],
+            [part.function_response.response["result"] for part in sent.parts],
+        )
+
+    @parameterized.named_parameters(
+        ["sequential", False],
+        ["parallel", True],
+    )
+    def test_function_call_timeout(self, parallel):
+        release = threading.Event()
+
+        def slow() -> str:
+            release.wait(5)
+            return "slow"
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[slow])
+        self.responses["generate_content"] = [function_call_response("slow")]
+
+        chat = model.start_chat(
+            enable_automatic_function_calling=True,
+            enable_parallel_function_calling=parallel,
+            function_call_timeout=0.05,
+        )
+        try:
+            with self.assertRaisesRegex(TimeoutError, "slow"):
+                chat.send_message("Hello")
+        finally:
+            release.set()
+
     @parameterized.named_parameters(
         dict(
             testcase_name="test_FunctionCallingMode_str",
@@ -794,6 +1133,11 @@ class CUJTests(parameterized.TestCase):
             generative_models.GenerativeModel.count_tokens,
             generative_models.GenerativeModel.count_tokens_async,
         ],
+        [
+            "GenerativeModel.generate_content_batch",
+            generative_models.GenerativeModel.generate_content_batch,
+            generative_models.GenerativeModel.generate_content_batch_async,
+        ],
         [
             "ChatSession.send_message",
             generative_models.ChatSession.send_message,
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import collections
 import sys
 from collections.abc import Iterable
@@ -34,6 +35,21 @@ def simple_response(text: str) -> glm.GenerateContentResponse:
     return glm.GenerateContentResponse({"candidates": [{"content": {"parts": [{"text": text}]}}]})
 
 
+def function_call_response(*names: str) -> glm.GenerateContentResponse:
+    return glm.GenerateContentResponse(
+        {
+            "candidates": [
+                {
+                    "content": {
+                        "role": "model",
+                        "parts": [{"function_call": {"name": name, "args": {}}} for name in names],
+                    }
+                }
+            ]
+        }
+    )
+
+
 class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         self.client = unittest.mock.MagicMock()
@@ -108,6 +124,152 @@ class AsyncTests(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(response.text, "world!")
 
+    async def test_generate_content_batch(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def generate_content(request, **kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+            self.observed_requests.append(request)
+            text = request.contents[0].parts[0].text
+            if text == "fail":
+                raise ValueError("Bad prompt")
+            return simple_response(text.upper())
+
+        self.client.generate_content = generate_content
+
+        model = generative_models.GenerativeModel("gemini-pro")
+        prompts = ["a", "b", "fail", "c", "d", "e"]
+        results = await model.generate_content_batch_async(prompts, max_concurrency=2)
+
+        self.assertLen(results, len(prompts))
+        self.assertEqual(["A", "B"], [r.text for r in results[:2]])
+        self.assertIsInstance(results[2], ValueError)
+        self.assertEqual(["C", "D", "E"], [r.text for r in results[3:]])
+        self.assertEqual(2, max_in_flight)
+
+    async def test_automatic_function_calling_streaming(self):
+        async def get_a() -> str:
+            return "A"
+
+        async def stream(*chunks):
+            for chunk in chunks:
+                yield chunk
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a])
+        self.responses["stream_generate_content"] = [
+            stream(simple_response("Let me check. "), function_call_response("get_a")),
+            stream(simple_response("The answer "), simple_response("is A.")),
+        ]
+
+        chat = model.start_chat(enable_automatic_function_calling=True)
+        response = await chat.send_message_async("Hello", stream=True)
+
+        texts = [chunk.text async for chunk in response]
+        self.assertEqual(["Let me check. ", "The answer ", "is A."], texts)
+        # The response holds the final turn, like `chat.last`.
+        self.assertIs(chat.last, response)
+        self.assertEqual("The answer is A.", response.text)
+
+        history = chat.history
+        self.assertLen(history, 4)
+        self.assertEqual("get_a", history[2].parts[0].function_response.name)
+        self.assertEqual("The answer is A.", history[-1].parts[0].text)
+
+    async def test_automatic_function_calling_records_token_counts(self):
+        async def get_a() -> str:
+            return "A"
+
+        async def stream(*chunks):
+            for chunk in chunks:
+                yield chunk
+
+        def usage_response(response, prompt_tokens, candidates_tokens):
+            response.usage_metadata.prompt_token_count = prompt_tokens
+            response.usage_metadata.candidates_token_count = candidates_tokens
+            return response
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a])
+        self.responses["generate_content"] = [
+            usage_response(function_call_response("get_a"), 10, 5),
+            usage_response(simple_response("is A."), 30, 20),
+        ]
+        self.responses["stream_generate_content"] = [
+            stream(usage_response(function_call_response("get_a"), 60, 5)),
+            stream(usage_response(simple_response("is A."), 100, 20)),
+        ]
+
+        chat = model.start_chat(
+            enable_automatic_function_calling=True,
+            history_policy=generative_models.history_types.TokenBudget(1000),
+        )
+        await chat.send_message_async("1")
+        self.assertEqual([None, 5, 15, 20], chat.history_token_counts)
+
+        response = await chat.send_message_async("2", stream=True)
+        async for _ in response:
+            pass
+
+        self.assertEqual([None, 5, 15, 20, 10, 5, 35, 20], chat.history_token_counts)
+
+    async def test_parallel_function_calling(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_a() -> str:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "A"
+
+        async def get_b() -> str:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return "B"
+
+        def get_c() -> str:
+            return "C"
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[get_a, get_b, get_c])
+        self.responses["generate_content"] = [
+            function_call_response("get_a", "get_b", "get_c"),
+            simple_response("done"),
+        ]
+
+        chat = model.start_chat(
+            enable_automatic_function_calling=True, enable_parallel_function_calling=True
+        )
+        response = await chat.send_message_async("Hello")
+
+        self.assertEqual("done", response.text)
+        self.assertEqual(2, max_in_flight)
+        sent = self.observed_requests[-1].contents[-1]
+        self.assertEqual(
+            ["A", "B", "C"], [part.function_response.response["result"] for part in sent.parts]
+        )
+
+    async def test_function_call_timeout(self):
+        async def slow() -> str:
+            await asyncio.sleep(5)
+            return "slow"
+
+        model = generative_models.GenerativeModel("gemini-pro", tools=[slow])
+        self.responses["generate_content"] = [function_call_response("slow")]
+
+        chat = model.start_chat(enable_automatic_function_calling=True, function_call_timeout=0.05)
+        with self.assertRaisesRegex(TimeoutError, "slow"):
+            await chat.send_message_async("Hello")
+
     @parameterized.named_parameters(
         dict(
             testcase_name="test_FunctionCallingMode_str",
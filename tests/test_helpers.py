@@ -23,6 +23,7 @@ import google.ai.generativelanguage as glm
 
 from google.generativeai import client
 from google.generativeai import models
+from google.generativeai import model_cache
 from google.generativeai.types import model_types
 from google.generativeai.types import helper_types
 
@@ -56,6 +57,9 @@ class HelperTests(parameterized.TestCase):
     def setUp(self):
         self.client = MockModelClient(self)
         client._client_manager.clients["model"] = self.client
+        # Every test gets an empty model cache.
+        self.addCleanup(model_cache.set_default_model_cache, model_cache.get_default_model_cache())
+        model_cache.set_default_model_cache(model_cache.ModelCache())
 
         self.observed_requests = []
         self.observed_retry = []
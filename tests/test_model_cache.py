@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+from unittest import mock
+
+import google.ai.generativelanguage as glm
+
+from google.generativeai import model_cache
+from absl.testing import absltest
+
+
+class UnitTests(absltest.TestCase):
+    def test_get_and_put(self):
+        cache = model_cache.ModelCache()
+        cache.put(glm.Model(name="models/a", input_token_limit=10))
+        cache.put(glm.TunedModel(name="tunedModels/b"))
+
+        self.assertEqual(glm.Model(name="models/a", input_token_limit=10), cache.get("models/a"))
+        self.assertEqual(glm.TunedModel(name="tunedModels/b"), cache.get("tunedModels/b"))
+        self.assertIsNone(cache.get("models/c"))
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+
+        # Callers get a copy, so they can't change the cached model.
+        cache.get("models/a").input_token_limit = 0
+        self.assertEqual(10, cache.get("models/a").input_token_limit)
+
+        cache.invalidate("models/a")
+        self.assertIsNone(cache.get("models/a"))
+        cache.invalidate()
+        self.assertEmpty(cache)
+
+    def test_listing(self):
+        cache = model_cache.ModelCache()
+        self.assertIsNone(cache.get_listing())
+
+        cache.put_listing([glm.Model(name="models/a"), glm.Model(name="models/b")])
+        self.assertEqual(["models/a", "models/b"], [m.name for m in cache.get_listing()])
+        self.assertEqual("models/b", cache.get("models/b").name)
+
+    def test_ttl(self):
+        cache = model_cache.ModelCache(ttl=10)
+        with mock.patch("time.time", return_value=100):
+            cache.put(glm.Model(name="models/a"))
+        with mock.patch("time.time", return_value=109):
+            self.assertIsNotNone(cache.get("models/a"))
+        with mock.patch("time.time", return_value=111):
+            self.assertIsNone(cache.get("models/a"))
+
+        cache = model_cache.ModelCache(ttl=0)
+        cache.put(glm.Model(name="models/a"))
+        self.assertIsNone(cache.get("models/a"))
+
+    def test_scope(self):
+        cache = model_cache.ModelCache()
+        cache.set_scope(1)
+        cache.put(glm.Model(name="models/a"))
+        cache.set_scope(1)
+        self.assertLen(cache, 1)
+        cache.set_scope(2)
+        self.assertEmpty(cache)
+
+    def test_first_scope_keeps_entries(self):
+        cache = model_cache.ModelCache()
+        cache.put(glm.Model(name="models/a"))
+        cache.set_scope(1)
+        self.assertLen(cache, 1)
+
+    def test_snapshot(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, "models.json")
+
+        cache = model_cache.ModelCache(path=path)
+        cache.put(glm.TunedModel(name="tunedModels/b", base_model="models/a"))
+        cache.put_listing([glm.Model(name="models/a", input_token_limit=10)])
+
+        restored = model_cache.ModelCache(path=path)
+        self.assertEqual("models/a", restored.get("tunedModels/b").base_model)
+        self.assertEqual(10, restored.get("models/a").input_token_limit)
+        self.assertEqual(["models/a"], [m.name for m in restored.get_listing()])
+
+        # Expired entries aren't loaded.
+        with mock.patch("time.time", return_value=2e10):
+            self.assertEmpty(model_cache.ModelCache(path=path))
+
+    def test_invalid_ttl(self):
+        with self.assertRaisesRegex(ValueError, "ttl"):
+            model_cache.ModelCache(ttl=-1)
+
+
+if __name__ == "__main__":
+    absltest.main()
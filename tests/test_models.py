@@ -18,6 +18,7 @@ import datetime
 import dataclasses
 import pathlib
 import pytz
+import tempfile
 from typing import Any, Union
 import unittest
 from unittest import mock
@@ -29,6 +30,7 @@ import google.ai.generativelanguage as glm
 from google.api_core import operation
 
 from google.generativeai import models
+from google.generativeai import model_cache
 from google.generativeai import client
 from google.generativeai.types import model_types
 from google.generativeai import types as genai_types
@@ -43,6 +45,9 @@ class UnitTests(parameterized.TestCase):
         self.client = unittest.mock.MagicMock()
 
         client._client_manager.clients["model"] = self.client
+        # Every test gets an empty model cache.
+        self.addCleanup(model_cache.set_default_model_cache, model_cache.get_default_model_cache())
+        model_cache.set_default_model_cache(model_cache.ModelCache())
 
         # TODO(markdaoust): Check if typechecking works better if wee define this as a
         #                   subclass of `glm.ModelServiceClient`, would pyi files for `glm` help?
@@ -158,6 +163,83 @@ class UnitTests(parameterized.TestCase):
         else:
             self.assertIsInstance(model, model_types.TunedModel)
 
+    def test_get_model_cached(self):
+        self.responses = {
+            "get_model": glm.Model(name="models/fake-bison-001"),
+            "get_tuned_model": glm.TunedModel(
+                name="tunedModels/my-pig-001", base_model="models/fake-bison-001", state="ACTIVE"
+            ),
+        }
+
+        for _ in range(3):
+            models.get_model("models/fake-bison-001")
+            self.assertEqual(
+                "models/fake-bison-001", models.get_base_model_name("tunedModels/my-pig-001")
+            )
+        self.assertLen(self.observed_requests, 2)
+
+        # An explicit client isn't cached.
+        models.get_model("models/fake-bison-001", client=self.client)
+        self.assertLen(self.observed_requests, 3)
+
+        # Deleting a tuned model drops it from the cache.
+        models.delete_tuned_model("tunedModels/my-pig-001")
+        models.get_model("tunedModels/my-pig-001")
+        self.assertIsInstance(self.observed_requests[-1], glm.GetTunedModelRequest)
+
+    def test_get_model_from_snapshot(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = pathlib.Path(tmp.name) / "models.json"
+        model_cache.ModelCache(path=path).put(
+            glm.Model(name="models/fake-bison-001", input_token_limit=10)
+        )
+
+        # A new process loads the snapshot, and the first call is answered from it.
+        model_cache.set_default_model_cache(model_cache.ModelCache(path=path))
+        model = models.get_model("models/fake-bison-001")
+
+        self.assertEqual(10, model.input_token_limit)
+        self.assertEmpty(self.observed_requests)
+
+    def test_get_tuned_model_state_changes(self):
+        self.responses["get_tuned_model"] = glm.TunedModel(
+            name="tunedModels/my-pig-001", state="CREATING"
+        )
+        self.assertEqual(
+            glm.TunedModel.State.CREATING, models.get_tuned_model("tunedModels/my-pig-001").state
+        )
+
+        # A model that's still being created isn't cached, so polling sees it finish.
+        self.responses["get_tuned_model"] = glm.TunedModel(
+            name="tunedModels/my-pig-001", state="ACTIVE"
+        )
+        for _ in range(2):
+            self.assertEqual(
+                glm.TunedModel.State.ACTIVE,
+                models.get_tuned_model("tunedModels/my-pig-001").state,
+            )
+        self.assertLen(self.observed_requests, 2)
+
+    def test_list_models_cached(self):
+        self.responses = {
+            "list_models": [glm.Model(name="models/fake-bison-001")],
+        }
+
+        self.assertLen(list(models.list_models()), 1)
+        self.assertLen(list(models.list_models()), 1)
+        # The listing also fills in the models themselves.
+        models.get_model("models/fake-bison-001")
+        self.assertLen(self.observed_requests, 1)
+
+    def test_configure_empties_model_cache(self):
+        self.responses = {"get_model": glm.Model(name="models/fake-bison-001")}
+
+        models.get_model("models/fake-bison-001")
+        client._client_manager.config_version += 1
+        models.get_model("models/fake-bison-001")
+        self.assertLen(self.observed_requests, 2)
+
     @parameterized.named_parameters(
         ["simple", "mystery-bison-001"],
         ["model-instance", glm.Model(name="how?-bison-001")],
@@ -421,6 +503,7 @@ class UnitTests(parameterized.TestCase):
         ["json-file-1", HERE / "test1.json"],
         ["json-file-2", HERE / "test2.json"],
         ["json-file-3", HERE / "test3.json"],
+        ["jsonl-file", HERE / "test.jsonl"],
         [
             "json-url",
             "https://storage.googleapis.com/generativeai-downloads/data/test1.json",
@@ -456,6 +539,43 @@ class UnitTests(parameterized.TestCase):
         )
         self.assertEqual(expect, ds)
 
+    def test_tuning_data_encoder(self):
+        encoder = model_types.TuningDataEncoder(deduplicate=True)
+        encoder.add_data(HERE / "test.csv")
+        encoder.add_data([("a", "1"), {"text_input": "d", "output": 4}])
+
+        self.assertEqual(
+            ["a", "b", "c", "d"], [e.text_input for e in encoder.dataset().examples.examples]
+        )
+        stats = encoder.stats
+        self.assertEqual(4, stats.example_count)
+        self.assertEqual(1, stats.duplicate_count)
+        self.assertEqual(
+            (4, 4, 1, 1),
+            (stats.input_chars, stats.output_chars, stats.max_input_chars, stats.max_output_chars),
+        )
+        self.assertEqual(2, stats.estimated_token_count)
+        self.assertEqual(encoder.dataset().examples._pb.ByteSize(), stats.size_bytes + 2 * 4)
+
+    @parameterized.named_parameters(
+        ["empty_input", [("", "1")], ValueError, "example 0.*text_input"],
+        ["empty_output", [("a", "1"), ("b", "")], ValueError, "example 1.*output"],
+        ["missing_key", [{"text_input": "a"}], KeyError, "output"],
+        ["missing_column", {"text_input": ["a"]}, KeyError, "output"],
+    )
+    def test_tuning_data_validation(self, data, error, regex):
+        with self.assertRaisesRegex(error, regex):
+            model_types.encode_tuning_data(data)
+
+    def test_tuning_data_invalid_jsonl(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = pathlib.Path(tmp.name) / "data.jsonl"
+        path.write_text('{"text_input": "a", "output": "1"}\n{"text_input": \n')
+
+        with self.assertRaisesRegex(ValueError, "line 2"):
+            model_types.encode_tuning_data(path)
+
     def test_get_model_called_with_request_options(self):
         self.client.get_model = unittest.mock.MagicMock()
         name = unittest.mock.ANY
@@ -15,6 +15,7 @@
 
 from contextlib import redirect_stderr
 import io
+import unittest
 
 import google.ai.generativelanguage as glm
 import google.protobuf.any_pb2
@@ -160,5 +161,95 @@ class OperationsTests(parameterized.TestCase):
         self.assertTrue(ctm_op.done())
 
 
+def _operation_pb(name, completed_steps, done=False):
+    op = core_operation.operations_pb2.Operation(
+        name=name,
+        done=done,
+        metadata=google.protobuf.any_pb2.Any(
+            type_url=OperationsTests.metadata_type,
+            value=glm.CreateTunedModelMetadata(
+                tuned_model=name, total_steps=2, completed_steps=completed_steps
+            )._pb.SerializeToString(),
+        ),
+    )
+    if done:
+        op.response.CopyFrom(
+            google.protobuf.any_pb2.Any(
+                type_url=OperationsTests.result_type,
+                value=glm.TunedModel(name=name)._pb.SerializeToString(),
+            )
+        )
+    return op
+
+
+class FakeOperationsClient:
+    """Each operation reports one more completed step per refresh, and is done after 2."""
+
+    def __init__(self, names):
+        self.steps = {name: 0 for name in names}
+        self.calls = []
+
+    def _next(self, name):
+        self.steps[name] = min(self.steps[name] + 1, 2)
+        return _operation_pb(name, self.steps[name], done=self.steps[name] == 2)
+
+    def get_operation(self, name, **kwargs):
+        self.calls.append(("get_operation", name))
+        return self._next(name)
+
+    def cancel_operation(self, name, **kwargs):
+        pass
+
+    def list_operations(self, name, filter_, **kwargs):
+        self.calls.append(("list_operations",))
+        for op_name in self.steps:
+            yield self._next(op_name)
+
+
+class AsyncOperationsTests(unittest.IsolatedAsyncioTestCase):
+    def _operation(self, client, name):
+        return genai_operation.CreateTunedModelOperation.from_proto(_operation_pb(name, 0), client)
+
+    async def _wait(self, names, **kwargs):
+        client = FakeOperationsClient(names)
+        operations = [self._operation(client, name) for name in names]
+        statuses = [
+            status
+            async for status in genai_operation.wait_for_operations_async(
+                operations, client=client, poll_interval=0.001, **kwargs
+            )
+        ]
+        return client, operations, statuses
+
+    async def test_wait_for_operations_async(self):
+        client, operations, statuses = await self._wait(["op/a", "op/b"])
+
+        self.assertEqual(
+            [("op/a", 0), ("op/b", 0), ("op/a", 1), ("op/b", 1), ("op/a", 2), ("op/b", 2)],
+            [(s.operation.name, s.metadata.completed_steps) for s in statuses],
+        )
+        self.assertEqual([False] * 4 + [True] * 2, [s.done for s in statuses])
+        for op in operations:
+            self.assertEqual(op.name, op.result().name)
+        self.assertEqual("get_operation", client.calls[0][0])
+
+    async def test_wait_for_many_operations_lists_them(self):
+        names = [f"op/{i}" for i in range(6)]
+        client, _, statuses = await self._wait(names)
+
+        self.assertEqual(names, [s.operation.name for s in statuses if s.done])
+        self.assertEqual([("list_operations",)] * 2, client.calls)
+
+    async def test_wait_for_operations_timeout(self):
+        client = FakeOperationsClient(["op/a"])
+        operation = self._operation(client, "op/a")
+
+        with self.assertRaisesRegex(TimeoutError, "op/a"):
+            async for _ in genai_operation.wait_for_operations_async(
+                [operation], client=client, poll_interval=10, timeout=0.01
+            ):
+                pass
+
+
 if __name__ == "__main__":
     absltest.main()
@@ -19,6 +19,7 @@ import unittest
 import unittest.mock as mock
 
 import google.ai.generativelanguage as glm
+import numpy as np
 
 from google.generativeai import text as text_service
 from google.generativeai import client
@@ -170,6 +171,20 @@ class UnitTests(parameterized.TestCase):
             math.ceil(len(text) / text_service.EMBEDDING_MAX_BATCH_SIZE),
         )
 
+    def test_generate_embeddings_deduplicate(self):
+        emb = text_service.generate_embeddings(
+            model="models/chat-lamda-001", text=["a", "b", "a"], deduplicate=True
+        )
+        self.assertEqual(list(self.observed_requests[-1].texts), ["a", "b"])
+        self.assertEqual(emb["embedding"], [[1.0, 2.0, 3.0]] * 3)
+
+    def test_generate_embeddings_numpy(self):
+        emb = text_service.generate_embeddings(
+            model="models/chat-lamda-001", text=["Who are you?"] * 101, output="numpy"
+        )
+        self.assertEqual(emb["embedding"].shape, (101, 3))
+        self.assertEqual(emb["embedding"].dtype, np.float32)
+
     @parameterized.named_parameters(
         [
             dict(testcase_name="basic", prompt="Why did the chicken cross the"),
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import threading
+import unittest
+
+import google.ai.generativelanguage as glm
+from google.ai.generativelanguage_v1beta.services.model_service import pagers
+
+from google.generativeai import models
+from google.generativeai import utils
+from absl.testing import absltest
+
+
+def list_models_method(num_pages, fetched=None, fail_on=None):
+    """A fake `ListModels` RPC, for the pages after the first."""
+
+    def method(request, **kwargs):
+        page = int(request.page_token)
+        if fetched is not None:
+            fetched.append(page)
+            fetched.event.set()
+        if page == fail_on:
+            raise RuntimeError(f"page {page} failed")
+        next_page_token = str(page + 1) if page + 1 < num_pages else ""
+        return glm.ListModelsResponse(
+            models=[glm.Model(name=f"models/{page}-{i}") for i in range(2)],
+            next_page_token=next_page_token,
+        )
+
+    return method
+
+
+def make_pager(num_pages, **kwargs):
+    method = list_models_method(num_pages, **kwargs)
+    first = method(glm.ListModelsRequest(page_token="0"))
+    return pagers.ListModelsPager(method, glm.ListModelsRequest(), first)
+
+
+class FetchLog(list):
+    def __init__(self):
+        super().__init__()
+        self.event = threading.Event()
+
+
+class UnitTests(absltest.TestCase):
+    def test_iter_prefetched(self):
+        pager = make_pager(3)
+        names = [m.name for m in utils.iter_prefetched(pager, "models")]
+        self.assertEqual(["models/0-0", "models/0-1", "models/1-0", "models/1-1"], names[:4])
+        self.assertLen(names, 6)
+
+    def test_next_page_is_fetched_while_consuming(self):
+        fetched = FetchLog()
+        pager = make_pager(3, fetched=fetched)
+        fetched.clear()
+        fetched.event.clear()
+
+        items = utils.iter_prefetched(pager, "models", prefetch=1)
+        next(items)
+        # Page 1 is requested while the consumer is still on page 0.
+        self.assertTrue(fetched.event.wait(timeout=5))
+        self.assertEqual(1, fetched[0])
+        items.close()
+
+    def test_no_prefetch(self):
+        fetched = FetchLog()
+        pager = make_pager(3, fetched=fetched)
+        fetched.clear()
+
+        items = utils.iter_prefetched(pager, "models", prefetch=0)
+        next(items)
+        next(items)
+        self.assertEmpty(fetched)
+        self.assertLen(list(items), 4)
+
+    def test_errors_are_raised_in_the_consumer(self):
+        pager = make_pager(3, fail_on=2)
+        items = utils.iter_prefetched(pager, "models")
+        with self.assertRaisesRegex(RuntimeError, "page 2 failed"):
+            list(items)
+
+    def test_invalid_prefetch(self):
+        with self.assertRaisesRegex(ValueError, "prefetch"):
+            next(utils.iter_prefetched([], "models", prefetch=-1))
+
+    def test_plain_iterables(self):
+        self.assertEqual([1, 2], list(utils.iter_prefetched(iter([1, 2]), "models")))
+
+    def test_list_models(self):
+        class Client:
+            def list_models(self, page_size, **kwargs):
+                return make_pager(2)
+
+        names = [m.name for m in models.list_models(client=Client(), prefetch=2)]
+        self.assertEqual(["models/0-0", "models/0-1", "models/1-0", "models/1-1"], names)
+
+
+class AsyncTests(unittest.IsolatedAsyncioTestCase):
+    async def test_aiter_prefetched(self):
+        sync_method = list_models_method(3)
+
+        async def method(request, **kwargs):
+            return sync_method(request)
+
+        first = sync_method(glm.ListModelsRequest(page_token="0"))
+        pager = pagers.ListModelsAsyncPager(method, glm.ListModelsRequest(), first)
+
+        names = [m.name async for m in utils.aiter_prefetched(pager, "models")]
+        self.assertEqual(6, len(names))
+        self.assertEqual("models/2-1", names[-1])
+
+    async def test_aiter_prefetched_error(self):
+        sync_method = list_models_method(3, fail_on=1)
+
+        async def method(request, **kwargs):
+            return sync_method(request)
+
+        first = sync_method(glm.ListModelsRequest(page_token="0"))
+        pager = pagers.ListModelsAsyncPager(method, glm.ListModelsRequest(), first)
+
+        with self.assertRaisesRegex(RuntimeError, "page 1 failed"):
+            async for _ in utils.aiter_prefetched(pager, "models"):
+                pass
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+# Copyright 2024 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import tempfile
+
+import numpy as np
+
+from google.generativeai import vector_index
+from absl.testing import absltest
+from absl.testing import parameterized
+
+
+def clustered_vectors(n, dimensions=16, n_clusters=20, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dimensions))
+    labels = rng.integers(n_clusters, size=n)
+    return (centers[labels] + 0.1 * rng.normal(size=(n, dimensions))).astype(np.float32)
+
+
+class UnitTests(parameterized.TestCase):
+    @parameterized.named_parameters(["cosine", "cosine"], ["dot", "dot"])
+    def test_exact_search(self, metric):
+        vectors = clustered_vectors(1000)
+        queries = clustered_vectors(5, seed=1)
+
+        index = vector_index.VectorIndex(metric=metric)
+        self.assertEqual(index.add(vectors[:400]), range(0, 400))
+        self.assertEqual(index.add(vectors[400:]), range(400, 1000))
+        scores, ids = index.search(queries, k=7)
+
+        if metric == "cosine":
+            vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+            queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        expected = queries @ vectors.T
+        np.testing.assert_array_equal(ids, np.argsort(-expected, axis=1)[:, :7])
+        np.testing.assert_allclose(scores, np.sort(expected, axis=1)[:, ::-1][:, :7], rtol=1e-5)
+
+    def test_embed_content_output(self):
+        index = vector_index.VectorIndex()
+        index.add({"embedding": [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]})
+        scores, ids = index.search({"embedding": [1.0, 0.1]}, k=10)
+
+        self.assertEqual(ids.shape, (1, 3))
+        self.assertEqual(ids[0].tolist(), [0, 2, 1])
+        self.assertAlmostEqual(scores[0, 0], 1 / np.sqrt(1.01), places=5)
+
+    def test_ivf_search(self):
+        vectors = clustered_vectors(5050)
+        vectors, queries = vectors[:5000], vectors[5000:]
+
+        index = vector_index.VectorIndex()
+        index.add(vectors)
+        _, exact_ids = index.search(queries, k=10)
+        index.build_ivf(n_lists=20)
+        _, ids = index.search(queries, k=10, n_probe=3)
+
+        recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(ids, exact_ids)])
+        self.assertGreater(recall, 0.9)
+
+        # Vectors added after clustering are searchable too.
+        new_ids = index.add(queries[:1])
+        _, ids = index.search(queries[:1], k=1, n_probe=3)
+        self.assertEqual(ids[0, 0], new_ids[0])
+
+    def test_save_and_load(self):
+        index = vector_index.VectorIndex(metric="dot")
+        index.add(clustered_vectors(500))
+        index.build_ivf(n_lists=10)
+        queries = clustered_vectors(3, seed=1)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(tmp)
+            loaded = vector_index.VectorIndex.load(tmp)
+
+            self.assertIsInstance(loaded.vectors, np.memmap)
+            self.assertEqual(loaded.metric, "dot")
+            for n_probe in [None, 2]:
+                np.testing.assert_array_equal(
+                    loaded.search(queries, n_probe=n_probe)[1],
+                    index.search(queries, n_probe=n_probe)[1],
+                )
+
+            loaded.add(queries)
+            self.assertLen(loaded, 503)
+
+    def test_errors(self):
+        index = vector_index.VectorIndex()
+        with self.assertRaises(ValueError):
+            vector_index.VectorIndex(metric="l2")
+        with self.assertRaises(ValueError):
+            index.build_ivf()
+
+        index.add([[1.0, 2.0]])
+        with self.assertRaises(ValueError):
+            index.add([[1.0, 2.0, 3.0]])
+        with self.assertRaises(ValueError):
+            index.search([1.0, 2.0], n_probe=1)
+
+
+if __name__ == "__main__":
+    absltest.main()